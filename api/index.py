@@ -2,12 +2,14 @@ import json
 import logging
 import os
 import sys
+import time
 from http.server import BaseHTTPRequestHandler
+from itertools import islice
 from pathlib import Path
 
-# Configure logging
+# Configure logging; set NAME_API_LOG_LEVEL=DEBUG to log request bodies and score breakdowns
 logging.basicConfig(
-    level=logging.INFO,
+    level=os.environ.get('NAME_API_LOG_LEVEL', 'INFO').upper(),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
         logging.StreamHandler(sys.stdout)
@@ -19,23 +21,41 @@ logger = logging.getLogger('name_uniqueness_api')
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
 from name_uniqueness_scorer import NameUniquenessScorer
+from request_metrics import RequestMetrics
+
+# Most traffic is for a few thousand popular names, so keep their scores cached
+SCORER_CACHE_SIZE = 10000
+
+# Number of NDJSON records /api/score-stream scores and writes back at a time
+STREAM_CHUNK_SIZE = 1000
+
+# Endpoints tracked individually in /api/metrics; anything else is counted as "other"
+METRIC_ENDPOINTS = {'/api', '/api/metrics', '/api/score-name', '/api/compare-names', '/api/score-stream'}
 
 
 # Initialize the scorer with the name data
 def get_scorer():
     name_data_dir = str(Path(__file__).resolve().parent / "name_data")
     last_name_source = str(Path(__file__).resolve().parent / "name_data" / "last_names.csv")
+    # NAME_API_SNAPSHOT points at a snapshot elsewhere, e.g. one shared by serve.py workers
+    snapshot_path = Path(os.environ.get('NAME_API_SNAPSHOT', Path(name_data_dir) / "corpus.snap"))
 
-    print(f"name_data_dir: {name_data_dir}")
-    print(f"last_name_source: {last_name_source}")
+    logger.debug(f"name_data_dir: {name_data_dir}")
+    logger.debug(f"last_name_source: {last_name_source}")
 
     try:
-        scorer = NameUniquenessScorer(
-            first_name_dir=name_data_dir,
-            last_name_source=last_name_source
-        )
-        # Print first 5 keys as a sample
-        print("Sample last names:", list(scorer.last_name_counts.keys())[:5])
+        if snapshot_path.exists():
+            # Memory-mapped snapshot built with build_snapshot.py avoids re-parsing the corpus on cold start
+            logger.info(f"Loading name corpus snapshot from {snapshot_path}")
+            scorer = NameUniquenessScorer.from_snapshot(str(snapshot_path), cache_size=SCORER_CACHE_SIZE)
+        else:
+            scorer = NameUniquenessScorer(
+                first_name_dir=name_data_dir,
+                last_name_source=last_name_source,
+                cache_size=SCORER_CACHE_SIZE
+            )
+        # Log first 5 keys as a sample
+        logger.debug(f"Sample last names: {list(islice(scorer.last_name_counts, 5))}")
         logger.info("Name Uniqueness Scorer initialized successfully")
         return scorer
     except Exception as e:
@@ -43,7 +63,14 @@ def get_scorer():
         raise    
 
 scorer = get_scorer()
-print(scorer.calculate_full_name_uniqueness("John", "Smith", print_components=True))
+metrics = RequestMetrics()
+if logger.isEnabledFor(logging.DEBUG):
+    logger.debug(f"John Smith scores:\n{scorer.format_explanation(scorer.explain_full_name('John', 'Smith'))}")
+
+
+def metric_endpoint(path):
+    """Endpoint label for metrics, keeping unknown paths from creating new series"""
+    return path if path in METRIC_ENDPOINTS else "other"
 
 def cors_headers():
     """Return CORS headers for cross-origin requests"""
@@ -54,71 +81,106 @@ def cors_headers():
     }
 
 class handler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so /api/score-stream can use chunked transfer encoding; every other
+    # response sends a Content-Length
+    protocol_version = "HTTP/1.1"
+
     def log_message(self, format, *args):
         """Override default log_message to use our logger"""
         logger.info("%s - %s" % (self.address_string(), format % args))
+
+    def send_response(self, code, message=None):
+        """
+        Send the status line and close the connection after the response. HTTP/1.1
+        would otherwise keep idle connections open, and a single-threaded server
+        cannot accept anyone else while it waits on one.
+        """
+        super().send_response(code, message)
+        self.send_header('Connection', 'close')
         
     def do_OPTIONS(self):
         """Handle preflight requests for CORS"""
         self.send_response(200)
         for key, value in cors_headers().items():
             self.send_header(key, value)
+        self.send_header('Content-Length', '0')
         self.end_headers()
 
     def do_GET(self):
         """Handle GET requests"""
+        endpoint = metric_endpoint(self.path)
+        if self.path == '/api/metrics':
+            body = metrics.render(scorer.cache_stats()).encode()
+            content_type = 'text/plain; version=0.0.4'
+        else:
+            response = {
+                "status": "ok",
+                "message": "Name Uniqueness API is running"
+            }
+            body = json.dumps(response).encode()
+            content_type = 'application/json'
+
         self.send_response(200)
-        self.send_header('Content-type', 'application/json')
+        metrics.count_request(endpoint, 200)
+        self.send_header('Content-type', content_type)
         for key, value in cors_headers().items():
             self.send_header(key, value)
+        self.send_header('Content-Length', str(len(body)))
         self.end_headers()
-        
-        response = {
-            "status": "ok",
-            "message": "Name Uniqueness API is running"
-        }
-        self.wfile.write(json.dumps(response).encode())
+        self.wfile.write(body)
 
     def do_POST(self):
         """Handle POST requests"""
-        content_length = int(self.headers['Content-Length'])
-        post_data = self.rfile.read(content_length)
-        
+        if self.path == '/api/score-stream':
+            # Streams its own response as the body is read, so it bypasses the JSON handling below
+            self.handle_score_stream()
+            return
+
+        endpoint = metric_endpoint(self.path)
         try:
-            data = json.loads(post_data.decode('utf-8'))
-            logger.info(f"POST request to {self.path} with data: {data}")
+            with metrics.timer(endpoint, "parse"):
+                content_length = int(self.headers['Content-Length'])
+                post_data = self.rfile.read(content_length)
+                data = json.loads(post_data.decode('utf-8'))
+            logger.debug(f"POST request to {self.path} with data: {data}")
             
             # Route to the appropriate handler based on the path
-            if self.path == '/api/score-name':
-                response = self.handle_score_name(data)
-                self.send_response(200)
-            elif self.path == '/api/compare-names':
-                response = self.handle_compare_names(data)
-                self.send_response(200)
-            else:
-                logger.warning(f"Invalid endpoint requested: {self.path}")
-                response = {"error": "Invalid endpoint"}
-                self.send_response(404)
+            with metrics.timer(endpoint, "score"):
+                if self.path == '/api/score-name':
+                    response = self.handle_score_name(data)
+                    status = 200
+                elif self.path == '/api/compare-names':
+                    response = self.handle_compare_names(data)
+                    status = 200
+                else:
+                    logger.warning(f"Invalid endpoint requested: {self.path}")
+                    response = {"error": "Invalid endpoint"}
+                    status = 404
         except json.JSONDecodeError as e:
             logger.error(f"Invalid JSON received: {str(e)}")
             response = {"error": "Invalid JSON"}
-            self.send_response(400)
+            status = 400
         except Exception as e:
             logger.error(f"Error processing request: {str(e)}", exc_info=True)
             response = {"error": str(e)}
-            self.send_response(500)
+            status = 500
         
-        self.send_header('Content-type', 'application/json')
-        for key, value in cors_headers().items():
-            self.send_header(key, value)
-        self.end_headers()
-        self.wfile.write(json.dumps(response).encode())
+        with metrics.timer(endpoint, "serialize"):
+            body = json.dumps(response).encode()
+            self.send_response(status)
+            self.send_header('Content-type', 'application/json')
+            for key, value in cors_headers().items():
+                self.send_header(key, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        metrics.count_request(endpoint, status)
 
     def handle_score_name(self, data):
-        """Handle name scoring requests"""
+        """Handle name scoring requests; with "explain": true the score breakdown is included"""
         first_name = data.get('firstName', '').strip()
         last_name = data.get('lastName', '').strip()
-
+        explain = bool(data.get('explain'))
         
         if not first_name and not last_name:
             logger.warning("Score name request with no names provided")
@@ -127,10 +189,15 @@ class handler(BaseHTTPRequestHandler):
         try:
             if first_name and last_name:
                 # Score full name
-                logger.info(f"Scoring full name: {first_name} {last_name}")
-                print(scorer.first_name_counts)
-                score = scorer.calculate_full_name_uniqueness(first_name, last_name, print_components=True)
-                return {
+                logger.debug(f"Scoring full name: {first_name} {last_name}")
+                if explain or logger.isEnabledFor(logging.DEBUG):
+                    explanation = scorer.explain_full_name(first_name, last_name)
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(scorer.format_explanation(explanation))
+                    score = explanation["score"]
+                else:
+                    score = scorer.calculate_full_name_uniqueness(first_name, last_name)
+                result = {
                     "score": round(score),
                     "type": "full",
                     "fullName": f"{first_name} {last_name}",
@@ -139,22 +206,33 @@ class handler(BaseHTTPRequestHandler):
                 }
             elif first_name:
                 # Score first name only
-                logger.info(f"Scoring first name: {first_name}")
-                score = scorer.calculate_first_name_uniqueness(first_name)
-                return {
+                logger.debug(f"Scoring first name: {first_name}")
+                if explain:
+                    explanation = scorer.explain_name(first_name, "first")
+                    score = explanation["total_score"]
+                else:
+                    score = scorer.calculate_first_name_uniqueness(first_name)
+                result = {
                     "score": round(score),
                     "type": "first",
                     "firstName": first_name
                 }
             else:
                 # Score last name only
-                logger.info(f"Scoring last name: {last_name}")
-                score = scorer.calculate_last_name_uniqueness(last_name)
-                return {
+                logger.debug(f"Scoring last name: {last_name}")
+                if explain:
+                    explanation = scorer.explain_name(last_name, "last")
+                    score = explanation["total_score"]
+                else:
+                    score = scorer.calculate_last_name_uniqueness(last_name)
+                result = {
                     "score": round(score),
                     "type": "last",
                     "lastName": last_name
                 }
+            if explain:
+                result["explanation"] = explanation
+            return result
         except Exception as e:
             logger.error(f"Error scoring name: {str(e)}", exc_info=True)
             raise
@@ -167,7 +245,7 @@ class handler(BaseHTTPRequestHandler):
             logger.warning("Compare names request with no names provided")
             return {"error": "Please provide names to compare"}
         
-        logger.info(f"Comparing {len(names_list)} names")
+        logger.debug(f"Comparing {len(names_list)} names")
         results = []
 
         try:
@@ -211,4 +289,161 @@ class handler(BaseHTTPRequestHandler):
             return {"results": results}
         except Exception as e:
             logger.error(f"Error comparing names: {str(e)}", exc_info=True)
-            raise 
\ No newline at end of file
+            raise
+
+    def handle_score_stream(self):
+        """
+        Handle streaming bulk scoring requests.
+
+        The request body is newline-delimited JSON, one name per line, either
+        {"firstName": ..., "lastName": ...}, ["first", "last"] or a single name string.
+        Lines are read incrementally and scored STREAM_CHUNK_SIZE at a time, and each
+        chunk of results is written back straight away as NDJSON using chunked transfer
+        encoding, so memory stays flat however large the upload is.
+        """
+        # HTTP/1.0 clients cannot receive chunked responses; stream raw and close instead
+        chunked = self.request_version == "HTTP/1.1"
+        self.send_response(200)
+        self.send_header('Content-type', 'application/x-ndjson')
+        for key, value in cors_headers().items():
+            self.send_header(key, value)
+        if chunked:
+            self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        total = 0
+        records = []
+        phase_times = {"parse": 0.0, "score": 0.0, "serialize": 0.0}
+        for line_number, line in enumerate(self.iter_request_lines(), 1):
+            if not line.strip():
+                continue
+            records.append((line_number, line))
+            if len(records) >= STREAM_CHUNK_SIZE:
+                results = score_stream_records(records, phase_times)
+                total += self.write_stream_results(results, chunked, phase_times)
+                records = []
+        if records:
+            results = score_stream_records(records, phase_times)
+            total += self.write_stream_results(results, chunked, phase_times)
+
+        if chunked:
+            self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+        for phase, seconds in phase_times.items():
+            metrics.observe('/api/score-stream', phase, seconds)
+        metrics.count_request('/api/score-stream', 200)
+        logger.debug(f"Streamed scores for {total} records")
+
+    def iter_request_lines(self):
+        """Yield the lines of the request body as it arrives, without reading it all into memory"""
+        pending = b""
+        for block in self.iter_request_body():
+            pending += block
+            *lines, pending = pending.split(b"\n")
+            for line in lines:
+                yield line
+        if pending:
+            yield pending
+
+    def iter_request_body(self, block_size=65536):
+        """Yield blocks of the request body, for both Content-Length and chunked uploads"""
+        if 'chunked' in self.headers.get('Transfer-Encoding', '').lower():
+            while True:
+                size = int(self.rfile.readline().split(b";")[0].strip(), 16)
+                if size == 0:
+                    # Skip any trailer headers up to the blank line ending the body
+                    while self.rfile.readline().strip():
+                        pass
+                    return
+                yield self.rfile.read(size)
+                self.rfile.readline()  # CRLF after each chunk
+        else:
+            remaining = int(self.headers.get('Content-Length', 0))
+            while remaining > 0:
+                block = self.rfile.read(min(block_size, remaining))
+                if not block:
+                    return
+                remaining -= len(block)
+                yield block
+
+    def write_stream_results(self, results, chunked, phase_times):
+        """Write a chunk of stream results as NDJSON and flush it to the client"""
+        start = time.perf_counter()
+        data = "".join(json.dumps(result) + "\n" for result in results).encode()
+        if chunked:
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        else:
+            self.wfile.write(data)
+        self.wfile.flush()
+        phase_times["serialize"] += time.perf_counter() - start
+        return len(results)
+
+
+def parse_stream_record(line):
+    """Parse one NDJSON line into a (first_name, last_name) pair"""
+    record = json.loads(line)
+    if isinstance(record, dict):
+        first_name, last_name = record.get('firstName') or '', record.get('lastName') or ''
+    elif isinstance(record, list):
+        first_name = record[0] if len(record) > 0 else ''
+        last_name = record[1] if len(record) > 1 else ''
+    else:
+        first_name, last_name = record, ''
+    if not isinstance(first_name, str) or not isinstance(last_name, str):
+        raise ValueError("Names must be strings")
+    return first_name.strip(), last_name.strip()
+
+
+def score_stream_records(records, phase_times):
+    """
+    Score a chunk of (line_number, raw line) stream records.
+
+    Uses the vectorized scorer.score_batch when numpy is available, giving the same
+    scores as the per-name methods used by /api/compare-names. Parse and score time
+    are added to phase_times.
+    """
+    start = time.perf_counter()
+    results = []
+    names = []
+    for line_number, line in records:
+        try:
+            first_name, last_name = parse_stream_record(line)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            results.append({"line": line_number, "error": "Invalid JSON"})
+            continue
+        except ValueError as e:
+            results.append({"line": line_number, "error": str(e)})
+            continue
+        if not first_name and not last_name:
+            results.append({"line": line_number, "error": "Please provide at least one name"})
+            continue
+        results.append(None)
+        names.append((len(results) - 1, first_name, last_name))
+
+    parsed = time.perf_counter()
+    phase_times["parse"] += parsed - start
+    if not names:
+        return results
+
+    first_names = [first_name for _, first_name, _ in names]
+    last_names = [last_name for _, _, last_name in names]
+    try:
+        batch = scorer.score_batch(first_names, last_names)
+        scores = [
+            batch["total_score"][i] if first_name else batch["last_total_score"][i]
+            for i, first_name in enumerate(first_names)
+        ]
+    except ImportError:
+        scores = [
+            scorer.calculate_full_name_uniqueness(first_name, last_name) if first_name
+            else scorer.calculate_last_name_uniqueness(last_name)
+            for first_name, last_name in zip(first_names, last_names)
+        ]
+
+    for (position, first_name, last_name), score in zip(names, scores):
+        results[position] = {
+            "name": f"{first_name} {last_name}".strip(),
+            "score": round(float(score))
+        }
+    phase_times["score"] += time.perf_counter() - parsed
+    return results
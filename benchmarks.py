@@ -0,0 +1,554 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import sqlite3
+import string
+import sys
+import tempfile
+import time
+from collections import Counter
+
+from name_normalizer import SUFFIXES, NameNormalizer, load_words
+import name_uniqueness_scorer
+from name_uniqueness_scorer import NameUniquenessScorer
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Sizes of the synthetic corpus and review database the suite runs on, before --scale
+SUITE_CONFIG = {
+    "seed": 42,
+    "years": 10,
+    "first_names": 20000,
+    "last_names": 50000,
+    "authors": 5000,
+    "names_timed": 2000,
+}
+
+# Real names mixed into the synthetic corpus, so known-name paths see familiar input
+COMMON_FIRST_NAMES = ["james", "mary", "john", "patricia", "robert", "jennifer", "michael", "linda",
+                      "william", "elizabeth", "david", "barbara", "luna", "zephyr", "priya", "keiko"]
+COMMON_LAST_NAMES = ["smith", "johnson", "williams", "brown", "jones", "garcia", "miller", "davis",
+                     "patel", "nakamura", "okonkwo", "lindqvist"]
+
+
+def time_call(func, args_list, repeat=3):
+    """Return the best per-call time in microseconds for func over args_list"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for args in args_list:
+            func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(args_list) * 1e6
+
+
+def random_unknown_names(name_counts, count, seed=42):
+    """Generate made-up lowercase names that are not present in name_counts"""
+    rng = random.Random(seed)
+    names = []
+    while len(names) < count:
+        name = ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10)))
+        if name not in name_counts:
+            names.append(name)
+    return names
+
+
+def legacy_bigram_rarity(name, name_counts):
+    """Bigram rarity as computed before the bigram index existed"""
+    bigrams = [name[i:i+2].lower() for i in range(len(name)-1)]
+    all_names_text = ' '.join(name_counts.keys()).lower()
+    return sum(1 for bg in bigrams if ''.join(bg) not in all_names_text) / len(bigrams) if bigrams else 0
+
+
+def indexed_bigram_rarity(name, known_bigrams):
+    """Bigram rarity using a precomputed bigram index"""
+    bigrams = [name[i:i+2] for i in range(len(name)-1)]
+    return sum(1 for bg in bigrams if bg not in known_bigrams) / len(bigrams) if bigrams else 0
+
+
+def benchmark_bigram_index(scorer, count=200):
+    """Compare the unknown-name bigram rarity step with and without the precomputed index"""
+    print("\n=== Unknown-name bigram rarity ===")
+    datasets = [
+        ("first", scorer.first_name_counts, scorer.first_name_bigrams),
+        ("last", scorer.last_name_counts, scorer.last_name_bigrams),
+    ]
+    for label, name_counts, known_bigrams in datasets:
+        names = random_unknown_names(name_counts, count)
+
+        mismatches = sum(1 for name in names
+                         if legacy_bigram_rarity(name, name_counts) != indexed_bigram_rarity(name, known_bigrams))
+
+        legacy_us = time_call(legacy_bigram_rarity, [(name, name_counts) for name in names], repeat=1)
+        indexed_us = time_call(indexed_bigram_rarity, [(name, known_bigrams) for name in names])
+        print(f"{label} names ({len(name_counts)} in corpus, {len(known_bigrams)} bigrams):")
+        print(f"  join + substring search: {legacy_us:10.1f} us/name")
+        print(f"  bigram index:            {indexed_us:10.1f} us/name")
+        print(f"  speedup:                 {legacy_us / indexed_us:10.1f}x")
+        print(f"  mismatched results:      {mismatches}")
+
+
+def benchmark_score_batch(scorer, count=100000):
+    """Compare score_batch throughput with calling calculate_full_name_uniqueness per name"""
+    print("\n=== Batch scoring ===")
+    rng = random.Random(42)
+    first_pool = list(scorer.first_name_counts)[:5000] + random_unknown_names(scorer.first_name_counts, 1000)
+    last_pool = list(scorer.last_name_counts)[:5000] + random_unknown_names(scorer.last_name_counts, 1000)
+    first_names = [rng.choice(first_pool) for _ in range(count)]
+    last_names = [rng.choice(last_pool) for _ in range(count)]
+
+    start = time.perf_counter()
+    results = scorer.score_batch(first_names, last_names)
+    batch_seconds = time.perf_counter() - start
+
+    # The scalar path is timed on a sample to keep the benchmark short
+    sample = min(count, 20000)
+    start = time.perf_counter()
+    scalar_scores = [scorer.calculate_full_name_uniqueness(first, last)
+                     for first, last in zip(first_names[:sample], last_names[:sample])]
+    scalar_seconds = (time.perf_counter() - start) * count / sample
+
+    mismatches = sum(1 for i, score in enumerate(scalar_scores) if results["total_score"][i] != score)
+    print(f"{count} full names:")
+    print(f"  calculate_full_name_uniqueness: {count / scalar_seconds:12.0f} names/sec")
+    print(f"  score_batch:                    {count / batch_seconds:12.0f} names/sec")
+    print(f"  speedup:                        {scalar_seconds / batch_seconds:12.1f}x")
+    print(f"  mismatched results:             {mismatches}")
+
+
+def legacy_score_name_components(scorer, name, name_counts, total_names):
+    """_score_name_components as written before ScoringPlan: weights looked up per use, if/elif tiers"""
+    w = scorer.weights
+    name = name.strip().lower()
+    frequency = name_counts.get(name.lower(), 0) / total_names if total_names > 0 else 0
+    if frequency == 0:
+        frequency_score = w["unknown_name_base_score"]
+        bigrams = [name[i:i+2] for i in range(len(name)-1)]
+        known_bigrams = scorer._bigram_index_for(name_counts)
+        bigram_rarity = sum(1 for bg in bigrams if bg not in known_bigrams) / len(bigrams) if bigrams else 0
+        frequency_score += bigram_rarity * w["bigram_rarity_multiplier"]
+    elif frequency < w["very_rare_threshold"]:
+        frequency_score = w["very_rare_base_score"] + (1 - frequency / w["very_rare_threshold"]) * w["very_rare_bonus_max"]
+    elif frequency < w["uncommon_threshold"]:
+        frequency_score = w["uncommon_base_score"] + (1 - frequency / w["uncommon_threshold"]) * w["uncommon_bonus_max"]
+    elif frequency < w["moderate_threshold"]:
+        frequency_score = w["moderate_base_score"] + (1 - frequency / w["moderate_threshold"]) * w["moderate_bonus_max"]
+    elif frequency < w["common_threshold"]:
+        frequency_score = w["common_base_score"] + (1 - frequency / w["common_threshold"]) * w["common_bonus_max"]
+    else:
+        frequency_score = max(w["very_common_max_score"] * (1 - frequency / w["very_common_scale_factor"]), 0)
+    frequency_score = (frequency_score / 100) * w["frequency_weight"]
+
+    length_factor = min(len(name) / w["max_name_length"], 1.0)
+    unusual_chars = sum(1 for c in name if c not in 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ -\'')
+    unusual_chars_factor = min(unusual_chars / w["max_unusual_chars"], 1.0)
+    structural_score = w["structural_weight"] * (
+        w["length_factor_weight"] * length_factor +
+        w["unusual_chars_weight"] * unusual_chars_factor
+    )
+
+    letter_dist = Counter(name.lower())
+    common_letters = sum(letter_dist[c] for c in 'etaoinshrdlu' if c in letter_dist) / len(name) if name else 0
+    letter_uniqueness = w["letter_dist_weight"] * (1 - common_letters)
+
+    total_score = min(max(frequency_score + structural_score + letter_uniqueness, 0), 100)
+    return {
+        "frequency_score": round(frequency_score, 1),
+        "structural_score": round(structural_score, 1),
+        "letter_uniqueness": round(letter_uniqueness, 1),
+        "total_score": round(total_score, 1)
+    }
+
+
+def benchmark_scoring_plan(scorer, count=20000):
+    """Compare name scoring from the compiled ScoringPlan with the per-call weights lookups it replaced"""
+    print("\n=== Compiled scoring plan ===")
+    rng = random.Random(42)
+    datasets = [
+        ("first", scorer.first_name_counts, scorer.total_first_names),
+        ("last", scorer.last_name_counts, scorer.total_last_names),
+    ]
+    for label, name_counts, total_names in datasets:
+        pool = list(name_counts)[:5000] + random_unknown_names(name_counts, 500)
+        names = [rng.choice(pool) for _ in range(count)]
+        args = [(name, name_counts, total_names) for name in names]
+
+        mismatches = sum(1 for name in names
+                         if legacy_score_name_components(scorer, name, name_counts, total_names)
+                         != scorer._score_name_components(name, name_counts, total_names))
+
+        legacy_us = time_call(legacy_score_name_components, [(scorer, *arg) for arg in args])
+        plan_us = time_call(scorer._score_name_components, args)
+        print(f"{label} names ({count} scored):")
+        print(f"  weights dict + if/elif tiers: {legacy_us:10.2f} us/name")
+        print(f"  compiled scoring plan:        {plan_us:10.2f} us/name")
+        print(f"  speedup:                      {legacy_us / plan_us:10.1f}x")
+        print(f"  mismatched results:           {mismatches}")
+
+
+def legacy_is_valid_name(name):
+    """is_valid_name as written before NameNormalizer, recompiling its pattern per call"""
+    pattern = re.compile(r'[@#$%^&*+=<>{}\d[]|/]')
+    if pattern.findall(name):
+        return False
+    if name.count('.') > 0:
+        return False
+    if name.count('-') > 1:
+        return False
+    name_parts = name.split()
+    if len(name_parts[0]) == 1:
+        return False
+    if len(name_parts[-1]) == 1:
+        return False
+    return True
+
+
+def legacy_simplify_name(author_name, scorer, words):
+    """simplify_name as written before NameNormalizer: one re.sub per suffix, words as a list"""
+    for suffix in SUFFIXES:
+        pattern = f"^{suffix}\\s|\\s{suffix}$"
+        author_name = re.sub(pattern, "", author_name, flags=re.IGNORECASE)
+    author_parts = author_name.split()
+    if author_parts[0].isupper():
+        return (author_parts[0], "", False)
+    author_name = author_name.lower()
+    author_parts = author_name.split()
+    if len(author_parts) < 2:
+        return (author_parts[0], "", False)
+    if len(author_parts) >= 2:
+        author_name = f"{author_parts[0]} {author_parts[-1]}"
+        author_parts = author_name.split()
+    if not legacy_is_valid_name(author_name):
+        return (author_parts[0], "", False)
+    parts = author_name.split()
+    if len(parts) == 1:
+        return (parts[0].lower(), "", False)
+    first_name = parts[0].lower()
+    last_name = parts[-1].lower()
+    if not scorer.name_exists(first_name, "first") and not scorer.name_exists(last_name, "last"):
+        return ("", "", False)
+    if (first_name in words and not scorer.name_exists(first_name, "first")):
+        return (author_parts[0], "", False)
+    if (last_name in words and not scorer.name_exists(last_name, "last")):
+        return (author_parts[0], "", False)
+    if len(parts) > 1 and (len(parts[-1]) == 1 or (len(parts[-1]) == 2 and parts[-1].endswith('.'))):
+        if len(parts) > 2:
+            last_name = parts[-2].lower()
+        else:
+            last_name = ""
+    return (first_name, last_name, True)
+
+
+def random_author_names(scorer, words, count, seed=42):
+    """Generate review-author-like names: real and made-up names, titles, handles and words"""
+    rng = random.Random(seed)
+    first_pool = list(scorer.first_name_counts)[:2000] + random_unknown_names(scorer.first_name_counts, 200)
+    last_pool = list(scorer.last_name_counts)[:2000] + random_unknown_names(scorer.last_name_counts, 200)
+    word_pool = rng.sample(sorted(words), min(len(words), 500))
+    names = []
+    for _ in range(count):
+        parts = [rng.choice(first_pool), rng.choice(last_pool)]
+        kind = rng.random()
+        if kind < 0.1:
+            parts = [rng.choice(first_pool)]
+        elif kind < 0.2:
+            parts = [rng.choice(word_pool), rng.choice(last_pool)]
+        elif kind < 0.25:
+            parts.insert(0, rng.choice(SUFFIXES))
+        elif kind < 0.3:
+            parts.append(rng.choice(SUFFIXES))
+        elif kind < 0.35:
+            parts.insert(1, rng.choice(string.ascii_uppercase) + ".")
+        elif kind < 0.4:
+            parts[-1] += str(rng.randint(1, 99))
+        name = " ".join(part.capitalize() for part in parts)
+        names.append(name.upper() if rng.random() < 0.05 else name)
+    return names
+
+
+def benchmark_normalizer(scorer, count=20000):
+    """Compare NameNormalizer.simplify with the original per-suffix simplify_name"""
+    print("\n=== Author name normalization ===")
+    words_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "words.txt")
+    words = load_words(words_path)
+    word_list = sorted(words)
+    normalizer = NameNormalizer(scorer, words)
+    names = random_author_names(scorer, words, count)
+
+    mismatches = sum(1 for name in names
+                     if legacy_simplify_name(name, scorer, word_list) != normalizer.simplify(name))
+
+    legacy_us = time_call(legacy_simplify_name, [(name, scorer, word_list) for name in names], repeat=1)
+    normalizer_us = time_call(normalizer.simplify, [(name,) for name in names])
+    print(f"{count} author names ({len(word_list)} dictionary words):")
+    print(f"  simplify_name:             {legacy_us:10.2f} us/name")
+    print(f"  NameNormalizer.simplify:   {normalizer_us:10.2f} us/name")
+    print(f"  speedup:                   {legacy_us / normalizer_us:10.1f}x")
+    print(f"  mismatched results:        {mismatches}")
+
+
+def benchmark_load(data_dir, last_names=None, workers=None):
+    """Compare serial and process-pool corpus loading, with per-file timings"""
+    print("\n=== Corpus loading ===")
+    workers = workers or os.cpu_count()
+    timings = {}
+    for label, loader_workers in (("serial", None), (f"{workers} workers", workers)):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            scorer = NameUniquenessScorer(data_dir, last_names, loader_workers=loader_workers)
+        timings[label] = (time.perf_counter() - start, scorer.load_timings)
+
+    serial_seconds, serial_files = timings["serial"]
+    print(f"{'file':<24} {'parse seconds':>14}")
+    for path, seconds in sorted(serial_files.items()):
+        print(f"{os.path.basename(path):<24} {seconds:14.3f}")
+    print()
+    for label, (seconds, _) in timings.items():
+        print(f"{label + ' total:':<24} {seconds:14.3f} seconds")
+    print(f"{'speedup:':<24} {serial_seconds / timings[f'{workers} workers'][0]:14.1f}x")
+
+
+@contextlib.contextmanager
+def working_directory(path):
+    """Run a block with path as the current directory; the scorer and scoring job use relative paths"""
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def synthetic_names(rng, count, common):
+    """count distinct lowercase names: the common ones first, then made-up ones"""
+    names = dict.fromkeys(common)
+    while len(names) < count:
+        names[''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 10)))] = None
+    return list(names)
+
+
+def generate_corpus(root, years=10, first_names=20000, last_names=50000, seed=42):
+    """
+    Write a deterministic synthetic corpus to root/name_data, in the SSA yobYYYY.txt and
+    census last_names.csv formats, so benchmarks need no data download.
+
+    Name counts follow a Zipf-like curve (the n-th most common name is about n times
+    rarer than the first), like the real data. Returns the name_data directory.
+    """
+    rng = random.Random(seed)
+    data_dir = os.path.join(root, "name_data")
+    os.makedirs(data_dir, exist_ok=True)
+
+    first = synthetic_names(rng, first_names, COMMON_FIRST_NAMES)
+    for year in range(1950, 1950 + years):
+        with open(os.path.join(data_dir, f"yob{year}.txt"), "w") as file:
+            for rank, name in enumerate(first, 1):
+                # Later years list about two thirds of the names, as rare names come and go
+                if year == 1950 or rank <= 100 or rng.random() < 0.66:
+                    count = max(5, int(80000 / rank * rng.uniform(0.5, 1.5)))
+                    file.write(f"{name.capitalize()},{'F' if rank % 2 else 'M'},{count}\n")
+
+    last = synthetic_names(rng, last_names, COMMON_LAST_NAMES)
+    with open(os.path.join(data_dir, "last_names.csv"), "w") as file:
+        file.write("name,rank,count,prop100k,cum_prop100k,pctwhite,pctblack,pctapi,pctaian,pct2prace,pcthispanic\n")
+        for rank, name in enumerate(last, 1):
+            count = max(100, int(2500000 / rank * rng.uniform(0.5, 1.5)))
+            file.write(f"{name.upper()},{rank},{count},1,1,1,1,1,1,1,1\n")
+    return data_dir
+
+
+def generate_reviews_db(path, scorer, words, authors=5000, seed=42):
+    """Create a reviews database whose reviews are by `authors` generated review-author names"""
+    names = random_author_names(scorer, words, authors, seed)
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE reviews (id INTEGER PRIMARY KEY AUTOINCREMENT, review_id TEXT UNIQUE, author_name TEXT)")
+    # Some authors write several reviews, as in real scrapes
+    conn.executemany("INSERT INTO reviews (review_id, author_name) VALUES (?, ?)",
+                     [(f"review-{i}", name) for i, name in enumerate(names + names[:authors // 5])])
+    conn.commit()
+    conn.close()
+
+
+def best_seconds(func, repeat=3):
+    """Return the fastest of repeat calls to func, in seconds"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_suite(config=SUITE_CONFIG, repeat=3):
+    """
+    Time the scoring pipeline on a synthetic corpus generated from config.
+
+    Every result is a time, so lower is better. Returns a dict with the config, the
+    machine it ran on and results {benchmark: {"value": ..., "unit": ...}}.
+    """
+    with working_directory(REPO_DIR):
+        import score_review_authors_simplified as scoring_job
+
+    results = {}
+    root = tempfile.mkdtemp(prefix="name_benchmarks_")
+    try:
+        data_dir = generate_corpus(root, config["years"], config["first_names"], config["last_names"], config["seed"])
+        with working_directory(root), contextlib.redirect_stdout(io.StringIO()):
+            results["corpus_load"] = (best_seconds(lambda: NameUniquenessScorer(data_dir), repeat), "s")
+            scorer = NameUniquenessScorer(data_dir)
+            scoring_job.init_scorer()
+
+        rng = random.Random(config["seed"])
+        count = config["names_timed"]
+        first_pool = list(scorer.first_name_counts)[:count]
+        last_pool = list(scorer.last_name_counts)[:count]
+        known = [rng.choice(first_pool) for _ in range(count)]
+        unknown = random_unknown_names(scorer.first_name_counts, count, config["seed"])
+        last_names = [rng.choice(last_pool) for _ in range(count)]
+        authors = random_author_names(scorer, scoring_job.words, count, config["seed"])
+
+        first_args = lambda names: [(name, scorer.first_name_counts, scorer.total_first_names) for name in names]
+        results["name_uniqueness_known"] = (
+            time_call(scorer._calculate_name_uniqueness, first_args(known), repeat), "us/name")
+        results["name_uniqueness_unknown"] = (
+            time_call(scorer._calculate_name_uniqueness, first_args(unknown), repeat), "us/name")
+        results["full_name_uniqueness"] = (
+            time_call(scorer.calculate_full_name_uniqueness, list(zip(known, last_names)), repeat), "us/name")
+        if name_uniqueness_scorer.np is not None:
+            # The same known and unknown names as above, scored as one batch
+            batch_args = [(known + unknown, last_names + last_names)]
+            results["score_batch"] = (time_call(scorer.score_batch, batch_args, repeat) / (2 * count), "us/name")
+        results["simplify_name"] = (
+            time_call(scoring_job.simplify_name, [(name,) for name in authors], repeat), "us/name")
+
+        # End to end: a full scoring run over a fresh copy of the generated reviews.db each time
+        generate_reviews_db(os.path.join(root, "reviews.template.db"), scorer, scoring_job.words,
+                            config["authors"], config["seed"])
+
+        def score_reviews():
+            shutil.copyfile(os.path.join(root, "reviews.template.db"), os.path.join(root, "reviews.db"))
+            with working_directory(root), contextlib.redirect_stdout(io.StringIO()):
+                scoring_job.score_review_authors(batch_size=100, full=True)
+
+        results["score_review_authors"] = (best_seconds(score_reviews, repeat), "s")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    return {
+        "config": dict(config),
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+        },
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": {name: {"value": value, "unit": unit} for name, (value, unit) in results.items()},
+    }
+
+
+def print_suite(report):
+    print(f"\n=== Benchmark suite ({report['config']['authors']} authors, "
+          f"{report['config']['first_names']} first names, {report['config']['last_names']} last names) ===")
+    for name, result in report["results"].items():
+        print(f"{name:<26} {result['value']:12.3f} {result['unit']}")
+
+
+def compare_results(baseline, current, tolerance=0.10):
+    """
+    Compare two suite reports, flagging benchmarks more than tolerance (a fraction)
+    slower than the baseline. Returns [(name, baseline value, current value, change, regressed)];
+    a baseline benchmark missing from current has value and change None and counts as regressed.
+    """
+    rows = []
+    for name, base in baseline["results"].items():
+        if name not in current["results"]:
+            rows.append((name, base["value"], None, None, True))
+            continue
+        value = current["results"][name]["value"]
+        change = value / base["value"] - 1 if base["value"] else 0.0
+        rows.append((name, base["value"], value, change, change > tolerance))
+    return rows
+
+
+def print_comparison(rows, baseline, tolerance):
+    print(f"\n=== Compared with baseline from {baseline.get('created', 'unknown')} "
+          f"(tolerance {tolerance:.0%}) ===")
+    print(f"{'benchmark':<26} {'baseline':>12} {'current':>12} {'change':>9}")
+    for name, base, value, change, regressed in rows:
+        unit = baseline["results"][name]["unit"]
+        if value is None:
+            print(f"{name:<26} {base:12.3f} {'-':>12} {'-':>9} {unit}  MISSING")
+            continue
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{name:<26} {base:12.3f} {value:12.3f} {change:+9.1%} {unit}{flag}")
+    missing = sum(1 for row in rows if row[2] is None)
+    regressions = sum(1 for row in rows if row[4]) - missing
+    print(f"\n{regressions} regression{'s' if regressions != 1 else ''} beyond {tolerance:.0%}")
+    if missing:
+        print(f"{missing} baseline benchmark{'s' if missing != 1 else ''} missing from the current results")
+
+
+def scaled_config(scale):
+    """SUITE_CONFIG with every size multiplied by scale"""
+    return {key: value if key in ("seed", "years") else max(1, int(value * scale))
+            for key, value in SUITE_CONFIG.items()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks for the name uniqueness tool")
+    parser.add_argument("benchmark", choices=["bigram", "batch", "load", "normalize", "plan", "suite", "compare"],
+                        help="Benchmark to run; suite times the whole pipeline on a synthetic corpus, "
+                             "compare runs it (or reads --results) and checks it against --baseline")
+    parser.add_argument("--data-dir", default="./name_data", help="Directory with yobYYYY.txt files")
+    parser.add_argument("--last-names", default=None, help="Custom last name CSV (defaults to the census file)")
+    parser.add_argument("--count", type=int, default=200, help="Number of names to time")
+    parser.add_argument("--workers", type=int, default=None, help="Loader processes (defaults to the CPU count)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply the suite's corpus and name counts")
+    parser.add_argument("--repeat", type=int, default=3, help="Suite runs per benchmark; the fastest is kept")
+    parser.add_argument("--output", default=None, help="Save the suite results as JSON, e.g. a new baseline")
+    parser.add_argument("--baseline", default="benchmark_baseline.json", help="Baseline JSON to compare against")
+    parser.add_argument("--results", default=None, help="Compare these saved results instead of running the suite")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="Slowdown over the baseline, as a fraction, that counts as a regression")
+    args = parser.parse_args()
+
+    if args.benchmark in ("suite", "compare"):
+        if args.benchmark == "compare":
+            with open(args.baseline) as file:
+                baseline = json.load(file)
+        if args.results:
+            with open(args.results) as file:
+                report = json.load(file)
+        else:
+            # Compare like with like: rerun at the baseline's sizes
+            config = baseline["config"] if args.benchmark == "compare" else scaled_config(args.scale)
+            report = run_suite(config, args.repeat)
+        print_suite(report)
+        if args.output:
+            with open(args.output, "w") as file:
+                json.dump(report, file, indent=2)
+            print(f"Results saved to {args.output}")
+        if args.benchmark == "compare":
+            rows = compare_results(baseline, report, args.tolerance)
+            print_comparison(rows, baseline, args.tolerance)
+            sys.exit(1 if any(row[4] for row in rows) else 0)
+    elif args.benchmark == "load":
+        benchmark_load(args.data_dir, args.last_names, args.workers)
+    else:
+        scorer = NameUniquenessScorer(args.data_dir, args.last_names)
+        if args.benchmark == "bigram":
+            benchmark_bigram_index(scorer, args.count)
+        elif args.benchmark == "batch":
+            benchmark_score_batch(scorer, args.count)
+        elif args.benchmark == "normalize":
+            benchmark_normalizer(scorer, args.count)
+        elif args.benchmark == "plan":
+            benchmark_scoring_plan(scorer, args.count)
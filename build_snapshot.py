@@ -0,0 +1,35 @@
+import argparse
+import os
+import time
+
+from name_snapshot import write_snapshot
+from name_uniqueness_scorer import NameUniquenessScorer
+
+
+def build_snapshot(first_name_dir="./name_data", last_name_source=None, output_path="./name_data/corpus.snap"):
+    """
+    Load the text corpus once and compile it into a snapshot file that
+    NameUniquenessScorer.from_snapshot can memory-map.
+    """
+    start_time = time.time()
+    scorer = NameUniquenessScorer(first_name_dir, last_name_source)
+    load_time = time.time() - start_time
+
+    write_snapshot(scorer, output_path)
+    size_mb = os.path.getsize(output_path) / (1024 * 1024)
+    print(f"Parsed text corpus in {load_time:.2f} seconds")
+    print(f"Snapshot saved to {output_path} ({size_mb:.2f} MB)")
+
+    start_time = time.time()
+    NameUniquenessScorer.from_snapshot(output_path)
+    print(f"Snapshot loads in {(time.time() - start_time) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compile the name corpus into a memory-mappable snapshot")
+    parser.add_argument("--data-dir", default="./name_data", help="Directory with yobYYYY.txt files")
+    parser.add_argument("--last-names", default=None, help="Custom last name CSV (defaults to the census file)")
+    parser.add_argument("--output", default="./name_data/corpus.snap", help="Snapshot file to write")
+    args = parser.parse_args()
+
+    build_snapshot(args.data_dir, args.last_names, args.output)
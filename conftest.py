@@ -0,0 +1,63 @@
+"""
+Shared pytest fixtures: a generated name corpus, scorers built from it, and the API
+serving it
+"""
+
+import contextlib
+import io
+import threading
+from http.server import HTTPServer
+
+import pytest
+
+import benchmarks
+from name_snapshot import write_snapshot
+from name_uniqueness_scorer import NameUniquenessScorer
+
+
+@pytest.fixture(scope="session")
+def corpus_root(tmp_path_factory):
+    """Directory holding a generated corpus in name_data/ (yobYYYY.txt files and last_names.csv)"""
+    root = str(tmp_path_factory.mktemp("corpus"))
+    benchmarks.generate_corpus(root, years=3, first_names=2000, last_names=3000)
+    return root
+
+
+@pytest.fixture(scope="session")
+def build_scorer(corpus_root):
+    """Factory for scorers over the generated corpus; keyword arguments go to NameUniquenessScorer"""
+    def build(**options):
+        with benchmarks.working_directory(corpus_root), contextlib.redirect_stdout(io.StringIO()):
+            return NameUniquenessScorer("name_data", **options)
+    return build
+
+
+@pytest.fixture(scope="session")
+def corpus_snapshot(build_scorer, tmp_path_factory):
+    """Snapshot of the generated corpus, as built by build_snapshot.py"""
+    path = str(tmp_path_factory.mktemp("snapshot") / "corpus.snap")
+    write_snapshot(build_scorer(), path)
+    return path
+
+
+@pytest.fixture(scope="session")
+def api_index(corpus_snapshot):
+    """The api.index module, scoring with the generated corpus"""
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setenv("NAME_API_SNAPSHOT", corpus_snapshot)
+        import api.index
+        # The module may already have loaded another corpus when it was first imported
+        patch.setattr(api.index, "scorer",
+                      NameUniquenessScorer.from_snapshot(corpus_snapshot, cache_size=api.index.SCORER_CACHE_SIZE))
+        yield api.index
+
+
+@pytest.fixture
+def api_port(api_index):
+    """Port of an API server running in a background thread"""
+    server = HTTPServer(("127.0.0.1", 0), api_index.handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
@@ -1,102 +1,138 @@
+import argparse
+import array
 import csv
+import os
 
+import numpy as np
 
-def count_high_scores(threshold=50):
+RESULTS_CSV = "simplified_name_scores.csv"
+RESULTS_SCORES = "simplified_name_scores.f64"
+
+# Position of the uniqueness score in the CSV rows
+SCORE_INDEX = 3
+
+# Edges of the score distribution: 0-10, 10-20, ..., 90-100. Every bin includes its
+# lower edge; the last also includes its upper edge, so a score of 100 is counted.
+DEFAULT_BIN_EDGES = (0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 100)
+
+
+def read_score_column(csv_path=RESULTS_CSV):
+    """
+    Load the score column of the results CSV into a float64 array.
+
+    The file is read in a single pass that keeps only the scores; rows without a score
+    column, or whose score is not a number, are skipped with a message. Returns
+    (scores, total rows read).
+    """
+    scores = array.array("d")
+    row_count = 0
+    with open(csv_path, 'r', newline='', encoding='utf-8') as csvfile:
+        reader = csv.reader(csvfile)
+        header = next(reader)  # Skip header row
+        print(f"Header: {header}")
+        for row_count, row in enumerate(reader, 1):
+            if len(row) <= SCORE_INDEX:
+                if row_count < 10:  # Only print first few errors
+                    print(f"Row {row_count} has insufficient columns: {row}")
+                continue
+            try:
+                scores.append(float(row[SCORE_INDEX]))
+            except ValueError as e:
+                print(f"Error parsing score in row {row_count}: {e}")
+                print(f"Row data: {row}")
+    return np.frombuffer(scores, dtype=np.float64), row_count
+
+
+def load_scores(csv_path=RESULTS_CSV, scores_path=RESULTS_SCORES):
+    """
+    Load every score from the results of score_review_authors_simplified.py.
+
+    Reads the binary score file the scoring job writes alongside the CSV when it is
+    at least as new as the CSV, and falls back to parsing the CSV's score column.
+    Returns (scores, total rows).
+    """
+    if os.path.exists(scores_path) and (not os.path.exists(csv_path)
+                                        or os.path.getmtime(scores_path) >= os.path.getmtime(csv_path)):
+        print(f"Reading scores from {scores_path}")
+        scores = np.fromfile(scores_path, dtype=np.float64)
+        return scores, len(scores)
+    print(f"Reading scores from {csv_path}")
+    return read_score_column(csv_path)
+
+
+def summarize_scores(scores, thresholds=(50,), bin_edges=DEFAULT_BIN_EDGES, percentiles=(), top_k=0):
+    """
+    Compute every statistic of count_high_scores from one sort of the score array.
+
+    Scores of -1 mark invalid names and are left out of everything. Each valid score
+    falls in the bin [edges[i], edges[i + 1]), the last bin also taking its upper edge;
+    scores outside the edges are in no bin. Thresholds count scores strictly above them.
+    Once the valid scores are sorted, each bin edge, threshold and percentile is a
+    binary search, so asking for more of them costs next to nothing.
+
+    Args:
+        scores (ndarray): float64 scores
+        thresholds (sequence): Thresholds to count scores over
+        bin_edges (sequence): Increasing bin edges
+        percentiles (sequence): Percentiles (0-100) of the valid scores to compute
+        top_k (int): Number of highest valid scores to return, with their row indices
+
+    Returns:
+        dict: valid (count), above ({threshold: count}), bins ([(low, high, count)]),
+            percentiles ({percentile: score}), top ([(row index, score)])
+    """
+    valid_rows = np.flatnonzero(scores != -1)
+    valid = scores[valid_rows]
+    # NaN compares false with everything, so it falls in no bin and over no threshold;
+    # sorting puts any NaNs last, where they are cut off
+    ordered = np.sort(valid)
+    ordered = ordered[:len(ordered) - np.count_nonzero(np.isnan(valid))]
+
+    above = {threshold: len(ordered) - int(np.searchsorted(ordered, threshold, side="right"))
+             for threshold in thresholds}
+
+    starts = np.searchsorted(ordered, bin_edges, side="left")
+    starts[-1] = np.searchsorted(ordered, bin_edges[-1], side="right")
+    bins = [(bin_edges[i], bin_edges[i + 1], int(starts[i + 1] - starts[i])) for i in range(len(bin_edges) - 1)]
+
+    summary = {"valid": len(valid), "above": above, "bins": bins, "percentiles": {}, "top": []}
+    if len(percentiles) and len(ordered):
+        values = np.percentile(ordered, percentiles)
+        summary["percentiles"] = {p: float(value) for p, value in zip(percentiles, values)}
+    if top_k and len(ordered):
+        lowest_top = ordered[-min(top_k, len(ordered))]
+        candidates = np.flatnonzero(valid >= lowest_top)
+        # Highest first; the stable sort keeps ties in file order
+        best = candidates[np.argsort(-valid[candidates], kind="stable")][:top_k]
+        summary["top"] = [(int(valid_rows[i]), float(valid[i])) for i in best]
+    return summary
+
+
+def format_number(value):
+    """Show whole numbers without a decimal point, so 50.0 from the command line prints as 50"""
+    return str(int(value)) if float(value).is_integer() else str(value)
+
+
+def count_high_scores(threshold=50, thresholds=None, bin_edges=DEFAULT_BIN_EDGES, percentiles=(), top_k=0,
+                      csv_path=RESULTS_CSV, scores_path=RESULTS_SCORES):
     """
     Count how many names in the simplified_name_scores.csv file have a uniqueness score over the threshold.
-    
+
     Args:
         threshold (float): The score threshold to count (default: 50)
-        
+        thresholds (sequence, optional): Several thresholds to count at once, instead of threshold
+        bin_edges (sequence): Edges of the printed score distribution
+        percentiles (sequence): Percentiles of the valid scores to print
+        top_k (int): Number of highest scores to print
+
     Returns:
-        int: The count of names with scores over the threshold
+        int: The count of names with scores over the (first) threshold
     """
-    high_score_count = 0
-    valid_name_count = 0
-    score_ranges = {
-        "0-10": 0,
-        "10-20": 0,
-        "20-30": 0,
-        "30-40": 0,
-        "40-50": 0,
-        "50-60": 0,
-        "60-70": 0,
-        "70-80": 0,
-        "80-90": 0,
-        "90-100": 0
-    }
-    
+    thresholds = list(thresholds) if thresholds else [threshold]
     print("Starting to process the CSV file...")
-    
+
     try:
-        with open('simplified_name_scores.csv', 'r', newline='', encoding='utf-8') as csvfile:
-            print("File opened successfully")
-            reader = csv.reader(csvfile)
-            header = next(reader)  # Skip header row
-            print(f"Header: {header}")
-            
-            # Find the index of the score column
-            score_index = 3  # Default position based on the file we examined
-            print(f"Using score index: {score_index}")
-            
-            row_count = 0
-            for row in reader:
-                row_count += 1
-                if row_count % 10000 == 0:
-                    print(f"Processed {row_count} rows...")
-                
-                if len(row) > score_index:  # Ensure we have enough columns
-                    try:
-                        score = float(row[score_index])
-                        if score != -1:  # Count only valid names
-                            valid_name_count += 1
-                            
-                            # Categorize scores into ranges
-                            if 0 <= score < 10:
-                                score_ranges["0-10"] += 1
-                            elif 10 <= score < 20:
-                                score_ranges["10-20"] += 1
-                            elif 20 <= score < 30:
-                                score_ranges["20-30"] += 1
-                            elif 30 <= score < 40:
-                                score_ranges["30-40"] += 1
-                            elif 40 <= score < 50:
-                                score_ranges["40-50"] += 1
-                            elif 50 <= score < 60:
-                                score_ranges["50-60"] += 1
-                            elif 60 <= score < 70:
-                                score_ranges["60-70"] += 1
-                            elif 70 <= score < 80:
-                                score_ranges["70-80"] += 1
-                            elif 80 <= score < 90:
-                                score_ranges["80-90"] += 1
-                            elif 90 <= score <= 100:
-                                score_ranges["90-100"] += 1
-                            
-                            if score > threshold:
-                                high_score_count += 1
-                    except ValueError as e:
-                        print(f"Error parsing score in row {row_count}: {e}")
-                        print(f"Row data: {row}")
-                        # Skip rows with non-numeric scores
-                        if row_count < 10:  # Only print first few errors
-                            pass
-                else:
-                    if row_count < 10:  # Only print first few errors
-                        print(f"Row {row_count} has insufficient columns: {row}")
-    
-        print(f"\nTotal rows processed: {row_count}")
-        print(f"Total valid names: {valid_name_count}")
-        print(f"Names with uniqueness score > {threshold}: {high_score_count}")
-        print(f"Percentage: {(high_score_count/valid_name_count*100) if valid_name_count > 0 else 0:.2f}%")
-        
-        print("\nScore distribution:")
-        for range_name, count in score_ranges.items():
-            percentage = (count/valid_name_count*100) if valid_name_count > 0 else 0
-            print(f"{range_name}: {count} names ({percentage:.2f}%)")
-        
-        return high_score_count
-    
+        scores, row_count = load_scores(csv_path, scores_path)
     except FileNotFoundError:
         print("Error: simplified_name_scores.csv file not found.")
         return 0
@@ -104,5 +140,42 @@ def count_high_scores(threshold=50):
         print(f"Unexpected error: {e}")
         return 0
 
+    summary = summarize_scores(scores, thresholds, bin_edges, percentiles, top_k)
+    valid_name_count = summary["valid"]
+
+    print(f"\nTotal rows processed: {row_count}")
+    print(f"Total valid names: {valid_name_count}")
+    for limit, high_score_count in summary["above"].items():
+        print(f"Names with uniqueness score > {format_number(limit)}: {high_score_count}")
+        print(f"Percentage: {(high_score_count/valid_name_count*100) if valid_name_count > 0 else 0:.2f}%")
+
+    print("\nScore distribution:")
+    for low, high, count in summary["bins"]:
+        percentage = (count/valid_name_count*100) if valid_name_count > 0 else 0
+        print(f"{format_number(low)}-{format_number(high)}: {count} names ({percentage:.2f}%)")
+
+    if summary["percentiles"]:
+        print("\nPercentiles:")
+        for p, value in summary["percentiles"].items():
+            print(f"p{format_number(p)}: {value:.2f}")
+
+    if summary["top"]:
+        print(f"\nTop {len(summary['top'])} scores:")
+        for i, (row, score) in enumerate(summary["top"], 1):
+            print(f"{i}. row {row + 1}: {score}")
+
+    return summary["above"][thresholds[0]]
+
 if __name__ == "__main__":
-    count_high_scores(50) 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Summarize the uniqueness scores in simplified_name_scores.csv")
+    parser.add_argument("--threshold", type=float, action="append", default=None,
+                        help="Count names scoring over this; repeat for several thresholds (default: 50)")
+    parser.add_argument("--bins", type=float, nargs="+", default=None, help="Score distribution bin edges")
+    parser.add_argument("--percentile", type=float, action="append", default=[], help="Percentile to report; repeatable")
+    parser.add_argument("--top-k", type=int, default=0, help="Print the K highest scores")
+    parser.add_argument("--csv", default=RESULTS_CSV, help="Results CSV")
+    parser.add_argument("--scores", default=RESULTS_SCORES, help="Binary score file written with the CSV")
+    args = parser.parse_args()
+
+    count_high_scores(50, thresholds=args.threshold, bin_edges=args.bins or DEFAULT_BIN_EDGES,
+                      percentiles=args.percentile, top_k=args.top_k, csv_path=args.csv, scores_path=args.scores)
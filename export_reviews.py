@@ -1,97 +1,284 @@
+import argparse
 import sqlite3
 import csv
 import datetime
+import gzip
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 DB_PATH = "reviews.db"
 EXPORT_DIR = "exports"
 
+EXPORT_QUERY = """
+    SELECT
+        id,
+        app_id,
+        review_id,
+        rating,
+        date,
+        language,
+        author_name,
+        author_photo,
+        author_profile,
+        title,
+        body,
+        body_length,
+        version,
+        developer_reply,
+        developer_reply_date
+    FROM reviews
+    {where}
+    ORDER BY date DESC
+"""
+
+# New rows of an incremental export, in primary key order so no sort is needed
+DELTA_QUERY = EXPORT_QUERY.replace("ORDER BY date DESC", "ORDER BY id").format(where="WHERE id > ? AND id <= ?")
+
+# Lets each app_id shard read its rows already in date order, instead of scanning the
+# whole table and sorting; also serves the SELECT DISTINCT app_id that lists the shards
+CREATE_SHARD_INDEX_SQL = "CREATE INDEX IF NOT EXISTS idx_reviews_app_id_date ON reviews (app_id, date)"
+
+# File name label of the shard holding reviews without an app_id
+UNASSIGNED_SHARD = "unassigned"
+
+# Incremental export targets name files in EXPORT_DIR, so they cannot contain path separators or dots
+TARGET_PATTERN = re.compile(r"[A-Za-z0-9_-]+")
+
+# Highest review id already exported, per incremental export target
+CREATE_WATERMARKS_SQL = """
+    CREATE TABLE IF NOT EXISTS export_watermarks (
+        target TEXT PRIMARY KEY,
+        last_id INTEGER NOT NULL,
+        exported_at TEXT
+    )
+"""
+
+SET_WATERMARK_SQL = """
+    INSERT INTO export_watermarks (target, last_id, exported_at)
+    VALUES (?, ?, ?)
+    ON CONFLICT(target) DO UPDATE SET last_id=excluded.last_id, exported_at=excluded.exported_at
+"""
+
+# Dates as the API returns them, e.g. '2025-01-14T00:14:30Z' (strftime does not zero-pad
+# years before 1000, so those take the strptime path)
+ISO_DATE_PATTERN = re.compile(r"([1-9][0-9]{3})-([0-9]{2})-([0-9]{2})T([0-9]{2}):([0-9]{2}):([0-9]{2})Z")
+
 def format_date(date_str):
     """
-    Convert ISO format date string like '2025-01-14T00:14:30Z' 
-    into a human readable format "Jan 14, 2025 00:14:30"
+    Convert ISO format date string like '2025-01-14T00:14:30Z'
+    into "2025-01-14 00:14:30"
+
+    Well-formed dates are reformatted by slicing, after the same range checks strptime
+    would apply; anything else goes through strptime and is returned unchanged if it
+    does not parse.
     """
     if not date_str:
         return ""
     try:
+        match = ISO_DATE_PATTERN.fullmatch(date_str)
+        if match:
+            datetime.datetime(*map(int, match.groups()))
+            return f"{date_str[:10]} {date_str[11:19]}"
         dt = datetime.datetime.strptime(date_str, "%Y-%m-%dT%H:%M:%SZ")
         return dt.strftime("%Y-%m-%d %H:%M:%S")
     except Exception:
         return date_str
 
-def export_to_csv():
+def format_row(row):
+    # Format dates (date and developer_reply_date are at indices 4 and 14)
+    return row[:4] + (format_date(row[4]),) + row[5:14] + (format_date(row[14]),)
+
+def open_export_file(filename, compress=False):
+    if compress:
+        return gzip.open(filename, 'wt', newline='', encoding='utf-8', compresslevel=6)
+    return open(filename, 'w', newline='', encoding='utf-8')
+
+def write_rows(cursor, csvfile, columns, batch_size=10000, progress_label=""):
+    """Write the header and every row of an executed cursor to csvfile, a batch at a time"""
+    writer = csv.writer(csvfile)
+    writer.writerow(columns)
+
+    total_rows = 0
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        writer.writerows([format_row(row) for row in rows])
+
+        # Print progress every 10000 rows
+        if (total_rows + len(rows)) // 10000 > total_rows // 10000:
+            print(f"Exported {total_rows + len(rows)} rows{progress_label}...")
+        total_rows += len(rows)
+    return total_rows
+
+def table_columns(conn):
+    return [col[1] for col in conn.execute("PRAGMA table_info(reviews)")]
+
+def export_shard(app_id, filename, compress=False, batch_size=10000):
+    """Export one app's reviews to filename; runs in a worker process"""
+    conn = sqlite3.connect(DB_PATH)
+    # IS rather than =, so the shard of reviews without an app_id (None) matches them too
+    cursor = conn.execute(EXPORT_QUERY.format(where="WHERE app_id IS ?"), (app_id,))
+    with open_export_file(filename, compress) as csvfile:
+        total_rows = write_rows(cursor, csvfile, table_columns(conn), batch_size, f" for {app_id}")
+    conn.close()
+    return app_id, filename, total_rows
+
+def export_to_csv(compress=False, batch_size=10000, shard_by=None, workers=None):
+    """
+    Export every review to a CSV file, newest first, gzip-compressed with compress=True.
+    With shard_by="app_id", each app gets its own file, exported in parallel worker processes.
+    """
+    start_time = time.perf_counter()
+
     # Create exports directory if it doesn't exist
     Path(EXPORT_DIR).mkdir(exist_ok=True)
-    
+
     # Generate filename with timestamp
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"{EXPORT_DIR}/reviews_export_{timestamp}.csv"
-    
+    extension = "csv.gz" if compress else "csv"
+
     # Connect to database
     conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    # Get all column names
-    cursor.execute("PRAGMA table_info(reviews)")
-    columns = [col[1] for col in cursor.fetchall()]
-    
-    # Fetch all reviews
-    cursor.execute("""
-        SELECT 
-            id,
-            app_id,
-            review_id,
-            rating,
-            date,
-            language,
-            author_name,
-            author_photo,
-            author_profile,
-            title,
-            body,
-            body_length,
-            version,
-            developer_reply,
-            developer_reply_date
-        FROM reviews
-        ORDER BY date DESC
-    """)
-    
-    # Write to CSV
-    with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.writer(csvfile)
-        
-        # Write header
-        writer.writerow(columns)
-        
-        # Write data rows with date formatting
-        total_rows = 0
-        for row in cursor:
-            # Convert row to list for modification
-            row_list = list(row)
-            
-            # Format dates (date and developer_reply_date are at indices 4 and 14)
-            row_list[4] = format_date(row_list[4])
-            row_list[14] = format_date(row_list[14])
-            
-            writer.writerow(row_list)
-            total_rows += 1
-            
-            # Print progress every 10000 rows
-            if total_rows % 10000 == 0:
-                print(f"Exported {total_rows} rows...")
-    
-    conn.close()
-    
+
+    if shard_by == "app_id":
+        conn.execute(CREATE_SHARD_INDEX_SQL)
+        conn.commit()
+        app_ids = [row[0] for row in conn.execute("SELECT DISTINCT app_id FROM reviews ORDER BY app_id")]
+        conn.close()
+        labels = [UNASSIGNED_SHARD if app_id is None else app_id for app_id in app_ids]
+        filenames = [f"{EXPORT_DIR}/reviews_export_{timestamp}_{label}.{extension}" for label in labels]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            shards = list(executor.map(export_shard, app_ids, filenames,
+                                       [compress] * len(app_ids), [batch_size] * len(app_ids)))
+    else:
+        filename = f"{EXPORT_DIR}/reviews_export_{timestamp}.{extension}"
+        cursor = conn.execute(EXPORT_QUERY.format(where=""))
+        with open_export_file(filename, compress) as csvfile:
+            total_rows = write_rows(cursor, csvfile, table_columns(conn), batch_size)
+        conn.close()
+        shards = [(None, filename, total_rows)]
+
+    elapsed = time.perf_counter() - start_time
+    total_rows = sum(rows for _, _, rows in shards)
+    total_size = sum(Path(filename).stat().st_size for _, filename, _ in shards)
+
     print(f"\nExport complete!")
     print(f"Total rows exported: {total_rows}")
-    print(f"File saved as: {filename}")
-    
-    # Print file size
-    file_size = Path(filename).stat().st_size
-    size_mb = file_size / (1024 * 1024)
+    for app_id, filename, rows in shards:
+        print(f"File saved as: {filename}" + (f" ({rows} rows)" if shard_by else ""))
+
+    # Print file size and throughput
+    size_mb = total_size / (1024 * 1024)
     print(f"File size: {size_mb:.2f} MB")
+    print(f"Throughput: {total_rows / elapsed if elapsed else 0:.0f} rows/sec, "
+          f"{size_mb / elapsed if elapsed else 0:.1f} MB/sec written in {elapsed:.1f}s")
+    return [filename for _, filename, _ in shards]
+
+def get_export_watermark(conn, target):
+    """Highest review id already exported to target, or 0 if it has never been exported"""
+    conn.execute(CREATE_WATERMARKS_SQL)
+    row = conn.execute("SELECT last_id FROM export_watermarks WHERE target = ?", (target,)).fetchone()
+    return row[0] if row else 0
+
+def export_target(value):
+    """argparse type for --incremental: a target name that cannot escape EXPORT_DIR"""
+    if not TARGET_PATTERN.fullmatch(value):
+        raise argparse.ArgumentTypeError(f"invalid target {value!r}: use only letters, digits, '_' and '-'")
+    return value
+
+def manifest_path(target):
+    return f"{EXPORT_DIR}/{target}_manifest.json"
+
+def load_manifest(target):
+    try:
+        with open(manifest_path(target), encoding='utf-8') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {"target": target, "deltas": []}
+
+def save_manifest(manifest):
+    """Write the manifest atomically, so readers never see a partial file"""
+    path = manifest_path(manifest["target"])
+    with open(path + ".tmp", 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, indent=2)
+    os.replace(path + ".tmp", path)
+
+def export_incremental(target, compress=False, batch_size=10000):
+    """
+    Export the reviews added since target's last export to a delta CSV, in id order.
+
+    Rows are selected by primary key range above the target's watermark, so the cost
+    grows with the number of new rows rather than the table size. Each delta is listed
+    in EXPORT_DIR/<target>_manifest.json; the watermark only moves once the delta file
+    and manifest are written, so an interrupted export is simply redone next time.
+    Returns the delta filename, or None if there was nothing new.
+    """
+    if not TARGET_PATTERN.fullmatch(target):
+        raise ValueError(f"Invalid export target: {target!r}")
+    start_time = time.perf_counter()
+    Path(EXPORT_DIR).mkdir(exist_ok=True)
+
+    conn = sqlite3.connect(DB_PATH)
+    from_id = get_export_watermark(conn, target)
+    # Fix the upper bound first, so rows inserted during the export wait for the next one
+    to_id = conn.execute("SELECT MAX(id) FROM reviews").fetchone()[0] or 0
+    if to_id <= from_id:
+        conn.close()
+        print(f"No new reviews for {target} since id {from_id}")
+        return None
+
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    extension = "csv.gz" if compress else "csv"
+    filename = f"{EXPORT_DIR}/{target}_delta_{from_id + 1}_{to_id}_{timestamp}.{extension}"
+    cursor = conn.execute(DELTA_QUERY, (from_id, to_id))
+    with open_export_file(filename, compress) as csvfile:
+        total_rows = write_rows(cursor, csvfile, table_columns(conn), batch_size)
+
+    exported_at = datetime.datetime.now().isoformat(timespec="seconds")
+    manifest = load_manifest(target)
+    # Drop the entry of an earlier attempt at this same range that never moved the watermark
+    manifest["deltas"] = [delta for delta in manifest["deltas"] if delta["from_id"] != from_id + 1]
+    manifest["deltas"].append({
+        "file": os.path.basename(filename),
+        "from_id": from_id + 1,
+        "to_id": to_id,
+        "rows": total_rows,
+        "exported_at": exported_at,
+    })
+    manifest["last_id"] = to_id
+    save_manifest(manifest)
+
+    with conn:
+        conn.execute(SET_WATERMARK_SQL, (target, to_id, exported_at))
+    conn.close()
+
+    elapsed = time.perf_counter() - start_time
+    print(f"\nIncremental export complete!")
+    print(f"Exported {total_rows} new rows (ids {from_id + 1}..{to_id}) to {filename}")
+    print(f"Manifest: {manifest_path(target)}")
+    print(f"Throughput: {total_rows / elapsed if elapsed else 0:.0f} rows/sec in {elapsed:.1f}s")
+    return filename
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the reviews table to CSV")
+    parser.add_argument("--gzip", action="store_true", help="Write gzip-compressed .csv.gz files")
+    parser.add_argument("--batch-size", type=int, default=10000, help="Rows fetched and written per batch")
+    parser.add_argument("--shard-by", choices=["app_id"], default=None,
+                        help="Write one file per app, exported in parallel worker processes")
+    parser.add_argument("--workers", type=int, default=None, help="Shard export processes (defaults to the CPU count)")
+    parser.add_argument("--incremental", metavar="TARGET", type=export_target, default=None,
+                        help="Only export reviews added since TARGET's last export, to a delta file listed in its manifest")
+    args = parser.parse_args()
+    if args.incremental and args.shard_by:
+        parser.error("--incremental cannot be combined with --shard-by")
+
     print("Starting export...")
-    export_to_csv() 
\ No newline at end of file
+    if args.incremental:
+        export_incremental(args.incremental, compress=args.gzip, batch_size=args.batch_size)
+    else:
+        export_to_csv(compress=args.gzip, batch_size=args.batch_size, shard_by=args.shard_by, workers=args.workers)
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Local mock of AppTweak's reviews search endpoint, for testing pull_reviews.py
+
+Serves deterministic canned reviews for any app id, one hour apart and newest first,
+filtered by start_date/end_date and paged by offset and limit like the real API.
+Latency can grow with the offset to mimic slow deep pagination. GET /stats reports
+how many requests were served and the peak number of requests in flight at once.
+
+Usage:
+    python mock_apptweak_server.py --port 8765 --reviews-per-app 1000 --latency 0.05 --offset-latency 0.01
+    python pull_reviews.py --endpoint http://localhost:8765/api/public/store/apps/reviews/search.json
+"""
+
+import argparse
+import datetime
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+SEARCH_PATH = "/api/public/store/apps/reviews/search.json"
+
+FIRST_NAMES = ["John", "Mary", "Zephyr", "Anya", "Luis", "Keiko", "Tobias", "Priya"]
+LAST_NAMES = ["Smith", "Garcia", "Okonkwo", "Nakamura", "Lindqvist", "Patel", "Brown"]
+
+# Reviews are dated one hour apart, newest first, counting back from this instant
+NEWEST_REVIEW = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def review_index_range(start_date, end_date, reviews_per_app):
+    """Indices [first, last) of the reviews dated within start_date..end_date, inclusive days"""
+    hour = datetime.timedelta(hours=1)
+    window_start = datetime.datetime.combine(start_date, datetime.time(), datetime.timezone.utc)
+    window_end = datetime.datetime.combine(end_date + datetime.timedelta(days=1), datetime.time(), datetime.timezone.utc)
+    # Review i is dated NEWEST_REVIEW - i hours
+    first = max(0, (NEWEST_REVIEW - window_end) // hour + 1)
+    last = min(reviews_per_app, (NEWEST_REVIEW - window_start) // hour + 1)
+    return first, max(first, last)
+
+
+def make_review(app_id, index):
+    """Canned review number `index` (0 = most recent) of an app"""
+    date = NEWEST_REVIEW - datetime.timedelta(hours=index)
+    return {
+        "id": f"{app_id}-{index}",
+        "rating": index % 5 + 1,
+        "date": date.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "language": "en",
+        "author": {
+            "name": f"{FIRST_NAMES[index % len(FIRST_NAMES)]} {LAST_NAMES[index % len(LAST_NAMES)]}",
+            "photo": "",
+            "profile": "",
+        },
+        "title": "",
+        "body": f"Review {index} of {app_id}",
+        "body_length": len(f"Review {index} of {app_id}"),
+        "version": "1.0",
+        "developer_reply": None,
+        "developer_reply_date": None,
+    }
+
+
+class MockAppTweakServer(ThreadingHTTPServer):
+    """Threading HTTP server holding the canned data settings and request counters"""
+
+    daemon_threads = True
+    # The default listen backlog of 5 would stall bursts of concurrent connections
+    request_queue_size = 128
+
+    def __init__(self, server_address, reviews_per_app=1000, latency=0.0, fail_offsets=(), offset_latency=0.0):
+        super().__init__(server_address, MockAppTweakHandler)
+        self.reviews_per_app = reviews_per_app
+        self.latency = latency
+        # Extra seconds per 1000 offset, so deep pages are slower like on the real API
+        self.offset_latency = offset_latency
+        # Offsets answered with a 500 error, to test recovery
+        self.fail_offsets = set(fail_offsets)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requested_offsets = []
+
+    def handle_error(self, request, client_address):
+        # Clients that cancel speculative requests hang up mid-response; that is expected
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+    def stats(self):
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "in_flight": self.in_flight,
+                "max_in_flight": self.max_in_flight,
+            }
+
+
+class MockAppTweakHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/stats":
+            return self.send_json(200, self.server.stats())
+        if url.path != SEARCH_PATH:
+            return self.send_json(404, {"error": "Not found"})
+
+        query = parse_qs(url.query)
+        app_id = query.get("apps", [""])[0]
+        try:
+            offset = int(query.get("offset", ["0"])[0])
+            limit = int(query.get("limit", ["100"])[0])
+            start_date = datetime.date.fromisoformat(query.get("start_date", ["2016-01-01"])[0])
+            end_date = datetime.date.fromisoformat(query.get("end_date", [datetime.date.today().isoformat()])[0])
+        except ValueError:
+            return self.send_json(400, {"error": "offset and limit must be integers and dates YYYY-MM-DD"})
+
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            server.requested_offsets.append((app_id, offset))
+        try:
+            delay = server.latency + server.offset_latency * offset / 1000
+            if delay:
+                time.sleep(delay)
+            if offset in server.fail_offsets:
+                return self.send_json(500, {"error": "Simulated failure"})
+            first, last = review_index_range(start_date, end_date, server.reviews_per_app)
+            indices = range(first + offset, min(first + offset + limit, last))
+            reviews = [make_review(app_id, index) for index in indices]
+            self.send_json(200, {"result": {app_id: {"reviews": reviews}}})
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+
+def start_mock_server(port=0, **settings):
+    """Start a mock server on a background thread; returns (server, endpoint URL)"""
+    server = MockAppTweakServer(("127.0.0.1", port), **settings)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}{SEARCH_PATH}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve canned AppTweak review pages for testing pull_reviews.py")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("--reviews-per-app", type=int, default=1000, help="Reviews served for every app id")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before answering each page")
+    parser.add_argument("--offset-latency", type=float, default=0.0, help="Extra seconds per 1000 offset")
+    args = parser.parse_args()
+
+    server = MockAppTweakServer(("", args.port), args.reviews_per_app, args.latency,
+                                offset_latency=args.offset_latency)
+    print(f"Mock AppTweak server on http://localhost:{args.port}{SEARCH_PATH}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
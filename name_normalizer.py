@@ -0,0 +1,87 @@
+import re
+
+# Titles, company forms and channel words stripped from the start or end of author names.
+# Order matters: each suffix is removed in turn, so removing one can expose the next.
+SUFFIXES = ['mr', 'mr.', 'sr', 'sr.', 'jr', 'jr.', 'dr', 'dr.', 'ms', 'ms.', 'mrs', 'mrs.', 'inc', 'llc', 'ltd', 'corp', 'gaming', 'official', 'real', 'the', 'channel', 'tv', 'yt', 'youtube', 'video', 'videos', 'gram', 'insta', 'fb', 'tweet', 'tiktok', 'live', 'gaming', 'plays', 'stream']
+
+# Characters that never appear in a real name (note: also matches the literal "/]")
+INVALID_CHARS_PATTERN = re.compile(r'[@#$%^&*+=<>{}\d[]|/]')
+
+
+def load_words(path="words.txt"):
+    """Load the dictionary word list used to reject names that are ordinary words"""
+    with open(path, "r") as file:
+        return frozenset(file.read().splitlines())
+
+
+class NameNormalizer:
+    """
+    Turns raw review author names into (first_name, last_name, is_valid) tuples.
+
+    All patterns are compiled once. A single combined pattern detects whether any
+    suffix is present at all; only names that match (rare in practice) go through
+    the ordered per-suffix removal, which gives exactly the same result as always
+    applying every removal in turn.
+    """
+
+    def __init__(self, scorer, words, suffixes=SUFFIXES):
+        self.scorer = scorer
+        self.words = frozenset(words)
+        self.suffix_patterns = [re.compile(f"^{suffix}\\s|\\s{suffix}$", re.IGNORECASE) for suffix in suffixes]
+        alternatives = "|".join(suffixes)
+        self.any_suffix_pattern = re.compile(f"^(?:{alternatives})\\s|\\s(?:{alternatives})$", re.IGNORECASE)
+
+    def strip_suffixes(self, author_name):
+        """Remove suffixes from the start or end of a name, in suffix order"""
+        if not self.any_suffix_pattern.search(author_name):
+            return author_name
+        for pattern in self.suffix_patterns:
+            author_name = pattern.sub("", author_name)
+        return author_name
+
+    @staticmethod
+    def is_valid_name(name):
+        """Check if a name appears to be a valid human name."""
+        if INVALID_CHARS_PATTERN.search(name):
+            return False
+        if '.' in name or name.count('-') > 1:
+            return False
+
+        name_parts = name.split()
+        if len(name_parts[0]) == 1 or len(name_parts[-1]) == 1:
+            return False
+        return True
+
+    def simplify(self, author_name):
+        """
+        Simplify a name to just first and last name with proper capitalization.
+        Returns a tuple of (first_name, last_name, is_valid)
+        """
+        author_name = self.strip_suffixes(author_name)
+
+        # Check if first part is all uppercase
+        author_parts = author_name.split()
+        if author_parts[0].isupper():
+            return (author_parts[0], "", False)
+
+        author_parts = author_name.lower().split()
+        if len(author_parts) < 2:
+            return (author_parts[0], "", False)
+
+        first_name = author_parts[0]
+        last_name = author_parts[-1]
+        if not self.is_valid_name(f"{first_name} {last_name}"):
+            return (first_name, "", False)
+
+        # Check if the name exists in the dataset
+        first_exists = self.scorer.name_exists(first_name, "first")
+        last_exists = self.scorer.name_exists(last_name, "last")
+        if not first_exists and not last_exists:
+            return ("", "", False)
+
+        # Reject dictionary words that are not also known names
+        if (first_name in self.words and not first_exists) or (last_name in self.words and not last_exists):
+            return (first_name, "", False)
+
+        # is_valid_name already rejected initials ("John D."), so both parts are full names
+        return (first_name, last_name, True)
@@ -0,0 +1,155 @@
+"""
+Compiled binary snapshot of the name corpus.
+
+A snapshot holds the aggregated first and last name counts, their totals and the
+bigram indexes used by the unknown-name path. It is memory-mapped read-only when
+opened, so loading costs a header read instead of parsing every yobYYYY.txt file,
+and worker processes opening the same snapshot share its pages.
+
+Layout (little-endian):
+    header      magic, version, total first/last names, offset of each table
+    table       u64 entry count, u64 offsets[count + 1], u64 counts[count], utf-8 blob
+Names in a table are sorted by their utf-8 bytes, so lookups are a binary search.
+"""
+import bisect
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+
+SNAPSHOT_MAGIC = b"NUSNAP\x00\x00"
+SNAPSHOT_VERSION = 1
+
+# magic, version, reserved, total first names, total last names, then the offset of each table
+_HEADER = struct.Struct("<8sIIQQQQQQ")
+_TABLES = ("first_names", "last_names", "first_bigrams", "last_bigrams")
+
+
+def _encode(name):
+    return name.encode("utf-8", "surrogatepass")
+
+
+def _pack_table(entries):
+    """Pack (name, count) pairs into a sorted string table"""
+    encoded = sorted((_encode(name), count) for name, count in entries)
+    offsets = [0]
+    for key, _ in encoded:
+        offsets.append(offsets[-1] + len(key))
+    return b"".join([
+        struct.pack("<Q", len(encoded)),
+        struct.pack(f"<{len(offsets)}Q", *offsets),
+        struct.pack(f"<{len(encoded)}Q", *(count for _, count in encoded)),
+        b"".join(key for key, _ in encoded),
+    ])
+
+
+def write_snapshot(scorer, path):
+    """Compile the corpus loaded into a NameUniquenessScorer into a snapshot file"""
+    tables = [
+        _pack_table(scorer.first_name_counts.items()),
+        _pack_table(scorer.last_name_counts.items()),
+        _pack_table((bigram, 1) for bigram in scorer.first_name_bigrams),
+        _pack_table((bigram, 1) for bigram in scorer.last_name_bigrams),
+    ]
+
+    offsets = []
+    position = _HEADER.size
+    for table in tables:
+        # Keep every table 8-byte aligned so its arrays can be cast in place
+        position += -position % 8
+        offsets.append(position)
+        position += len(table)
+
+    header = _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0,
+                          scorer.total_first_names, scorer.total_last_names, *offsets)
+
+    # Write to a temporary file first so readers never map a half-written snapshot
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(header)
+        for offset, table in zip(offsets, tables):
+            file.write(b"\0" * (offset - file.tell()))
+            file.write(table)
+    os.replace(tmp_path, path)
+
+
+class _KeyColumn:
+    """Read-only sequence view over the encoded names of a table, used for bisect"""
+
+    def __init__(self, blob, offsets):
+        self._blob = blob
+        self._offsets = offsets
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        return self._blob[self._offsets[index]:self._offsets[index + 1]].tobytes()
+
+
+class SnapshotCounts(Mapping):
+    """Counter-like read-only mapping of name -> count backed by a memory-mapped table"""
+
+    def __init__(self, buffer, offset):
+        count = struct.unpack_from("<Q", buffer, offset)[0]
+        start = offset + 8
+        self._offsets = buffer[start:start + 8 * (count + 1)].cast("Q")
+        start += 8 * (count + 1)
+        self._counts = buffer[start:start + 8 * count].cast("Q")
+        start += 8 * count
+        self._keys = _KeyColumn(buffer[start:start + self._offsets[count]], self._offsets)
+
+    def _index(self, name):
+        if not isinstance(name, str):
+            return -1
+        key = _encode(name)
+        index = bisect.bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            return index
+        return -1
+
+    def __getitem__(self, name):
+        index = self._index(name)
+        if index < 0:
+            raise KeyError(name)
+        return self._counts[index]
+
+    def get(self, name, default=None):
+        index = self._index(name)
+        return self._counts[index] if index >= 0 else default
+
+    def __contains__(self, name):
+        return self._index(name) >= 0
+
+    def __iter__(self):
+        for index in range(len(self._keys)):
+            yield self._keys[index].decode("utf-8", "surrogatepass")
+
+    def __len__(self):
+        return len(self._keys)
+
+
+class NameSnapshot:
+    """An opened, memory-mapped snapshot file"""
+
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = memoryview(self._mmap)
+
+        if len(buffer) < _HEADER.size:
+            raise ValueError(f"{path} is not a name snapshot")
+        magic, version, _, total_first, total_last, *offsets = _HEADER.unpack_from(buffer)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not a name snapshot")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"{path} is snapshot version {version}, expected {SNAPSHOT_VERSION}; rebuild it with build_snapshot.py")
+
+        tables = dict(zip(_TABLES, offsets))
+        self.path = path
+        self.total_first_names = total_first
+        self.total_last_names = total_last
+        self.first_name_counts = SnapshotCounts(buffer, tables["first_names"])
+        self.last_name_counts = SnapshotCounts(buffer, tables["last_names"])
+        self.first_name_bigrams = frozenset(SnapshotCounts(buffer, tables["first_bigrams"]))
+        self.last_name_bigrams = frozenset(SnapshotCounts(buffer, tables["last_bigrams"]))
@@ -1,75 +1,170 @@
 import csv
+import hashlib
+import json
 import math
 import os
 import re
-from collections import Counter, defaultdict
+import time
+from bisect import bisect_right
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from io import StringIO
+from itertools import accumulate, repeat
+from types import MappingProxyType
+from typing import NamedTuple
+
+from name_snapshot import NameSnapshot
+
+try:
+    import numpy as np
+except ImportError:  # Only score_batch needs numpy
+    np = None
+
+
+# Bump whenever a scoring change alters results for the same weights, so stored
+# scores (e.g. the author_scores table) are recomputed
+SCORER_VERSION = "1"
+
+# Default weights configuration
+DEFAULT_WEIGHTS = {
+    # Component weights (should sum to 100)
+    "frequency_weight": 80,
+    "structural_weight": 10,
+    "letter_dist_weight": 10,
+    
+    # Frequency score parameters
+    "unknown_name_base_score": 100,
+    "bigram_rarity_multiplier": 15,
+    
+    # Frequency thresholds and scores
+    "very_rare_threshold": 0.0005,
+    "very_rare_base_score": 40,
+    "very_rare_bonus_max": 20,
+    
+    "uncommon_threshold": 0.001,
+    "uncommon_base_score": 20,
+    "uncommon_bonus_max": 10,
+    
+    "moderate_threshold": 0.005,
+    "moderate_base_score": 10,
+    "moderate_bonus_max": 5,
+    
+    "common_threshold": 0.01,
+    "common_base_score": 5,
+    "common_bonus_max": 5,
+    
+    "very_common_max_score": 5,
+    "very_common_scale_factor": 0.2,
+    
+    # Structural score parameters
+    "length_factor_weight": 0.6,
+    "unusual_chars_weight": 0.4,
+    "max_name_length": 12,
+    "max_unusual_chars": 2,
+    
+    # Full name combination parameters
+    "first_name_weight": 0.6,
+    "last_name_weight": 0.4,
+    "rare_combo_threshold": 70,
+    "rare_combo_bonus": 20,
+    "common_combo_threshold": 40,
+    "common_combo_divisor": 20,
+}
+
+
+def weights_fingerprint(weights):
+    """Stable short hash of a weights configuration"""
+    encoded = json.dumps(weights, sort_keys=True).encode()
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+# Characters that do not count as unusual in the structural score
+PLAIN_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ -\'')
+# The most common letters in English; names made of them score lower on letter distribution
+COMMON_LETTERS = frozenset('etaoinshrdlu')
+
+# Frequency tiers of known names, from rarest to most common but for very_common
+FREQUENCY_TIERS = ("very_rare", "uncommon", "moderate", "common")
+
+# Most name characters score_batch pads into one chunk's arrays (names × longest name);
+# a few dozen bytes of working memory each
+BATCH_CHUNK_CELLS = 1 << 21
+
+
+class ScoringPlan(NamedTuple):
+    """
+    A weights configuration compiled for scoring, built by compile_scoring_plan.
+    
+    The tier table is searched with bisect instead of walking the if/elif ladder over
+    the thresholds. Each tier keeps its base score, threshold and bonus rather than a
+    folded slope and intercept, so that scores are computed with exactly the same
+    floating point operations as before.
+    """
+    weights: MappingProxyType
+    weights_key: tuple
+    tier_limits: tuple
+    tiers: tuple
+    very_common_max_score: float
+    very_common_scale_factor: float
+    unknown_name_base_score: float
+    bigram_rarity_multiplier: float
+    frequency_weight: float
+    structural_weight: float
+    length_factor_weight: float
+    unusual_chars_weight: float
+    max_name_length: float
+    max_unusual_chars: float
+    letter_dist_weight: float
+    first_name_weight: float
+    last_name_weight: float
+    rare_combo_threshold: float
+    rare_combo_bonus: float
+    common_combo_threshold: float
+    common_combo_divisor: float
+
+
+def compile_scoring_plan(weights):
+    """Compile a weights dict into an immutable ScoringPlan"""
+    weights = dict(weights)
+    thresholds = [weights[f"{tier}_threshold"] for tier in FREQUENCY_TIERS]
+    return ScoringPlan(
+        weights=MappingProxyType(weights),
+        weights_key=tuple(sorted(weights.items())),
+        # A frequency falls in the first tier whose threshold is above it. The running
+        # maximum keeps that true under bisect even if custom thresholds are out of order.
+        tier_limits=tuple(accumulate(thresholds, max)),
+        tiers=tuple((tier, weights[f"{tier}_base_score"], weights[f"{tier}_threshold"], weights[f"{tier}_bonus_max"])
+                    for tier in FREQUENCY_TIERS),
+        **{field: weights[field] for field in ScoringPlan._fields[4:]},
+    )
 
 
 class NameUniquenessScorer:
-    def __init__(self, first_name_dir=None, last_name_source=None, custom_weights=None):
-        # Default weights configuration
-        self.weights = {
-            # Component weights (should sum to 100)
-            "frequency_weight": 80,
-            "structural_weight": 10,
-            "letter_dist_weight": 10,
-            
-            # Frequency score parameters
-            "unknown_name_base_score": 100,
-            "bigram_rarity_multiplier": 15,
-            
-            # Frequency thresholds and scores
-            "very_rare_threshold": 0.0005,
-            "very_rare_base_score": 40,
-            "very_rare_bonus_max": 20,
-            
-            "uncommon_threshold": 0.001,
-            "uncommon_base_score": 20,
-            "uncommon_bonus_max": 10,
-            
-            "moderate_threshold": 0.005,
-            "moderate_base_score": 10,
-            "moderate_bonus_max": 5,
-            
-            "common_threshold": 0.01,
-            "common_base_score": 5,
-            "common_bonus_max": 5,
-            
-            "very_common_max_score": 5,
-            "very_common_scale_factor": 0.2,
-            
-            # Structural score parameters
-            "length_factor_weight": 0.6,
-            "unusual_chars_weight": 0.4,
-            "max_name_length": 12,
-            "max_unusual_chars": 2,
-            
-            # Full name combination parameters
-            "first_name_weight": 0.6,
-            "last_name_weight": 0.4,
-            "rare_combo_threshold": 70,
-            "rare_combo_bonus": 20,
-            "common_combo_threshold": 40,
-            "common_combo_divisor": 20,
-        }
-        
-        # Override default weights with custom weights if provided
-        if custom_weights and isinstance(custom_weights, dict):
-            for key, value in custom_weights.items():
-                if key in self.weights:
-                    self.weights[key] = value
+    def __init__(self, first_name_dir=None, last_name_source=None, custom_weights=None, cache_size=None,
+                 loader_workers=None):
+        self._init_weights(custom_weights)
+        self._init_cache(cache_size)
         
         # Initialize counters
         self.first_name_counts = Counter()
         self.last_name_counts = Counter()
         self.total_first_names = 0
         self.total_last_names = 0
-        self.letter_counts = Counter()
+        self.snapshot = None
+        self.load_timings = {}
+        
+        # Letter counts are only derived on first access; loading just tracks how many
+        # rows each first name appeared on
+        self._first_name_rows = Counter()
+        self._letter_counts = None
+        
+        # Bigram indexes for the unknown-name path, rebuilt whenever a dataset finishes loading
+        self.first_name_bigrams = frozenset()
+        self.last_name_bigrams = frozenset()
         
         # Load first name data if directory provided
         if first_name_dir:
-            self.load_ssa_data(first_name_dir)
+            self.load_ssa_data(first_name_dir, workers=loader_workers)
         
         # Load last name data
         if last_name_source:
@@ -77,35 +172,141 @@ class NameUniquenessScorer:
         else:
             self.load_census_last_names()
     
-    def load_ssa_data(self, directory_path):
-        """Load SSA baby name data from yobYYYY.txt files"""
+    @classmethod
+    def from_snapshot(cls, snapshot_path, custom_weights=None, cache_size=None):
+        """
+        Create a scorer from a corpus snapshot written by build_snapshot.py.
+        
+        The snapshot is memory-mapped rather than parsed, so this takes milliseconds
+        and processes that open the same file share its pages.
+        """
+        snapshot = NameSnapshot(snapshot_path)
+        scorer = cls.__new__(cls)
+        scorer._init_weights(custom_weights)
+        scorer._init_cache(cache_size)
+        scorer.snapshot = snapshot
+        scorer.first_name_counts = snapshot.first_name_counts
+        scorer.last_name_counts = snapshot.last_name_counts
+        scorer.total_first_names = snapshot.total_first_names
+        scorer.total_last_names = snapshot.total_last_names
+        scorer.load_timings = {}
+        scorer._first_name_rows = Counter()
+        scorer._letter_counts = None
+        scorer.first_name_bigrams = snapshot.first_name_bigrams
+        scorer.last_name_bigrams = snapshot.last_name_bigrams
+        return scorer
+    
+    def _init_weights(self, custom_weights=None):
+        self.weights = dict(DEFAULT_WEIGHTS)
+        
+        # Override default weights with custom weights if provided
+        if custom_weights and isinstance(custom_weights, dict):
+            for key, value in custom_weights.items():
+                if key in self.weights:
+                    self.weights[key] = value
+    
+    def _init_cache(self, cache_size=None):
+        """Set up the optional LRU cache of name and full-name scores"""
+        self.cache = LRUCache(cache_size) if cache_size else None
+        self._plan = None
+        self._plan_source = None
+    
+    def scoring_plan(self):
+        """
+        The ScoringPlan of the active weights, recompiled whenever self.weights is
+        changed or replaced
+        """
+        plan = self._plan
+        if plan is None or self.weights is not self._plan_source or self.weights != plan.weights:
+            plan = self._plan = compile_scoring_plan(self.weights)
+            self._plan_source = self.weights
+        return plan
+    
+    def _current_weights_key(self):
+        """
+        Hashable key for the active weights, part of every cache key so that changing
+        self.weights (or replacing it) never serves scores computed with the old weights
+        """
+        return self.scoring_plan().weights_key
+    
+    def clear_cache(self):
+        """Drop all cached scores, e.g. after the name corpus changes"""
+        if self.cache is not None:
+            self.cache.clear()
+    
+    def cache_stats(self):
+        """
+        Return cache hit/miss/eviction counters, or None when caching is disabled. The
+        "kinds" entry splits hits and misses into full-name ("full") and per-part ("name")
+        lookups; a full-name miss looks up each of its parts.
+        """
+        return self.cache.stats() if self.cache is not None else None
+    
+    @property
+    def letter_counts(self):
+        """Count of each letter over every SSA row loaded, computed on first access"""
+        if self._letter_counts is None:
+            letter_counts = Counter()
+            for name, rows in self._first_name_rows.items():
+                for letter, count in Counter(name).items():
+                    letter_counts[letter] += count * rows
+            self._letter_counts = letter_counts
+        return self._letter_counts
+    
+    @letter_counts.setter
+    def letter_counts(self, value):
+        self._letter_counts = value
+    
+    def load_ssa_data(self, directory_path, workers=None):
+        """
+        Load SSA baby name data from yobYYYY.txt files
+        
+        Args:
+            directory_path (str): Directory with yobYYYY.txt files
+            workers (int, optional): Parse the yearly files in a pool of this many processes
+        """
         pattern = re.compile(r'yob(\d{4})\.txt')
         # Only process files from 1950 onwards
         min_year = 1950
-        year_data = {}
+        start_time = time.perf_counter()
         
+        paths = []
         for filename in os.listdir(directory_path):
             match = pattern.match(filename)
-            if match and int(match.group(1)) < min_year:
-                continue
-            if match:
-                year = match.group(1)
-                year_data[year] = []
-                
-                with open(os.path.join(directory_path, filename), 'r') as file:
-                    for line in file:
-                        name, sex, count = line.strip().split(',')
-                        count = int(count)
-                        self.first_name_counts[name.lower()] += count
-                        self.total_first_names += count
-                        self.letter_counts.update(name.lower())
+            if match and int(match.group(1)) >= min_year:
+                paths.append(os.path.join(directory_path, filename))
+        
+        if workers and workers > 1 and len(paths) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                parsed_files = list(executor.map(_parse_ssa_file, paths))
+        else:
+            parsed_files = map(_parse_ssa_file, paths)
         
+        # Merge in directory order so name order matches a serial load
+        for path, name_counts, name_rows, total, seconds in parsed_files:
+            self.first_name_counts.update(name_counts)
+            self._first_name_rows.update(name_rows)
+            self.total_first_names += total
+            self.load_timings[path] = seconds
+        self._letter_counts = None
+        
+        self.first_name_bigrams = self._build_bigram_index(self.first_name_counts)
+        self.clear_cache()
+        elapsed = time.perf_counter() - start_time
+        self.load_timings["first_names_total"] = elapsed
         print(f"Loaded first name data: {len(self.first_name_counts)} unique names, {self.total_first_names} total")
+        print(f"Parsed {len(paths)} files in {elapsed:.2f} seconds"
+              f"{f' with {workers} workers' if workers and workers > 1 else ''}")
     
     def load_census_last_names(self):
         """Load US Census Bureau last name data"""
         try:
             print("Loading census last name data...")
+            start_time = time.perf_counter()
+            # Accumulate into a plain dict and merge once; a failure part way through
+            # still falls back to the minimal dataset below
+            name_counts = {}
+            total = 0
             with open('name_data/last_names.csv', 'r') as file:
                 next(file) # Skip header line
                 for line in file:
@@ -115,8 +316,14 @@ class NameUniquenessScorer:
                         if len(parts) >= 3:
                             name,rank,count,prop100k,cum_prop100k,pctwhite,pctblack,pctapi,pctaian,pct2prace,pcthispanic = parts
                             count = int(float(count))
-                            self.last_name_counts[name.lower()] += count
-                            self.total_last_names += count
+                            name = name.lower()
+                            name_counts[name] = name_counts.get(name, 0) + count
+                            total += count
+            self.last_name_counts.update(name_counts)
+            self.total_last_names += total
+            self.load_timings["last_names_total"] = time.perf_counter() - start_time
+            self.last_name_bigrams = self._build_bigram_index(self.last_name_counts)
+            self.clear_cache()
             print(f"Loaded last name data: {len(self.last_name_counts)} unique surnames, {self.total_last_names} total")
         
         except Exception as e:
@@ -127,74 +334,133 @@ class NameUniquenessScorer:
                 "BROWN": 1437026, "JONES": 1425470, "GARCIA": 1166120
             })
             self.total_last_names = sum(self.last_name_counts.values())
+            self.last_name_bigrams = self._build_bigram_index(self.last_name_counts)
+            self.clear_cache()
     
     def load_last_name_data(self, source_path):
         """Load custom last name data"""
+        start_time = time.perf_counter()
+        name_counts = {}
+        total = 0
         try:
             with open(source_path, 'r') as file:
                 reader = csv.reader(file)
                 next(reader)  # Skip header row
                 for row in reader:
                     if len(row) >= 2:
-                        name, count = row[0], int(row[2])
-                        self.last_name_counts[name.lower()] += count
-                        self.total_last_names += count
+                        name, count = row[0].lower(), int(row[2])
+                        name_counts[name] = name_counts.get(name, 0) + count
+                        total += count
         
         except Exception as e:
             print(f"Error loading custom last name data: {e}")
+        
+        # Keep whatever was parsed, even if the file stopped parsing part way through
+        self.last_name_counts.update(name_counts)
+        self.total_last_names += total
+        self.load_timings["last_names_total"] = time.perf_counter() - start_time
+        
+        # Index whatever was loaded, even if the file stopped parsing part way through
+        self.last_name_bigrams = self._build_bigram_index(self.last_name_counts)
+        self.clear_cache()
     
-    def _calculate_name_uniqueness(self, name, name_counts, total_names, print_components=False):
-        """Internal method to calculate uniqueness score"""
+    @staticmethod
+    def _build_bigram_index(name_counts):
+        """
+        Build the set of letter bigrams that occur in a name dataset.
+        
+        The unknown-name path used to search each bigram in ' '.join(name_counts.keys()),
+        so the index is built from that same text: it includes the bigrams spanning the
+        space between neighbouring names and gives identical rarity results.
+        """
+        all_names_text = ' '.join(name_counts.keys()).lower()
+        return frozenset(all_names_text[i:i+2] for i in range(len(all_names_text) - 1))
+    
+    def _bigram_index_for(self, name_counts):
+        """Return the precomputed bigram index for a dataset, building one for unknown datasets"""
+        if name_counts is self.first_name_counts:
+            return self.first_name_bigrams
+        if name_counts is self.last_name_counts:
+            return self.last_name_bigrams
+        return self._build_bigram_index(name_counts)
+    
+    def _calculate_name_uniqueness(self, name, name_counts, total_names, print_components=False, explanation=None):
+        """
+        Internal method to calculate uniqueness score
+
+        With an explanation dict, the name is scored without the cache and the dict is
+        filled in as described in explain_name.
+        """
         if not name or not isinstance(name, str):
             return 0
-            
+        
+        if name_counts is self.first_name_counts:
+            dataset = "first"
+        elif name_counts is self.last_name_counts:
+            dataset = "last"
+        else:
+            dataset = None
+        
+        if print_components and explanation is None:
+            explanation = {}
+        if self.cache is None or dataset is None or explanation is not None:
+            scores = self._score_name_components(name, name_counts, total_names, explanation)
+            if print_components:
+                print(f"Frequency for {explanation['name']}: {explanation['frequency']}")
+            return scores
+        
+        key = ("name", self._current_weights_key(), dataset, name.strip().lower())
+        scores = self.cache.get(key, kind="name")
+        if scores is None:
+            scores = self._score_name_components(name, name_counts, total_names)
+            self.cache.put(key, scores)
+        return dict(scores)
+    
+    def _score_name_components(self, name, name_counts, total_names, explanation=None):
+        """Calculate the component scores for a valid name, filling in explanation if given"""
+        plan = self.scoring_plan()
         name = name.strip().lower()  # Normalize name format
         
         # Component 1: Frequency-based score
         frequency = name_counts.get(name.lower(), 0) / total_names if total_names > 0 else 0
-        if print_components:
-            print(f"Frequency for {name}: {frequency}")
+        bigram_rarity = None
         if frequency == 0:
+            tier = "unknown"
             # Name not in dataset, estimate rarity
-            frequency_score = self.weights["unknown_name_base_score"]
+            frequency_score = plan.unknown_name_base_score
             
             # Adjust based on letter n-grams
-            bigrams = [name[i:i+2].lower() for i in range(len(name)-1)]
-            all_names_text = ' '.join(name_counts.keys()).lower()
-            bigram_rarity = sum(1 for bg in bigrams if ''.join(bg) not in all_names_text) / len(bigrams) if bigrams else 0
-            frequency_score += bigram_rarity * self.weights["bigram_rarity_multiplier"]
+            bigrams = [name[i:i+2] for i in range(len(name)-1)]
+            known_bigrams = self._bigram_index_for(name_counts)
+            bigram_rarity = sum(1 for bg in bigrams if bg not in known_bigrams) / len(bigrams) if bigrams else 0
+            frequency_score += bigram_rarity * plan.bigram_rarity_multiplier
         else:
             # Improved scaling for better contrast
             # Use exponential decay for more contrast between common and rare names
-            w = self.weights
-            if frequency < w["very_rare_threshold"]:  # Very rare names
-                frequency_score = w["very_rare_base_score"] + (1 - frequency / w["very_rare_threshold"]) * w["very_rare_bonus_max"]
-            elif frequency < w["uncommon_threshold"]:  # Uncommon names
-                frequency_score = w["uncommon_base_score"] + (1 - frequency / w["uncommon_threshold"]) * w["uncommon_bonus_max"]
-            elif frequency < w["moderate_threshold"]:   # Moderately common names
-                frequency_score = w["moderate_base_score"] + (1 - frequency / w["moderate_threshold"]) * w["moderate_bonus_max"]
-            elif frequency < w["common_threshold"]:   # Common names
-                frequency_score = w["common_base_score"] + (1 - frequency / w["common_threshold"]) * w["common_bonus_max"]
+            tier_index = bisect_right(plan.tier_limits, frequency)
+            if tier_index < len(plan.tiers):  # Very rare to common names
+                tier, base_score, threshold, bonus_max = plan.tiers[tier_index]
+                frequency_score = base_score + (1 - frequency / threshold) * bonus_max
             else:                   # Very common names
-                frequency_score = max(w["very_common_max_score"] * (1 - frequency / w["very_common_scale_factor"]), 0)
+                tier = "very_common"
+                frequency_score = max(plan.very_common_max_score * (1 - frequency / plan.very_common_scale_factor), 0)
 
         # Scale frequency score to the configured weight
-        frequency_score = (frequency_score / 100) * self.weights["frequency_weight"]
+        frequency_score = (frequency_score / 100) * plan.frequency_weight
 
         # Component 2: Structural uniqueness
-        length_factor = min(len(name) / self.weights["max_name_length"], 1.0)
-        unusual_chars = sum(1 for c in name if c not in 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ -\'')
-        unusual_chars_factor = min(unusual_chars / self.weights["max_unusual_chars"], 1.0)
+        length_factor = min(len(name) / plan.max_name_length, 1.0)
+        unusual_chars = len(name) - sum(map(PLAIN_CHARS.__contains__, name))
+        unusual_chars_factor = min(unusual_chars / plan.max_unusual_chars, 1.0)
         
-        structural_score = self.weights["structural_weight"] * (
-            self.weights["length_factor_weight"] * length_factor + 
-            self.weights["unusual_chars_weight"] * unusual_chars_factor
+        structural_score = plan.structural_weight * (
+            plan.length_factor_weight * length_factor + 
+            plan.unusual_chars_weight * unusual_chars_factor
         )
         
         # Component 3: Letter distribution uniqueness
-        letter_dist = Counter(name.lower())
-        common_letters = sum(letter_dist[c] for c in 'etaoinshrdlu' if c in letter_dist) / len(name) if name else 0
-        letter_uniqueness = self.weights["letter_dist_weight"] * (1 - common_letters)
+        common_letters = sum(map(COMMON_LETTERS.__contains__, name)) / len(name) if name else 0
+        letter_uniqueness = plan.letter_dist_weight * (1 - common_letters)
         
         # Combine scores
         total_score = min(max(frequency_score + structural_score + letter_uniqueness, 0), 100)
@@ -207,6 +473,8 @@ class NameUniquenessScorer:
             "total_score": round(total_score, 1)
         }
         
+        if explanation is not None:
+            explanation.update(name=name, frequency=frequency, tier=tier, bigram_rarity=bigram_rarity, **component_scores)
         return component_scores
     
     def calculate_first_name_uniqueness(self, name, print_components=False):
@@ -237,63 +505,109 @@ class NameUniquenessScorer:
     
     def calculate_full_name_uniqueness(self, first_name, last_name=None, print_components=False):
         """Calculate uniqueness score for a full name"""
-        first_scores = self._calculate_name_uniqueness(first_name, self.first_name_counts, self.total_first_names, print_components)
-        first_score = first_scores["total_score"] if isinstance(first_scores, dict) else first_scores
-        
         if print_components:
-            print(f"\nFull name analysis for '{first_name} {last_name or ''}':")
-            if isinstance(first_scores, dict):
-                print(f"First name '{first_name}':")
-                print(f"  Frequency-based score: {first_scores['frequency_score']}/{self.weights['frequency_weight']}")
-                print(f"  Structural uniqueness: {first_scores['structural_score']}/{self.weights['structural_weight']}")
-                print(f"  Letter distribution:   {first_scores['letter_uniqueness']}/{self.weights['letter_dist_weight']}")
-                print(f"  Total score:           {first_scores['total_score']}/100")
+            explanation = self.explain_full_name(first_name, last_name)
+            print(self.format_explanation(explanation))
+            return explanation["score"]
+        if (self.cache is None or not isinstance(first_name, str)
+                or not (last_name is None or isinstance(last_name, str))):
+            return self._score_full_name(first_name, last_name)
+        
+        # Same normalization as _calculate_name_uniqueness; None marks an empty name, which
+        # scores differently from a name that is only whitespace
+        key = ("full", self._current_weights_key(),
+               first_name.strip().lower() if first_name else None,
+               last_name.strip().lower() if last_name else None)
+        score = self.cache.get(key, kind="full")
+        if score is None:
+            score = self._score_full_name(first_name, last_name)
+            self.cache.put(key, score)
+        return score
+    
+    def explain_name(self, name, dataset="first"):
+        """
+        Explain how a first or last name's score is built up.
+        
+        Returns None for an empty name (which scores 0), otherwise a dict with the
+        normalized name, its frequency in the dataset, the frequency tier it falls in
+        ("unknown", "very_rare", "uncommon", "moderate", "common" or "very_common"), the
+        bigram rarity for unknown names (None otherwise) and the component scores of
+        _calculate_name_uniqueness. Nothing is formatted; see format_explanation.
+        """
+        if dataset == "first":
+            name_counts, total_names = self.first_name_counts, self.total_first_names
+        elif dataset == "last":
+            name_counts, total_names = self.last_name_counts, self.total_last_names
+        else:
+            raise ValueError("dataset must be 'first' or 'last'")
+        explanation = {"dataset": dataset}
+        self._calculate_name_uniqueness(name, name_counts, total_names, explanation=explanation)
+        return explanation if "name" in explanation else None
+    
+    def explain_full_name(self, first_name, last_name=None):
+        """
+        Explain how calculate_full_name_uniqueness scores a full name.
+        
+        Returns a dict with the names as given, first and last (explain_name for each, or
+        None for a missing name), the first_score and last_score that were combined, the
+        combo branch ("very_common" when both are below common_combo_threshold, otherwise
+        "weighted"; None without a last name), rare_combo_bonus, the uncapped rare name
+        multipliers ({"first": ..., "last": ...}, None for names scoring 50 or less), the
+        capped rare_name_bonus they multiply to, and the final score.
+        """
+        explanation = {"first_name": first_name, "last_name": last_name}
+        self._score_full_name(first_name, last_name, explanation)
+        return explanation
+    
+    def _score_full_name(self, first_name, last_name=None, explanation=None):
+        """Calculate the combined score for a first and optional last name, filling in explanation if given"""
+        first_explanation = {"dataset": "first"} if explanation is not None else None
+        first_scores = self._calculate_name_uniqueness(first_name, self.first_name_counts, self.total_first_names,
+                                                       explanation=first_explanation)
+        first_score = first_scores["total_score"] if isinstance(first_scores, dict) else first_scores
+        if explanation is not None:
+            explanation.update(first=first_explanation if isinstance(first_scores, dict) else None,
+                               last=None, first_score=first_score, last_score=None, combo=None,
+                               rare_combo_bonus=0, multipliers={"first": None, "last": None}, rare_name_bonus=1,
+                               score=first_score)
         
         if not last_name:
             return first_score
         
-        last_scores = self._calculate_name_uniqueness(last_name, self.last_name_counts, self.total_last_names, print_components)
+        last_explanation = {"dataset": "last"} if explanation is not None else None
+        last_scores = self._calculate_name_uniqueness(last_name, self.last_name_counts, self.total_last_names,
+                                                      explanation=last_explanation)
         last_score = last_scores["total_score"] if isinstance(last_scores, dict) else last_scores
         
-        if print_components and isinstance(last_scores, dict):
-            print(f"Last name '{last_name}':")
-            print(f"  Frequency-based score: {last_scores['frequency_score']}/{self.weights['frequency_weight']}")
-            print(f"  Structural uniqueness: {last_scores['structural_score']}/{self.weights['structural_weight']}")
-            print(f"  Letter distribution:   {last_scores['letter_uniqueness']}/{self.weights['letter_dist_weight']}")
-            print(f"  Total score:           {last_scores['total_score']}/100")
-        
         # Improved combined scoring for better contrast
         # For extremely common first+last combinations, adjust score downward
-        w = self.weights
+        plan = self.scoring_plan()
         is_very_common_combo = False
-        if first_score < w["common_combo_threshold"] and last_score < w["common_combo_threshold"]:
+        if first_score < plan.common_combo_threshold and last_score < plan.common_combo_threshold:
             is_very_common_combo = True
             # Exponentially reduce score for very common combinations like "John Smith"
-            combined_score = (first_score * last_score) / w["common_combo_divisor"]
+            combined_score = (first_score * last_score) / plan.common_combo_divisor
         else:
             # Normal weighting for most names
             # Rare first name + common last name is still quite unique
-            combined_score = (first_score * w["first_name_weight"]) + (last_score * w["last_name_weight"])
+            combined_score = (first_score * plan.first_name_weight) + (last_score * plan.last_name_weight)
         
         # Bonus for rare combinations
         bonus = 0
-        if first_score > w["rare_combo_threshold"] and last_score > w["rare_combo_threshold"]:
-            bonus = w["rare_combo_bonus"]
+        if first_score > plan.rare_combo_threshold and last_score > plan.rare_combo_threshold:
+            bonus = plan.rare_combo_bonus
             combined_score += bonus
 
         rare_name_bonus = 1
+        first_multiplier = last_multiplier = None
         # Apply exponential bonus for uncommon names
         if first_score > 50:
-            bonus_multiplier = math.exp((first_score - 50) / 50)
-            if print_components:
-                print(f"  Rare firstname multiplier: {bonus_multiplier}")
-            rare_name_bonus *= max(1, min(bonus_multiplier, 2.0))  # Cap the multiplier at 2x
+            first_multiplier = math.exp((first_score - 50) / 50)
+            rare_name_bonus *= max(1, min(first_multiplier, 2.0))  # Cap the multiplier at 2x
             
         if last_score > 50:
-            bonus_multiplier = math.exp((last_score - 50) / 50)
-            if print_components:
-                print(f"  Rare lastname multiplier: {bonus_multiplier}")
-            rare_name_bonus *= max(1, min(bonus_multiplier, 2.0))  # Cap the multiplier at 2x
+            last_multiplier = math.exp((last_score - 50) / 50)
+            rare_name_bonus *= max(1, min(last_multiplier, 2.0))  # Cap the multiplier at 2x
             
         combined_score = min(round(combined_score, 1), 100)
         # Apply rare name bonus scaling to combined score
@@ -304,21 +618,236 @@ class NameUniquenessScorer:
             combined_score = min(100, combined_score * (1 + (rare_name_bonus - 1) * (100 - combined_score) / 100))
             combined_score = round(combined_score, 1)
         
-        if print_components:
-            print(f"Combined score calculation:")
-            if is_very_common_combo:
-                print(f"  Very common combination: {first_score} × {last_score} / {w['common_combo_divisor']} = {round((first_score * last_score) / w['common_combo_divisor'], 1)}")
-            elif first_score > 50 or last_score > 50:
-                print(f"  Rare name multiplier: {rare_name_bonus}")
-            else:
-                print(f"  First name contribution: {first_score} × {w['first_name_weight']} = {round(first_score * w['first_name_weight'], 1)}")
-                print(f"  Last name contribution:  {last_score} × {w['last_name_weight']} = {round(last_score * w['last_name_weight'], 1)}")
-            if bonus > 0:
-                print(f"  Rare combination bonus:  +{bonus}")
-            print(f"  Final combined score:    {combined_score}/100")
-        
+        if explanation is not None:
+            explanation.update(last=last_explanation if isinstance(last_scores, dict) else None,
+                               last_score=last_score, combo="very_common" if is_very_common_combo else "weighted",
+                               rare_combo_bonus=bonus, multipliers={"first": first_multiplier, "last": last_multiplier},
+                               rare_name_bonus=rare_name_bonus, score=combined_score)
         return combined_score
     
+    def _format_component_lines(self, scores):
+        w = self.weights
+        return [
+            f"  Frequency-based score: {scores['frequency_score']}/{w['frequency_weight']}",
+            f"  Structural uniqueness: {scores['structural_score']}/{w['structural_weight']}",
+            f"  Letter distribution:   {scores['letter_uniqueness']}/{w['letter_dist_weight']}",
+            f"  Total score:           {scores['total_score']}/100",
+        ]
+    
+    def format_explanation(self, explanation):
+        """Render an explain_name or explain_full_name result as the print_components text"""
+        if explanation is None:
+            return "Empty name: Total score = 0/100"
+        if "dataset" in explanation:
+            return "\n".join([f"Frequency for {explanation['name']}: {explanation['frequency']}",
+                              f"\nComponent scores for '{explanation['name']}':",
+                              *self._format_component_lines(explanation)])
+        
+        first_name, last_name = explanation["first_name"], explanation["last_name"]
+        first, last = explanation["first"], explanation["last"]
+        lines = []
+        if first:
+            lines.append(f"Frequency for {first['name']}: {first['frequency']}")
+        lines.append(f"\nFull name analysis for '{first_name} {last_name or ''}':")
+        if first:
+            lines.append(f"First name '{first_name}':")
+            lines += self._format_component_lines(first)
+        if explanation["combo"] is None:
+            return "\n".join(lines)
+        
+        if last:
+            lines.append(f"Frequency for {last['name']}: {last['frequency']}")
+            lines.append(f"Last name '{last_name}':")
+            lines += self._format_component_lines(last)
+        multipliers = explanation["multipliers"]
+        if multipliers["first"] is not None:
+            lines.append(f"  Rare firstname multiplier: {multipliers['first']}")
+        if multipliers["last"] is not None:
+            lines.append(f"  Rare lastname multiplier: {multipliers['last']}")
+        
+        w = self.weights
+        first_score, last_score = explanation["first_score"], explanation["last_score"]
+        lines.append("Combined score calculation:")
+        if explanation["combo"] == "very_common":
+            lines.append(f"  Very common combination: {first_score} × {last_score} / {w['common_combo_divisor']} = "
+                         f"{round((first_score * last_score) / w['common_combo_divisor'], 1)}")
+        elif first_score > 50 or last_score > 50:
+            lines.append(f"  Rare name multiplier: {explanation['rare_name_bonus']}")
+        else:
+            lines.append(f"  First name contribution: {first_score} × {w['first_name_weight']} = "
+                         f"{round(first_score * w['first_name_weight'], 1)}")
+            lines.append(f"  Last name contribution:  {last_score} × {w['last_name_weight']} = "
+                         f"{round(last_score * w['last_name_weight'], 1)}")
+        if explanation["rare_combo_bonus"] > 0:
+            lines.append(f"  Rare combination bonus:  +{explanation['rare_combo_bonus']}")
+        lines.append(f"  Final combined score:    {explanation['score']}/100")
+        return "\n".join(lines)
+    
+    def score_batch(self, first_names, last_names=None, chunk_size=65536):
+        """
+        Score many names at once with NumPy array operations.
+        
+        Gives the same results as calling calculate_full_name_uniqueness(first, last) for each
+        pair, but looks each distinct name up only once and evaluates the frequency tiers,
+        structural and letter-distribution components and the combination/bonus logic over
+        whole arrays.
+        
+        Args:
+            first_names (sequence): First names
+            last_names (sequence, optional): Last names aligned with first_names; empty or
+                None entries are scored as first name only
+            chunk_size (int): Most distinct names converted to arrays at a time; chunks of
+                long names are smaller, to stay within BATCH_CHUNK_CELLS characters
+            
+        Returns:
+            dict: NumPy float arrays keyed by first_/last_ component name
+                (frequency_score, structural_score, letter_uniqueness, total_score)
+                plus the combined "total_score"
+        """
+        if np is None:
+            raise ImportError("score_batch requires numpy (pip install numpy)")
+        
+        first = self._score_name_column(first_names, self.first_name_counts, self.total_first_names,
+                                        self.first_name_bigrams, chunk_size)
+        results = {f"first_{key}": value for key, value in first.items()}
+        
+        if last_names is None:
+            last_names = [None] * len(results["first_total_score"])
+        elif len(last_names) != len(first_names):
+            raise ValueError("first_names and last_names must have the same length")
+        
+        last = self._score_name_column(last_names, self.last_name_counts, self.total_last_names,
+                                       self.last_name_bigrams, chunk_size)
+        results.update({f"last_{key}": value for key, value in last.items()})
+        
+        has_last = np.fromiter((bool(name) for name in last_names), dtype=bool, count=len(last_names))
+        combined = self._combine_batch_scores(first["total_score"], last["total_score"])
+        results["total_score"] = np.where(has_last, combined, first["total_score"])
+        return results
+    
+    def _score_name_column(self, names, name_counts, total_names, known_bigrams, chunk_size):
+        """Vectorized equivalent of _calculate_name_uniqueness over a sequence of names"""
+        # Normalize, then deduplicate; invalid entries share the None slot and score 0.
+        # Empty strings score 0 unlike names that are only empty after stripping, so they
+        # take the slow path along with non-string entries
+        normalized = None
+        if "" not in names:
+            try:
+                normalized = list(map(str.lower, map(str.strip, names)))
+            except TypeError:
+                pass
+        if normalized is None:
+            normalized = [name.strip().lower() if name and isinstance(name, str) else None for name in names]
+        slots = dict.fromkeys(normalized)
+        unique_names = list(slots)
+        slots.update(zip(unique_names, range(len(unique_names))))
+        inverse = np.fromiter(map(slots.__getitem__, normalized), dtype=np.int64, count=len(normalized))
+        
+        keys = ("frequency_score", "structural_score", "letter_uniqueness", "total_score")
+        unique_scores = {key: np.zeros(len(unique_names)) for key in keys}
+        valid = [i for i, name in enumerate(unique_names) if name is not None]
+        
+        # Each chunk is padded to its longest name, so group names of similar length and
+        # shrink chunks of long names; one huge name then gets a chunk to itself
+        valid.sort(key=lambda i: len(unique_names[i]))
+        start = 0
+        while start < len(valid):
+            end = min(start + chunk_size, len(valid))
+            while end - start > 1 and (end - start) * len(unique_names[valid[end - 1]]) > BATCH_CHUNK_CELLS:
+                end = start + max(1, BATCH_CHUNK_CELLS // len(unique_names[valid[end - 1]]))
+            positions = valid[start:end]
+            chunk_scores = self._score_name_chunk([unique_names[i] for i in positions],
+                                                  name_counts, total_names, known_bigrams)
+            for key in keys:
+                unique_scores[key][positions] = chunk_scores[key]
+            start = end
+        
+        return {key: unique_scores[key][inverse] for key in keys}
+    
+    def _score_name_chunk(self, names, name_counts, total_names, known_bigrams):
+        """Score a list of normalized, valid names as arrays"""
+        w = self.weights
+        counts = np.fromiter(map(name_counts.get, names, repeat(0)), dtype=np.float64, count=len(names))
+        frequency = counts / total_names if total_names > 0 else np.zeros(len(names))
+        
+        # One row of code points per name, zero padded to the longest name in the chunk;
+        # _score_name_column keeps rows × longest name within BATCH_CHUNK_CELLS
+        lengths = np.fromiter(map(len, names), dtype=np.int64, count=len(names))
+        codes = np.array(names, dtype=str).view(np.uint32).reshape(len(names), -1).astype(np.int64)
+        in_name = np.arange(codes.shape[1]) < lengths[:, None]
+        
+        # Component 1: Frequency-based score, bigram rarity for unknown names
+        bigram_codes = (codes[:, :-1] << 21) | codes[:, 1:]
+        known_codes = np.sort(np.array([(ord(bg[0]) << 21) | ord(bg[1]) for bg in known_bigrams if len(bg) == 2] or [-1],
+                                       dtype=np.int64))
+        is_known = known_codes[np.minimum(np.searchsorted(known_codes, bigram_codes), len(known_codes) - 1)] == bigram_codes
+        in_bigram = np.arange(bigram_codes.shape[1]) < (lengths - 1)[:, None]
+        unknown_bigrams = (in_bigram & ~is_known).sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bigram_rarity = np.where(lengths > 1, unknown_bigrams / (lengths - 1), 0)
+        unknown_score = w["unknown_name_base_score"] + bigram_rarity * w["bigram_rarity_multiplier"]
+        
+        tiers = [
+            (frequency < w["very_rare_threshold"],
+             w["very_rare_base_score"] + (1 - frequency / w["very_rare_threshold"]) * w["very_rare_bonus_max"]),
+            (frequency < w["uncommon_threshold"],
+             w["uncommon_base_score"] + (1 - frequency / w["uncommon_threshold"]) * w["uncommon_bonus_max"]),
+            (frequency < w["moderate_threshold"],
+             w["moderate_base_score"] + (1 - frequency / w["moderate_threshold"]) * w["moderate_bonus_max"]),
+            (frequency < w["common_threshold"],
+             w["common_base_score"] + (1 - frequency / w["common_threshold"]) * w["common_bonus_max"]),
+        ]
+        very_common_score = np.maximum(w["very_common_max_score"] * (1 - frequency / w["very_common_scale_factor"]), 0)
+        known_score = np.select([condition for condition, _ in tiers], [score for _, score in tiers], very_common_score)
+        frequency_score = np.where(frequency == 0, unknown_score, known_score)
+        frequency_score = (frequency_score / 100) * w["frequency_weight"]
+        
+        # Component 2: Structural uniqueness
+        allowed = np.array([ord(c) for c in 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ -\''])
+        length_factor = np.minimum(lengths / w["max_name_length"], 1.0)
+        unusual_chars = (in_name & ~np.isin(codes, allowed, kind="table")).sum(axis=1)
+        unusual_chars_factor = np.minimum(unusual_chars / w["max_unusual_chars"], 1.0)
+        structural_score = w["structural_weight"] * (
+            w["length_factor_weight"] * length_factor +
+            w["unusual_chars_weight"] * unusual_chars_factor
+        )
+        
+        # Component 3: Letter distribution uniqueness
+        common = np.array([ord(c) for c in 'etaoinshrdlu'])
+        common_count = (in_name & np.isin(codes, common, kind="table")).sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            common_letters = np.where(lengths > 0, common_count / lengths, 0)
+        letter_uniqueness = w["letter_dist_weight"] * (1 - common_letters)
+        
+        total_score = np.minimum(np.maximum(frequency_score + structural_score + letter_uniqueness, 0), 100)
+        
+        return {
+            "frequency_score": _round_scores(frequency_score),
+            "structural_score": _round_scores(structural_score),
+            "letter_uniqueness": _round_scores(letter_uniqueness),
+            "total_score": _round_scores(total_score),
+        }
+    
+    def _combine_batch_scores(self, first_score, last_score):
+        """Vectorized equivalent of the full-name combination in calculate_full_name_uniqueness"""
+        w = self.weights
+        is_very_common_combo = (first_score < w["common_combo_threshold"]) & (last_score < w["common_combo_threshold"])
+        combined_score = np.where(is_very_common_combo,
+                                  (first_score * last_score) / w["common_combo_divisor"],
+                                  (first_score * w["first_name_weight"]) + (last_score * w["last_name_weight"]))
+        
+        is_rare_combo = (first_score > w["rare_combo_threshold"]) & (last_score > w["rare_combo_threshold"])
+        combined_score = np.where(is_rare_combo, combined_score + w["rare_combo_bonus"], combined_score)
+        
+        # Component totals are rounded to one decimal in [0, 100], so the rare name multiplier
+        # only ever sees 1001 distinct inputs; look them up from a table built with math.exp
+        rare_name_bonus = _rare_name_multipliers()[np.rint(first_score * 10).astype(np.int64)]
+        rare_name_bonus = rare_name_bonus * _rare_name_multipliers()[np.rint(last_score * 10).astype(np.int64)]
+        
+        combined_score = np.minimum(_round_scores(combined_score), 100)
+        boosted = np.minimum(100, combined_score * (1 + (rare_name_bonus - 1) * (100 - combined_score) / 100))
+        return np.where(rare_name_bonus > 1, _round_scores(boosted), combined_score)
+    
     def compare_names(self, names_list, name_type="first", print_components=False):
         """Compare uniqueness scores for a list of names"""
         results = []
@@ -362,6 +891,114 @@ class NameUniquenessScorer:
             raise ValueError("name_type must be either 'first' or 'last'")
 
 
+def _parse_ssa_file(path):
+    """
+    Parse one yobYYYY.txt file into per-name counts and the number of rows each name
+    appeared on. Module level so it can run in a process pool.
+    """
+    start_time = time.perf_counter()
+    name_counts = {}
+    name_rows = {}
+    total = 0
+    with open(path, 'r') as file:
+        for line in file:
+            name, sex, count = line.strip().split(',')
+            count = int(count)
+            name = name.lower()
+            name_counts[name] = name_counts.get(name, 0) + count
+            name_rows[name] = name_rows.get(name, 0) + 1
+            total += count
+    return path, name_counts, name_rows, total, time.perf_counter() - start_time
+
+
+class LRUCache:
+    """
+    Bounded mapping that evicts the least recently used entry and counts hits, misses
+    and evictions. Lookups tagged with a kind are also counted per kind.
+    """
+    
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.kind_hits = Counter()
+        self.kind_misses = Counter()
+    
+    def get(self, key, default=None, kind=None):
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            if kind is not None:
+                self.kind_misses[kind] += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        if kind is not None:
+            self.kind_hits[kind] += 1
+        return value
+    
+    def put(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def clear(self):
+        self._entries.clear()
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "kinds": {kind: {"hits": self.kind_hits[kind], "misses": self.kind_misses[kind]}
+                      for kind in sorted(self.kind_hits.keys() | self.kind_misses.keys())},
+        }
+
+
+def _round_scores(values):
+    """
+    Round an array to one decimal exactly like Python's round(value, 1).
+    
+    np.round rounds value * 10 half to even, which only disagrees with the correctly rounded
+    round() when value * 10 lands on a .5 tie that value itself is not exactly on. A midpoint
+    (2k + 1) / 20 is only representable when 2k + 1 is a multiple of 5; other ties are redone in Python.
+    """
+    rounded = np.round(values, 1)
+    scaled = values * 10
+    floor = np.floor(scaled)
+    midpoint = 2 * floor + 1
+    exact_ties = (midpoint % 5 == 0) & (values == midpoint / 20)
+    for i in np.flatnonzero(((scaled - floor) == 0.5) & ~exact_ties):
+        rounded[i] = round(float(values[i]), 1)
+    return rounded
+
+
+_RARE_NAME_MULTIPLIERS = None
+
+
+def _rare_name_multipliers():
+    """Rare name multiplier for every score from 0.0 to 100.0, indexed by score * 10"""
+    global _RARE_NAME_MULTIPLIERS
+    if _RARE_NAME_MULTIPLIERS is None:
+        _RARE_NAME_MULTIPLIERS = np.array([
+            max(1, min(math.exp((score / 10 - 50) / 50), 2.0)) if score / 10 > 50 else 1
+            for score in range(1001)
+        ], dtype=np.float64)
+    return _RARE_NAME_MULTIPLIERS
+
+
 # Example usage
 if __name__ == "__main__":
     # Example paths
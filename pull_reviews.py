@@ -1,6 +1,14 @@
+import argparse
 import asyncio
 import datetime
+import gzip
+import json
+import os
 import sqlite3
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import aclosing, nullcontext
 from urllib.parse import urlencode
 
 import aiohttp
@@ -12,6 +20,44 @@ import aiohttp
 
 API_KEY = "gJSVqIZAIgdYBm1gYkNmrqUtavM"
 DB_PATH = "reviews.db"
+ENDPOINT = "https://public-api.apptweak.com/api/public/store/apps/reviews/search.json"
+PAGE_SIZE = 100
+START_DATE = datetime.date(2016, 1, 1)
+
+INSERT_REVIEW_SQL = """
+    INSERT OR IGNORE INTO reviews (
+        app_id,
+        review_id,
+        rating,
+        date,
+        language,
+        author_name,
+        author_photo,
+        author_profile,
+        title,
+        body,
+        body_length,
+        version,
+        developer_reply,
+        developer_reply_date
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+SET_OFFSET_SQL = """
+    INSERT INTO scrape_state (app_id, last_offset) 
+    VALUES (?, ?)
+    ON CONFLICT(app_id) DO UPDATE SET last_offset=excluded.last_offset
+"""
+
+SET_WINDOW_OFFSET_SQL = """
+    UPDATE scrape_windows SET last_offset = ?
+    WHERE app_id = ? AND start_date = ? AND end_date = ?
+"""
+
+FINISH_WINDOW_SQL = """
+    UPDATE scrape_windows SET done = 1
+    WHERE app_id = ? AND start_date = ? AND end_date = ?
+"""
 
 # For now, just one Play Store app as requested. Additional apps can be added to this list.
 PLAYSTORE_APPS = [
@@ -34,6 +80,7 @@ def init_db():
     Create or verify the required tables:
       - reviews: to store the fetched reviews
       - scrape_state: to keep track of where we left off (offset) for each app
+      - scrape_windows: the date windows of partitioned crawls, each with its own offset
     """
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
@@ -65,6 +112,17 @@ def init_db():
         )
     """)
 
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS scrape_windows (
+            app_id TEXT,
+            start_date TEXT,
+            end_date TEXT,
+            last_offset INTEGER DEFAULT 0,
+            done INTEGER DEFAULT 0,
+            PRIMARY KEY (app_id, start_date, end_date)
+        )
+    """)
+
     conn.commit()
     conn.close()
 
@@ -95,22 +153,225 @@ def set_scrape_offset(app_id: str, offset: int):
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
 
-    cursor.execute("""
-        INSERT INTO scrape_state (app_id, last_offset) 
-        VALUES (?, ?)
-        ON CONFLICT(app_id) DO UPDATE SET last_offset=excluded.last_offset
-    """, (app_id, offset))
+    cursor.execute(SET_OFFSET_SQL, (app_id, offset))
+
+    conn.commit()
+    conn.close()
+
 
+def get_scrape_windows(app_id: str) -> list:
+    """
+    Return the (start_date, end_date, last_offset, done) rows of an app's planned
+    date windows, oldest first, with the dates as datetime.date.
+    """
+    conn = sqlite3.connect(DB_PATH)
+    rows = conn.execute("""
+        SELECT start_date, end_date, last_offset, done FROM scrape_windows
+        WHERE app_id = ? ORDER BY start_date
+    """, (app_id,)).fetchall()
+    conn.close()
+    return [(datetime.date.fromisoformat(start), datetime.date.fromisoformat(end), offset, bool(done))
+            for start, end, offset, done in rows]
+
+
+def add_scrape_windows(app_id: str, windows: list):
+    """Record newly planned (start_date, end_date) windows for an app"""
+    conn = sqlite3.connect(DB_PATH)
+    conn.executemany("""
+        INSERT OR IGNORE INTO scrape_windows (app_id, start_date, end_date) VALUES (?, ?, ?)
+    """, [(app_id, start.isoformat(), end.isoformat()) for start, end in windows])
     conn.commit()
     conn.close()
 
 
-async def fetch_review_page(session, app_id: str, offset: int, limit: int = 100) -> int:
+class RateLimiter:
+    """
+    Global requests-per-second limit shared by every fetching task.
+    Request start times are spaced 1/rate seconds apart; rate=None disables the limit.
+    """
+
+    def __init__(self, rate=None):
+        self.interval = 1 / rate if rate else 0
+        self._next_start = 0.0
+
+    async def wait(self):
+        if not self.interval:
+            return
+        now = asyncio.get_running_loop().time()
+        start = max(now, self._next_start)
+        self._next_start = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+def review_row(app_id: str, review: dict) -> tuple:
+    """Map one review from the API response to a row for INSERT_REVIEW_SQL"""
+    return (
+        app_id,
+        review.get("id"),
+        review.get("rating"),
+        review.get("date"),
+        review.get("language", ""),
+        review.get("author", {}).get("name", ""),
+        review.get("author", {}).get("photo", ""),
+        review.get("author", {}).get("profile", ""),
+        review.get("title", ""),
+        review.get("body", ""),
+        review.get("body_length", 0),
+        review.get("version", ""),
+        review.get("developer_reply"),
+        review.get("developer_reply_date")
+    )
+
+
+class ReviewWriter:
+    """
+    The only writer to the reviews database.
+
+    Fetching tasks queue parsed pages with put(); a single task writes them through one
+    long-lived WAL connection on a dedicated thread, so the event loop never waits on
+    disk. Each page's reviews and its checkpoint (e.g. the scrape_state offset) are
+    committed in the same transaction, together with any other pages already waiting
+    in the queue.
+    """
+
+    def __init__(self, db_path: str = None, max_pending_pages: int = 64):
+        self.db_path = db_path or DB_PATH
+        self.queue = asyncio.Queue(max_pending_pages)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="review-writer")
+        self.conn = None
+        self.task = None
+        self.error = None
+        self.rows = 0
+        self.pages = 0
+        self.transactions = 0
+        self.busy_seconds = 0.0
+
+    def start(self):
+        self.task = asyncio.create_task(self._run())
+        return self
+
+    async def put(self, rows: list, checkpoint_sql: str, checkpoint_params: tuple):
+        """Queue a page's rows to be written in one transaction with its checkpoint statement"""
+        if self.error:
+            raise RuntimeError("Review writer failed") from self.error
+        await self.queue.put((rows, checkpoint_sql, checkpoint_params))
+
+    async def close(self):
+        """Write everything still queued, then close the connection"""
+        await self.queue.put(None)
+        await self.task
+        self.executor.shutdown()
+        if self.error:
+            raise RuntimeError("Review writer failed") from self.error
+
+    def stats(self) -> str:
+        rate = self.rows / self.busy_seconds if self.busy_seconds else 0
+        return (f"Wrote {self.rows} reviews from {self.pages} pages in {self.transactions} transactions "
+                f"({rate:.0f} rows/sec while writing, {self.busy_seconds:.2f}s busy)")
+
+    def _connect(self):
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # WAL only needs syncing at checkpoints to stay consistent after a crash
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+
+    def _write_pages(self, pages):
+        start = time.perf_counter()
+        with self.conn:
+            for rows, checkpoint_sql, checkpoint_params in pages:
+                self.conn.executemany(INSERT_REVIEW_SQL, rows)
+                self.conn.execute(checkpoint_sql, checkpoint_params)
+                self.rows += len(rows)
+        self.pages += len(pages)
+        self.transactions += 1
+        self.busy_seconds += time.perf_counter() - start
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        closing = False
+        try:
+            await loop.run_in_executor(self.executor, self._connect)
+            while not closing:
+                pages = [await self.queue.get()]
+                while pages[-1] is not None and not self.queue.empty():
+                    pages.append(self.queue.get_nowait())
+                if pages[-1] is None:
+                    pages.pop()
+                    closing = True
+                if pages:
+                    await loop.run_in_executor(self.executor, self._write_pages, pages)
+        except Exception as e:
+            # Keep draining until close() so fetchers blocked on a full queue see the error
+            # instead of hanging
+            self.error = e
+            while not closing:
+                closing = await self.queue.get() is None
+        finally:
+            if self.conn is not None:
+                await loop.run_in_executor(self.executor, self.conn.close)
+
+
+class PageArchive:
+    """
+    Local store of raw API responses, gzip-compressed, one file per page at
+    <root>/<app_id>/<start_date>_<end_date>/<offset>.json.gz
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def path(self, app_id: str, start_date: datetime.date, end_date: datetime.date, offset: int) -> str:
+        return os.path.join(self.root, app_id, f"{start_date.isoformat()}_{end_date.isoformat()}", f"{offset}.json.gz")
+
+    def save(self, app_id: str, start_date: datetime.date, end_date: datetime.date, offset: int, body: bytes):
+        path = self.path(app_id, start_date, end_date, offset)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file first so a crash never leaves a truncated page behind
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(gzip.compress(body, compresslevel=6))
+        os.replace(temp_path, path)
+
+    def paths(self) -> list:
+        """Every archived page, sorted by app, window and offset"""
+        paths = []
+        for directory, _, filenames in os.walk(self.root):
+            paths.extend(os.path.join(directory, name) for name in filenames if name.endswith(".json.gz"))
+
+        def sort_key(path):
+            window_dir, filename = os.path.split(path)
+            app_dir, window = os.path.split(window_dir)
+            return os.path.basename(app_dir), window, int(filename.split(".")[0])
+
+        return sorted(paths, key=sort_key)
+
+
+def parse_review_page(app_id: str, data: dict) -> list:
+    """Turn a reviews search response into rows ready for the ReviewWriter"""
+    reviews_by_app = data.get("result", {}).get(app_id, {})
+    reviews_data = reviews_by_app.get("reviews", [])
+    return [review_row(app_id, review) for review in reviews_data]
+
+
+def load_archived_page(path: str) -> list:
+    """Rows of one archived page; the app id comes from the archive layout"""
+    app_id = os.path.basename(os.path.dirname(os.path.dirname(path)))
+    with open(path, "rb") as file:
+        data = json.loads(gzip.decompress(file.read()))
+    return parse_review_page(app_id, data)
+
+
+async def fetch_review_page(session, app_id: str, offset: int, limit: int = PAGE_SIZE,
+                            endpoint: str = ENDPOINT, rate_limiter: RateLimiter = None,
+                            start_date: datetime.date = START_DATE, end_date: datetime.date = None,
+                            archive: PageArchive = None) -> list:
     """
-    Fetch a single page of reviews using the search endpoint, store them in the DB,
-    and return how many reviews were inserted.
+    Fetch a single page of reviews using the search endpoint and return its reviews
+    as rows ready for the ReviewWriter. end_date defaults to today.
+    With an archive, the raw response is also saved there for replay().
     """
-    endpoint = "https://public-api.apptweak.com/api/public/store/apps/reviews/search.json"
+    end_date = end_date or datetime.date.today()
     params = {
         "apps": app_id,
         "country": "us",
@@ -119,8 +380,8 @@ async def fetch_review_page(session, app_id: str, offset: int, limit: int = 100)
         "limit": limit,
         "offset": offset,
         "sort": "most_recent",
-        "start_date": "2016-01-01",
-        "end_date": datetime.date.today().strftime("%Y-%m-%d")
+        "start_date": start_date.strftime("%Y-%m-%d"),
+        "end_date": end_date.strftime("%Y-%m-%d")
     }
     url = f"{endpoint}?{urlencode(params)}"
 
@@ -129,89 +390,272 @@ async def fetch_review_page(session, app_id: str, offset: int, limit: int = 100)
         "x-apptweak-key": API_KEY
     }
 
+    if rate_limiter:
+        await rate_limiter.wait()
     async with session.get(url, headers=headers) as response:
         response.raise_for_status()
-        data = await response.json()
+        body = await response.read()
 
-    reviews_by_app = data.get("result", {}).get(app_id, {})
-    reviews_data = reviews_by_app.get("reviews", [])
+    if archive:
+        await asyncio.to_thread(archive.save, app_id, start_date, end_date, offset, body)
+    return parse_review_page(app_id, json.loads(body))
 
-    if not reviews_data:
-        return 0
 
-    # Insert reviews into the SQLite DB, skipping duplicates via UNIQUE(review_id)
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+async def iter_pages(session, app_id: str, offset: int, max_reviews: int, endpoint: str = ENDPOINT,
+                     rate_limiter: RateLimiter = None, prefetch: int = 1,
+                     start_date: datetime.date = START_DATE, end_date: datetime.date = None,
+                     archive: PageArchive = None):
+    """
+    Yield (offset, rows) for consecutive pages starting at offset, strictly in offset
+    order, until the caller stops or the page that would reach max_reviews.
+    
+    With prefetch > 1, that many page requests are kept in flight ahead of the page
+    being yielded. The speculative requests still pending when the caller stops (on the
+    first empty page, or an error) are cancelled when the generator is closed.
+    """
+    # Never request past the page that would reach max_reviews
+    offset_limit = offset + -(-max_reviews // PAGE_SIZE) * PAGE_SIZE
+    next_offset = offset
+    in_flight = deque()
+    try:
+        while next_offset < offset_limit or in_flight:
+            while len(in_flight) < max(prefetch, 1) and next_offset < offset_limit:
+                in_flight.append((next_offset, asyncio.create_task(fetch_review_page(
+                    session, app_id, next_offset, limit=PAGE_SIZE, endpoint=endpoint,
+                    rate_limiter=rate_limiter, start_date=start_date, end_date=end_date, archive=archive))))
+                next_offset += PAGE_SIZE
+            
+            # Wait for the next page in offset order
+            page_offset, task = in_flight.popleft()
+            yield page_offset, await task
+    finally:
+        for _, task in in_flight:
+            task.cancel()
+        await asyncio.gather(*(task for _, task in in_flight), return_exceptions=True)
 
-    for review in reviews_data:
-        cursor.execute("""
-            INSERT OR IGNORE INTO reviews (
-                app_id,
-                review_id,
-                rating,
-                date,
-                language,
-                author_name,
-                author_photo,
-                author_profile,
-                title,
-                body,
-                body_length,
-                version,
-                developer_reply,
-                developer_reply_date
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            app_id,
-            review.get("id"),
-            review.get("rating"),
-            review.get("date"),
-            review.get("language", ""),
-            review.get("author", {}).get("name", ""),
-            review.get("author", {}).get("photo", ""),
-            review.get("author", {}).get("profile", ""),
-            review.get("title", ""),
-            review.get("body", ""),
-            review.get("body_length", 0),
-            review.get("version", ""),
-            review.get("developer_reply"),
-            review.get("developer_reply_date")
-        ))
-    conn.commit()
-    conn.close()
 
-    return len(reviews_data)
+async def scrape_app(session, writer: ReviewWriter, app_id: str, max_reviews: int = 500000,
+                     endpoint: str = ENDPOINT, rate_limiter: RateLimiter = None, prefetch: int = 1,
+                     archive: PageArchive = None) -> int:
+    """
+    Fetch an app's pages in order from its saved offset. Each page is handed to the
+    writer, which records the offset with the page so an interrupted run resumes where
+    it stopped. Pages are consumed strictly in offset order, so even with prefetch > 1
+    only contiguous offsets are ever checkpointed. Returns how many reviews were fetched.
+    """
+    offset = get_scrape_offset(app_id)
+    total_fetched = 0
+    
+    pages = iter_pages(session, app_id, offset, max_reviews, endpoint, rate_limiter, prefetch, archive=archive)
+    async with aclosing(pages):
+        async for offset, rows in pages:
+            inserted_count = len(rows)
+            print(f"Offset={offset}, Fetched {inserted_count} reviews for {app_id}")
+            
+            if inserted_count == 0:
+                print(f"No more reviews for {app_id}. Stopping.")
+                break
+            
+            # We fetched 'inserted_count' new reviews
+            total_fetched += inserted_count
+            
+            # The writer saves the page with its offset so if we are interrupted, we can resume later
+            await writer.put(rows, SET_OFFSET_SQL, (app_id, offset + PAGE_SIZE))
+
+            if total_fetched >= max_reviews:
+                print(f"Reached {max_reviews} reviews, stopping for {app_id}.")
+                break
+    
+    return total_fetched
+
+
+async def split_window(session, app_id: str, start_date: datetime.date, end_date: datetime.date,
+                       window_size: int, endpoint: str = ENDPOINT, rate_limiter: RateLimiter = None,
+                       semaphore: asyncio.Semaphore = None) -> list:
+    """
+    Split a date range into (start_date, end_date) windows of at most window_size
+    reviews. A window is split in half, recursively, while a probe for the review at
+    offset window_size finds one; single days are never split. Each probe holds the
+    semaphore, if given, only while its request is in flight.
+    """
+    async with semaphore or nullcontext():
+        probe = await fetch_review_page(session, app_id, window_size, limit=1, endpoint=endpoint,
+                                        rate_limiter=rate_limiter, start_date=start_date, end_date=end_date)
+    if not probe or start_date == end_date:
+        return [(start_date, end_date)]
+    
+    middle = start_date + (end_date - start_date) // 2
+    halves = await asyncio.gather(
+        split_window(session, app_id, start_date, middle, window_size, endpoint, rate_limiter, semaphore),
+        split_window(session, app_id, middle + datetime.timedelta(days=1), end_date, window_size, endpoint,
+                     rate_limiter, semaphore),
+    )
+    return halves[0] + halves[1]
 
 
-async def main():
+async def plan_windows(session, app_id: str, window_size: int, endpoint: str = ENDPOINT,
+                       rate_limiter: RateLimiter = None, semaphore: asyncio.Semaphore = None) -> list:
+    """
+    Return the app's unfinished (start_date, end_date, last_offset) windows. Dates after
+    the last planned window (everything, on the first run) are split into new windows;
+    they start on that window's last day so reviews posted later that day are not missed.
+    """
+    windows = get_scrape_windows(app_id)
+    today = datetime.date.today()
+    planned_until = max((end for _, end, _, _ in windows), default=None)
+    if planned_until is None or planned_until < today:
+        new_windows = await split_window(session, app_id, planned_until or START_DATE, today,
+                                         window_size, endpoint, rate_limiter, semaphore)
+        add_scrape_windows(app_id, new_windows)
+        print(f"Planned {len(new_windows)} date windows for {app_id}")
+        windows = get_scrape_windows(app_id)
+    return [(start, end, offset) for start, end, offset, done in windows if not done]
+
+
+async def scrape_window(session, writer: ReviewWriter, app_id: str, start_date: datetime.date,
+                        end_date: datetime.date, offset: int = 0, max_reviews: int = 500000,
+                        endpoint: str = ENDPOINT, rate_limiter: RateLimiter = None, prefetch: int = 1,
+                        archive: PageArchive = None) -> int:
+    """
+    Fetch one date window of an app from its saved offset, checkpointing the offset in
+    its scrape_windows row and marking the window done at its first empty page.
+    Returns how many reviews were fetched.
+    """
+    window = (app_id, start_date.isoformat(), end_date.isoformat())
+    total_fetched = 0
+    
+    pages = iter_pages(session, app_id, offset, max_reviews, endpoint, rate_limiter, prefetch, start_date, end_date,
+                       archive)
+    async with aclosing(pages):
+        async for offset, rows in pages:
+            if not rows:
+                await writer.put([], FINISH_WINDOW_SQL, window)
+                break
+            total_fetched += len(rows)
+            await writer.put(rows, SET_WINDOW_OFFSET_SQL, (offset + PAGE_SIZE, *window))
+    
+    return total_fetched
+
+
+async def main(apps=PLAYSTORE_APPS, concurrency: int = 1, rps: float = None, endpoint: str = ENDPOINT,
+               max_reviews: int = 500000, prefetch: int = 1, window_size: int = None, archive_dir: str = None):
+    """
+    Scrape every app in apps. Up to `concurrency` apps are fetched at once, each still
+    walking its own pages in order with up to `prefetch` page requests in flight, and
+    all requests share a global `rps` limit.
+    
+    With window_size set, each app's date range is instead partitioned into windows of
+    at most window_size reviews (see plan_windows), and up to `concurrency` windows of
+    any app are fetched at once, each from its own saved offset. This avoids slow deep
+    offsets; max_reviews then applies per window. The planning probes are limited to
+    `concurrency` requests at once as well.
+    
+    With archive_dir set, every raw page response is also kept there (see replay).
+    """
     init_db()  # Ensure our database is ready
+    semaphore = asyncio.Semaphore(concurrency)
+    rate_limiter = RateLimiter(rps)
+    archive = PageArchive(archive_dir) if archive_dir else None
+    writer = ReviewWriter().start()
+    start_time = time.perf_counter()
+    
+    async def run_limited(job):
+        async with semaphore:
+            return await job
     
     async with aiohttp.ClientSession() as session:
-        for app_id in PLAYSTORE_APPS:
-            offset = get_scrape_offset(app_id)
-            total_fetched = 0
-            max_reviews = 500000  # We'll stop once we've reached 100,000 reviews for that app
-            
-            while total_fetched < max_reviews:
-                # Fetch one page
-                inserted_count = await fetch_review_page(session, app_id, offset, limit=100)
-                print(f"Offset={offset}, Inserted {inserted_count} reviews for {app_id}")
-                
-                if inserted_count == 0:
-                    print(f"No more reviews for {app_id}. Stopping.")
-                    break
-                
-                # We inserted 'inserted_count' new reviews
-                total_fetched += inserted_count
-                offset += 100
-                
-                # Update DB record for offset so if we are interrupted, we can resume later
-                set_scrape_offset(app_id, offset)
-
-                if total_fetched >= max_reviews:
-                    print(f"Reached {max_reviews} reviews, stopping for {app_id}.")
-                    break
+        outcomes = []  # (label, result) for failed plans
+        jobs = []  # (label, coroutine)
+        if window_size:
+            plans = await asyncio.gather(*(plan_windows(session, app_id, window_size, endpoint, rate_limiter, semaphore)
+                                           for app_id in apps), return_exceptions=True)
+            for app_id, plan in zip(apps, plans):
+                if isinstance(plan, Exception):
+                    outcomes.append((f"{app_id} (planning)", plan))
+                    continue
+                for start_date, end_date, offset in plan:
+                    jobs.append((f"{app_id} {start_date}..{end_date}",
+                                 scrape_window(session, writer, app_id, start_date, end_date, offset,
+                                               max_reviews, endpoint, rate_limiter, prefetch, archive)))
+        else:
+            for app_id in apps:
+                jobs.append((app_id, scrape_app(session, writer, app_id, max_reviews, endpoint, rate_limiter, prefetch,
+                                                archive)))
+        
+        results = await asyncio.gather(*(run_limited(job) for _, job in jobs), return_exceptions=True)
+        outcomes += [(label, result) for (label, _), result in zip(jobs, results)]
+    await writer.close()
+    elapsed = time.perf_counter() - start_time
+    
+    # One failing app or window does not stop the others; its offset is kept for the next run
+    failed = 0
+    for label, result in outcomes:
+        if isinstance(result, Exception):
+            failed += 1
+            print(f"Failed to scrape {label}: {result!r}")
+        else:
+            print(f"{label}: fetched {result} reviews")
+    print(writer.stats())
+    print(f"Ingested {writer.rows / elapsed if elapsed else 0:.0f} rows/sec overall in {elapsed:.1f}s")
+    return failed
+
+
+def replay(archive_dir: str, workers: int = None, commit_every: int = 100) -> int:
+    """
+    Re-ingest every page in a PageArchive into the reviews table without any network
+    access. Pages are decompressed and parsed in a process pool, in parallel across
+    files, and inserted through one connection; reviews already present are skipped,
+    so replay into a fresh --db to rebuild it with new insert logic.
+    Returns how many review rows were read.
+    """
+    init_db()
+    paths = PageArchive(archive_dir).paths()
+    print(f"Replaying {len(paths)} archived pages from {archive_dir}")
+    start_time = time.perf_counter()
+    
+    conn = sqlite3.connect(DB_PATH)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    rows_read = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for pages_done, rows in enumerate(executor.map(load_archived_page, paths, chunksize=16), 1):
+            conn.executemany(INSERT_REVIEW_SQL, rows)
+            rows_read += len(rows)
+            if pages_done % commit_every == 0:
+                conn.commit()
+    conn.commit()
+    conn.close()
+    
+    elapsed = time.perf_counter() - start_time
+    print(f"Replayed {rows_read} reviews in {elapsed:.1f}s ({rows_read / elapsed if elapsed else 0:.0f} rows/sec)")
+    return rows_read
 
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Fetch Play Store reviews from AppTweak into reviews.db")
+    parser.add_argument("command", nargs="?", choices=["fetch", "replay"], default="fetch",
+                        help="fetch from the API (default), or replay pages saved with --archive")
+    parser.add_argument("--apps", nargs="+", default=PLAYSTORE_APPS, help="App ids to scrape")
+    parser.add_argument("--concurrency", type=int, default=1, help="Number of apps fetched at once")
+    parser.add_argument("--rps", type=float, default=None, help="Global limit on requests per second")
+    parser.add_argument("--endpoint", default=ENDPOINT,
+                        help="Reviews search endpoint (e.g. a mock_apptweak_server.py URL for testing)")
+    parser.add_argument("--max-reviews", type=int, default=500000, help="Stop each app after this many reviews")
+    parser.add_argument("--prefetch", type=int, default=1, help="Page requests kept in flight per app")
+    parser.add_argument("--window-size", type=int, default=None,
+                        help="Crawl date windows of at most this many reviews instead of one deep offset range")
+    parser.add_argument("--archive", default=None,
+                        help="Directory of gzip-compressed raw responses: written by fetch, read by replay")
+    parser.add_argument("--workers", type=int, default=None, help="Replay processes (defaults to the CPU count)")
+    parser.add_argument("--db", default=DB_PATH, help="SQLite database path")
+    args = parser.parse_args()
+    
+    DB_PATH = args.db
+    if args.command == "replay":
+        if not args.archive:
+            parser.error("replay needs --archive")
+        replay(args.archive, args.workers)
+    else:
+        failed = asyncio.run(main(args.apps, args.concurrency, args.rps, args.endpoint, args.max_reviews,
+                                  args.prefetch, args.window_size, args.archive))
+        raise SystemExit(1 if failed else 0)
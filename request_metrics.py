@@ -0,0 +1,98 @@
+import bisect
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+# Upper bounds in seconds, Prometheus style; the last bucket (+Inf) catches everything
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram with a running sum and count"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.bucket_counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self):
+        """Yield (upper bound label, cumulative count) pairs including +Inf"""
+        running = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.bucket_counts):
+            running += count
+            yield ("+Inf" if bound == float("inf") else repr(bound)), running
+
+
+class RequestMetrics:
+    """
+    Per-endpoint request counters and phase timing histograms for the API.
+
+    Phases split each request into parse (reading and decoding the body), score and
+    serialize (encoding and writing the response).
+    """
+
+    def __init__(self, prefix="name_api"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.requests = defaultdict(int)
+        self.errors = defaultdict(int)
+        self.phases = defaultdict(Histogram)
+
+    def observe(self, endpoint, phase, seconds):
+        with self._lock:
+            self.phases[(endpoint, phase)].observe(seconds)
+
+    @contextmanager
+    def timer(self, endpoint, phase):
+        """Time the enclosed block as one observation of an endpoint phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(endpoint, phase, time.perf_counter() - start)
+
+    def count_request(self, endpoint, status):
+        with self._lock:
+            self.requests[(endpoint, status)] += 1
+            if status >= 400:
+                self.errors[endpoint] += 1
+
+    def render(self, cache_stats=None):
+        """Render all metrics in the Prometheus text exposition format"""
+        prefix = self.prefix
+        lines = []
+        with self._lock:
+            lines.append(f"# HELP {prefix}_requests_total Requests handled, by endpoint and status code")
+            lines.append(f"# TYPE {prefix}_requests_total counter")
+            for (endpoint, status), count in sorted(self.requests.items()):
+                lines.append(f'{prefix}_requests_total{{endpoint="{endpoint}",status="{status}"}} {count}')
+
+            lines.append(f"# HELP {prefix}_errors_total Requests answered with a 4xx or 5xx status, by endpoint")
+            lines.append(f"# TYPE {prefix}_errors_total counter")
+            for endpoint, count in sorted(self.errors.items()):
+                lines.append(f'{prefix}_errors_total{{endpoint="{endpoint}"}} {count}')
+
+            lines.append(f"# HELP {prefix}_phase_seconds Time spent per request phase (parse, score, serialize)")
+            lines.append(f"# TYPE {prefix}_phase_seconds histogram")
+            for (endpoint, phase), histogram in sorted(self.phases.items()):
+                labels = f'endpoint="{endpoint}",phase="{phase}"'
+                for bound, count in histogram.cumulative_counts():
+                    lines.append(f'{prefix}_phase_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f"{prefix}_phase_seconds_sum{{{labels}}} {histogram.sum}")
+                lines.append(f"{prefix}_phase_seconds_count{{{labels}}} {histogram.count}")
+
+        if cache_stats:
+            for key in ("hits", "misses", "evictions"):
+                lines.append(f"# TYPE {prefix}_scorer_cache_{key}_total counter")
+                lines.append(f"{prefix}_scorer_cache_{key}_total {cache_stats[key]}")
+            lines.append(f"# TYPE {prefix}_scorer_cache_entries gauge")
+            lines.append(f"{prefix}_scorer_cache_entries {cache_stats['entries']}")
+
+        return "\n".join(lines) + "\n"
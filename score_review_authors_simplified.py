@@ -1,37 +1,22 @@
+import argparse
+import array
 import csv
-import glob
 import os
-import re
+import resource
 import sqlite3
+import sys
 import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
 
-from name_uniqueness_scorer import NameUniquenessScorer
+from name_normalizer import NameNormalizer, load_words
+from name_uniqueness_scorer import DEFAULT_WEIGHTS, SCORER_VERSION, NameUniquenessScorer, weights_fingerprint
 
-with open("words.txt", "r") as file:
-    words = file.read().splitlines()
+words = load_words("words.txt")
 
-def is_valid_name(name):
-    """Check if a name appears to be a valid human name."""
-
-    # Check for invalid special characters
-    pattern = re.compile(r'[@#$%^&*+=<>{}\d[]|/]')
-    if pattern.findall(name):
-        return False
-    
-    if name.count('.') > 0:
-        return False
-    
-    if name.count('-') > 1:
-        return False
-    
-    name_parts = name.split()
-        
-    if len(name_parts[0]) == 1:
-        return False
-    if len(name_parts[-1]) == 1:
-        return False
-    
-    return True
+RESULTS_CSV = "simplified_name_scores.csv"
+# The score column of RESULTS_CSV as raw native-endian float64s, in the same row order,
+# so count_high_scores.py can load it without parsing the CSV
+RESULTS_SCORES = "simplified_name_scores.f64"
 
 
 def simplify_name(author_name):
@@ -39,194 +24,304 @@ def simplify_name(author_name):
     Simplify a name to just first and last name with proper capitalization.
     Returns a tuple of (first_name, last_name, is_valid)
     """
-    
-    suffixes = ['mr', 'mr.', 'sr', 'sr.', 'jr', 'jr.', 'dr', 'dr.', 'ms', 'ms.', 'mrs', 'mrs.', 'inc', 'llc', 'ltd', 'corp', 'gaming', 'official', 'real', 'the', 'channel', 'tv', 'yt', 'youtube', 'video', 'videos', 'gram', 'insta', 'fb', 'tweet', 'tiktok', 'live', 'gaming', 'plays', 'stream']
+    return normalizer.simplify(author_name)
 
-    # Remove suffixes from anywhere in the name
-    for suffix in suffixes:
-        # Remove suffix if it appears at start with space after or at end with space before
-        pattern = f"^{suffix}\\s|\\s{suffix}$"
-        author_name = re.sub(pattern, "", author_name, flags=re.IGNORECASE)
 
-    author_parts = author_name.split()
+def load_scorer(snapshot_path=None, cache_size=None):
+    """Load the name scorer from a corpus snapshot if given, otherwise from ./name_data"""
+    if snapshot_path:
+        return NameUniquenessScorer.from_snapshot(snapshot_path, cache_size=cache_size)
+    return NameUniquenessScorer("./name_data", cache_size=cache_size)
 
-    # Check if first part is all uppercase
-    if author_parts[0].isupper():
-        return (author_parts[0], "", False)
-    
-    author_name = author_name.lower()
-    author_parts = author_name.split()
 
-    if len(author_parts) < 2:
-        return (author_parts[0], "", False)
+def init_scorer(snapshot_path=None, memo_size=None):
+    """
+    Load the scorer and name normalizer into this process (also the process pool initializer).
+    
+    With memo_size set, the scorer caches up to that many name and full-name scores,
+    so the many authors that simplify to the same person are only scored once. Author
+    names themselves are distinct, so simplifying them is not memoized.
+    """
+    global scorer, normalizer
+    scorer = load_scorer(snapshot_path, memo_size)
+    normalizer = NameNormalizer(scorer, words)
 
-    if len(author_parts) >= 2:
-        author_name = f"{author_parts[0]} {author_parts[-1]}"
-        author_parts = author_name.split()
 
-    # Check if the name is valid
-    if not is_valid_name(author_name):
-        return (author_parts[0], "", False)   
+def score_author(author_name):
+    """Simplify and score one author name, returning (author_name, first, last, score)"""
+    first_name, last_name, is_valid = simplify_name(author_name)
     
-    # Split the name into parts
-    parts = author_name.split()
-    
-    # Handle single-word names
-    if len(parts) == 1:
-        return (parts[0].lower(), "", False)
+    if is_valid:
+        # Score valid names
+        if last_name:
+            score = scorer.calculate_full_name_uniqueness(first_name, last_name)
+        else:
+            score = scorer.calculate_first_name_uniqueness(first_name) / 2
+    else:
+        # Invalid names get a score of -1
+        score = -1
     
-    # For multi-word names, take first and last parts
-    first_name = parts[0].lower()
-    last_name = parts[-1].lower()
+    return (author_name, first_name, last_name, score)
 
-    # Check if the name exists in the dataset
-    if not scorer.name_exists(first_name, "first") and not scorer.name_exists(last_name, "last"):
-        return ("", "", False)
-    
-    if (first_name in words and not scorer.name_exists(first_name, "first")):
-        return (author_parts[0], "", False)
+
+def memo_stats():
+    """This process's score cache counters, tagged with its pid so workers can be told apart"""
+    return {"pid": os.getpid(), "score": scorer.cache_stats()}
+
+
+def score_author_batch(start, author_names):
+    """
+    Score a batch of author names; start is the batch's position in the author stream.
+    Returns (start, scored rows, memo stats of the scoring process).
+    """
+    return start, [score_author(author_name) for author_name in author_names], memo_stats()
+
+
+def memo_lookups(stats):
+    """Total score cache lookups in a memo_stats() snapshot"""
+    counters = stats["score"]
+    return counters["hits"] + counters["misses"] if counters else 0
+
+
+def print_memo_stats(stats_by_pid):
+    """
+    Print the score cache hit rates summed over every process that scored names.
+    Full names and their parts are reported separately: a full-name hit skips scoring
+    altogether, while each full-name miss looks up its first and last name.
+    """
+    counters = [stats["score"] for stats in stats_by_pid.values() if stats["score"]]
+    if not counters:
+        return
+    for kind, label in (("full", "full names"), ("name", "name parts")):
+        hits = sum(counter["kinds"].get(kind, {}).get("hits", 0) for counter in counters)
+        lookups = hits + sum(counter["kinds"].get(kind, {}).get("misses", 0) for counter in counters)
+        rate = hits / lookups * 100 if lookups else 0.0
+        print(f"Score memo ({label}): {hits}/{lookups} lookups deduplicated ({rate:.1f}%)")
+    evictions = sum(counter["evictions"] for counter in counters)
+    print(f"Score memo: {evictions} evictions")
+
+
+def iter_author_batches(conn, batch_size):
+    """
+    Yield (start position, author names) batches from the author_score_queue table.
     
-    if (last_name in words and not scorer.name_exists(last_name, "last")):
-        return (author_parts[0], "", False)
+    Each batch is its own short query keyed on rowid, so scored names can be removed
+    from the queue between batches without invalidating a long running cursor.
+    """
+    start = 0
+    last_rowid = 0
+    while True:
+        rows = conn.execute("""
+            SELECT rowid, author_name FROM author_score_queue
+            WHERE rowid > ? ORDER BY rowid LIMIT ?
+        """, (last_rowid, batch_size)).fetchall()
+        if not rows:
+            return
+        last_rowid = rows[-1][0]
+        yield start, [author_name for _, author_name in rows]
+        start += len(rows)
+
+
+def iter_scored_batches(conn, batch_size, workers=None, snapshot_path=None, memo_size=None):
+    """
+    Yield (start position, scored rows, memo stats) for every batch of author names.
     
-    # Handle special cases like "John D." where the last part is just an initial
-    if len(parts) > 1 and (len(parts[-1]) == 1 or (len(parts[-1]) == 2 and parts[-1].endswith('.'))):
-        # If the last part is just an initial, use the part before it as the last name
-        if len(parts) > 2:
-            last_name = parts[-2].lower()
-        else:
-            last_name = ""
+    With workers > 1 the batches are scored in a process pool and yielded as they
+    complete, in any order. The queue is only read from this thread and at most
+    two batches per worker are in flight, so memory stays bounded.
+    """
+    batches = iter_author_batches(conn, batch_size)
+    if not workers or workers <= 1:
+        for start, batch in batches:
+            yield score_author_batch(start, batch)
+        return
     
-    return (first_name, last_name, True)
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_scorer,
+                             initargs=(snapshot_path, memo_size)) as executor:
+        pending = set()
+        for start, batch in batches:
+            pending.add(executor.submit(score_author_batch, start, batch))
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in as_completed(pending):
+            yield future.result()
+
+
+def init_author_scores(conn):
+    """Create the author_scores table that persists scores between runs, and the scoring queue"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS author_scores (
+            author_name TEXT PRIMARY KEY,
+            first_name TEXT,
+            last_name TEXT,
+            -- No declared type, so each score is stored as the scorer returned it: a
+            -- score capped at int 100 is written to the CSV as 100, not 100.0
+            score,
+            scorer_version TEXT,
+            weights_hash TEXT,
+            scored_at TEXT
+        )
+    """)
+    # Author names still to be scored by the current (or an interrupted) run
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS author_score_queue (
+            author_name TEXT PRIMARY KEY
+        )
+    """)
+    conn.commit()
+
+
+def fill_author_score_queue(conn, weights_hash, full=False):
+    """
+    Queue every author that is new or was scored by another scorer version or
+    weights (every author with full=True), replacing any previous queue.
+    """
+    conn.execute("DELETE FROM author_score_queue")
+    conn.execute("""
+        INSERT INTO author_score_queue (author_name)
+        SELECT DISTINCT r.author_name
+        FROM reviews r
+        LEFT JOIN author_scores s ON s.author_name = r.author_name
+        WHERE r.author_name IS NOT NULL AND r.author_name != ''
+          AND (? OR s.author_name IS NULL OR s.scorer_version != ? OR s.weights_hash != ?)
+    """, (full, SCORER_VERSION, weights_hash))
+    conn.commit()
+
+
+def save_author_scores(conn, rows, weights_hash):
+    """
+    Checkpoint a batch: upsert its scores and remove its names from the queue in one
+    transaction, so an interrupted run can resume exactly where it stopped.
+    """
+    scored_at = time.strftime("%Y-%m-%d %H:%M:%S")
+    with conn:
+        conn.executemany("""
+            INSERT OR REPLACE INTO author_scores
+                (author_name, first_name, last_name, score, scorer_version, weights_hash, scored_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, [(*row, SCORER_VERSION, weights_hash, scored_at) for row in rows])
+        conn.executemany("DELETE FROM author_score_queue WHERE author_name = ?",
+                         [(row[0],) for row in rows])
 
 
-def score_review_authors(batch_size=100):
+def score_review_authors(batch_size=100, workers=None, snapshot_path=None, full=False, resume=False,
+                         memo_size=100000):
     start_time = time.time()
     
-    # Initialize the name scorer
-    print("Initializing name scorer...")
-    global scorer
-    scorer = NameUniquenessScorer("./name_data")
+    if not workers or workers <= 1:
+        # Initialize the name scorer
+        print("Initializing name scorer...")
+        init_scorer(snapshot_path, memo_size)
+    else:
+        print(f"Scoring with {workers} worker processes, each loading its own name scorer...")
+    weights_hash = weights_fingerprint(DEFAULT_WEIGHTS)
     
     # Connect to the SQLite database
     conn = sqlite3.connect("reviews.db")
+    init_author_scores(conn)
     cursor = conn.cursor()
     
-    # Get all unique author names from the reviews table along with their review details
-    cursor.execute("""
-        SELECT DISTINCT author_name, 
-               rating, title, date, review_id, app_id, body
-        FROM reviews 
-        WHERE author_name IS NOT NULL AND author_name != ''
-    """)
-    author_data = cursor.fetchall()
-    
-    # Create a dictionary to store review details for each author
-    author_reviews = {}
-    for row in author_data:
-        author_name = row[0]
-        review_details = row[1:]  # rating, title, date, review_id, app_id, body
-        
-        if author_name not in author_reviews:
-            author_reviews[author_name] = review_details
-    
-    author_names = list(author_reviews.keys())
-    total_names = len(author_names)
-    print(f"Found {total_names} unique author names to score")
+    if resume:
+        cursor.execute("SELECT COUNT(*) FROM author_score_queue")
+        total_names = cursor.fetchone()[0]
+        print(f"Resuming with {total_names} author names left from the previous run")
+    else:
+        fill_author_score_queue(conn, weights_hash, full)
+        cursor.execute("SELECT COUNT(*) FROM author_score_queue")
+        total_names = cursor.fetchone()[0]
+        print(f"Found {total_names} new or changed author names to score")
     
-    # Process in batches to show progress
-    scored_authors = []
-    valid_count = 0
-    invalid_count = 0
+    # Process in batches to show progress; each batch is checkpointed as it completes
+    processed = 0
+    stats_by_pid = {}
     
-    for i in range(0, total_names, batch_size):
-        batch = author_names[i:i+batch_size]
-        batch_scores = []
-        
-        for author_name in batch:
-            # Simplify the name
-            first_name, last_name, is_valid = simplify_name(author_name)
-            
-            if is_valid:
-                # Score valid names
-                if last_name:
-                    score = scorer.calculate_full_name_uniqueness(first_name, last_name)
-                else:
-                    score = scorer.calculate_first_name_uniqueness(first_name) / 2
-                valid_count += 1
-            else:
-                # Invalid names get a score of -1
-                score = -1
-                invalid_count += 1
-            
-            # Get the review details for this author
-            review_details = author_reviews[author_name]
-            rating, title, date, review_id, app_id, body = review_details
-            
-            # Append all data to the batch scores
-            batch_scores.append((author_name, first_name, last_name, score))
-        
-        scored_authors.extend(batch_scores)
+    for _, batch_scores, batch_stats in iter_scored_batches(conn, batch_size, workers, snapshot_path, memo_size):
+        save_author_scores(conn, batch_scores, weights_hash)
+        processed += len(batch_scores)
+        # Batches from one worker can complete out of order, so keep its most advanced counters
+        previous = stats_by_pid.get(batch_stats["pid"])
+        if previous is None or memo_lookups(batch_stats) >= memo_lookups(previous):
+            stats_by_pid[batch_stats["pid"]] = batch_stats
         
         # Report progress
-        progress = min(100, round((i + len(batch)) / total_names * 100, 1))
+        progress = min(100, round(processed / total_names * 100, 1))
         elapsed = time.time() - start_time
-        names_per_second = (i + len(batch)) / elapsed if elapsed > 0 else 0
-        eta_seconds = (total_names - (i + len(batch))) / names_per_second if names_per_second > 0 else 0
+        names_per_second = processed / elapsed if elapsed > 0 else 0
+        eta_seconds = (total_names - processed) / names_per_second if names_per_second > 0 else 0
         eta_minutes = eta_seconds / 60
         
-        print(f"Progress: {progress}% ({i + len(batch)}/{total_names}) | "
+        print(f"Progress: {progress}% ({processed}/{total_names}) | "
               f"Speed: {names_per_second:.1f} names/sec | "
               f"ETA: {eta_minutes:.1f} minutes")
-        
-        # Save intermediate results every 1000 names
-        if (i + len(batch)) % 1000 == 0 or (i + len(batch)) == total_names:
-            # Sort by score in descending order (but put -1 scores at the end)
-            temp_sorted = sorted(scored_authors, key=lambda x: (x[3] == -1, -x[3]))
-            
-            # Save intermediate results to CSV
-            with open(f"simplified_name_scores_partial_{i + len(batch)}.csv", "w", newline="", encoding="utf-8") as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerow(["First Name", "Last Name", "Uniqueness Score"])
-                for author in temp_sorted:
-                    writer.writerow(author)
-            
-            print(f"Saved intermediate results to simplified_name_scores_partial_{i + len(batch)}.csv")
-    
-    # Sort by score in descending order (but put -1 scores at the end)
-    scored_authors.sort(key=lambda x: (x[3] == -1, -x[3]))
-    
-    # Save final results to CSV
-    with open("simplified_name_scores.csv", "w", newline="", encoding="utf-8") as csvfile:
+    
+    # The final results cover every author, including those scored by earlier runs.
+    # Sort by score in descending order; -1 (invalid) scores sort last on their own.
+    # Tied scores are ordered by author name. The original one-pass job kept ties in
+    # the order the authors were read, which incremental, resumed and parallel runs
+    # cannot reproduce, so the tie order changed on purpose to keep the CSV stable.
+    cursor.execute("""
+        SELECT author_name, first_name, last_name, score
+        FROM author_scores
+        ORDER BY score DESC, author_name
+    """)
+    
+    # Save final results to CSV, keeping the top 10 valid names and counts as we go
+    top_names = []
+    valid_count = invalid_count = 0
+    scores = array.array("d")
+    with open(RESULTS_CSV, "w", newline="", encoding="utf-8") as csvfile:
         writer = csv.writer(csvfile)
         writer.writerow(["Original Name", "First Name", "Last Name", "Uniqueness Score"])
-        for author in scored_authors:
-            writer.writerow(author)
+        for original, first, last, score in cursor:
+            if score == -1:
+                invalid_count += 1
+            else:
+                valid_count += 1
+                if len(top_names) < 10:
+                    top_names.append((original, first, last, score))
+            writer.writerow((original, first, last, score))
+            scores.append(score)
+    # Written after the CSV, so a score file at least as new as the CSV matches it
+    with open(RESULTS_SCORES + ".tmp", "wb") as scores_file:
+        scores.tofile(scores_file)
+    os.replace(RESULTS_SCORES + ".tmp", RESULTS_SCORES)
+    total_authors = valid_count + invalid_count
     
     # Print top 10 most unique valid names
     print("\nTop 10 Most Unique Valid Names:")
-    valid_names = [a for a in scored_authors if a[3] != -1]
-    for i, (original, first, last, score) in enumerate(valid_names[:10], 1):
+    for i, (original, first, last, score) in enumerate(top_names, 1):
         full_name = f"{first} {last}".strip()
         print(f"{i}. {full_name}: {score:.1f} (Original: {original})")
     
     # Print statistics
-    print(f"\nTotal names processed: {total_names}")
-    print(f"Valid names: {valid_count} ({valid_count/total_names*100:.1f}%)")
-    print(f"Invalid names: {invalid_count} ({invalid_count/total_names*100:.1f}%)")
+    print(f"\nTotal names: {total_authors} ({total_names} scored this run)")
+    if total_authors:
+        print(f"Valid names: {valid_count} ({valid_count/total_authors*100:.1f}%)")
+        print(f"Invalid names: {invalid_count} ({invalid_count/total_authors*100:.1f}%)")
     
     conn.close()
     
     total_time = time.time() - start_time
-    print(f"\nScored {len(scored_authors)} author names in {total_time:.1f} seconds")
-    print(f"Results saved to simplified_name_scores.csv")
-    # Remove all partial save files
-    for filename in glob.glob("simplified_name_scores_partial_*.csv"):
-        try:
-            os.remove(filename)
-            print(f"Removed partial results file: {filename}")
-        except OSError as e:
-            print(f"Error removing {filename}: {e}")
+    print(f"\nScored {processed} author names in {total_time:.1f} seconds")
+    print_memo_stats(stats_by_pid)
+    # ru_maxrss is reported in kilobytes on Linux and bytes on macOS
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak_rss / (1024 * 1024) if sys.platform == "darwin" else peak_rss / 1024
+    print(f"Peak memory: {peak_mb:.1f} MB")
+    print(f"Results saved to {RESULTS_CSV} (scores also in {RESULTS_SCORES})")
 
 if __name__ == "__main__":
-    score_review_authors(batch_size=100)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Score the uniqueness of review author names in reviews.db")
+    parser.add_argument("--batch-size", type=int, default=100, help="Author names per batch")
+    parser.add_argument("--workers", type=int, default=None, help="Score batches in this many worker processes")
+    parser.add_argument("--snapshot", default=None, help="Load the name corpus from a snapshot built with build_snapshot.py")
+    parser.add_argument("--full", action="store_true", help="Rescore every author, not just new or changed ones")
+    parser.add_argument("--resume", action="store_true", help="Continue an interrupted run from its last checkpoint")
+    parser.add_argument("--memo-size", type=int, default=100000,
+                        help="Entries in the scorer's cache of name scores (0 disables memoization)")
+    args = parser.parse_args()
+    
+    score_review_authors(batch_size=args.batch_size, workers=args.workers, snapshot_path=args.snapshot,
+                         full=args.full, resume=args.resume, memo_size=args.memo_size)
\ No newline at end of file
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Pre-fork server for the Name Uniqueness API
+
+The parent process loads the name corpus once, binds the listening socket and forks
+worker processes that all accept from it. Workers inherit the corpus copy-on-write,
+or share the mapped pages of a snapshot (see build_snapshot.py), so memory stays
+nearly constant as workers are added.
+
+Signals sent to the parent:
+    SIGHUP           rolling restart of the workers (reloads --snapshot first)
+    SIGTERM/SIGINT   let workers finish their current request, then exit
+
+GET /api/workers reports each worker's pid, uptime, requests served and heartbeat.
+GET /api/metrics is answered by whichever worker accepts the connection, so its
+counters and histograms cover that worker only; use /api/workers for request
+counts across all workers.
+"""
+
+import argparse
+import gc
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from http.server import HTTPServer
+from multiprocessing.sharedctypes import RawArray
+
+# Per-worker health slot layout in the shared array
+SLOT_FIELDS = ("pid", "started", "heartbeat", "requests", "restarts")
+
+# Seconds a worker may go without a heartbeat before the parent replaces it
+HEARTBEAT_TIMEOUT = 30.0
+
+# How often workers heartbeat, and wake up from accept() to check for shutdown
+POLL_INTERVAL = 0.5
+
+
+class WorkerHealth:
+    """Per-worker health slots in memory shared between the parent and its workers"""
+
+    def __init__(self, worker_count):
+        self.worker_count = worker_count
+        self._values = RawArray("d", worker_count * len(SLOT_FIELDS))
+
+    def _index(self, slot, field):
+        return slot * len(SLOT_FIELDS) + SLOT_FIELDS.index(field)
+
+    def get(self, slot, field):
+        return self._values[self._index(slot, field)]
+
+    def set(self, slot, field, value):
+        self._values[self._index(slot, field)] = value
+
+    def increment(self, slot, field):
+        self._values[self._index(slot, field)] += 1
+
+    def report(self):
+        now = time.time()
+        workers = []
+        for slot in range(self.worker_count):
+            heartbeat_age = now - self.get(slot, "heartbeat")
+            workers.append({
+                "slot": slot,
+                "pid": int(self.get(slot, "pid")),
+                "uptime_seconds": round(now - self.get(slot, "started"), 1),
+                "requests": int(self.get(slot, "requests")),
+                "restarts": int(self.get(slot, "restarts")),
+                "heartbeat_age_seconds": round(heartbeat_age, 1),
+                "healthy": heartbeat_age < HEARTBEAT_TIMEOUT,
+            })
+        return workers
+
+
+class WorkerServer(HTTPServer):
+    """HTTPServer that knows its worker's health slot"""
+
+    def __init__(self, server_address, RequestHandlerClass, health):
+        super().__init__(server_address, RequestHandlerClass)
+        self.health = health
+        self.slot = None
+
+
+def make_handler(base_handler, health):
+    """Extend the API handler with the /api/workers health endpoint"""
+
+    class PreforkHandler(base_handler):
+        # Each worker handles one connection at a time, so drop clients that go quiet
+        # mid-request instead of letting them hold the worker
+        timeout = HEARTBEAT_TIMEOUT / 2
+
+        def handle_one_request(self):
+            super().handle_one_request()
+            # Count requests from here rather than per connection in process_request
+            if self.raw_requestline:
+                health.increment(self.server.slot, "requests")
+
+        def do_GET(self):
+            if self.path != '/api/workers':
+                return super().do_GET()
+            body = json.dumps({"parent_pid": os.getppid(), "workers": health.report()}).encode()
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return PreforkHandler
+
+
+def heartbeat(health, slot):
+    """
+    Heartbeat from a thread, so a worker busy with a slow client or a large
+    /api/score-stream upload is not taken for a hung one. The beats stop if the
+    process freezes or a C call holds the GIL, and exited workers are caught by waitpid.
+    """
+    while True:
+        health.set(slot, "heartbeat", time.time())
+        time.sleep(POLL_INTERVAL)
+
+
+def run_worker(server, slot):
+    """Worker loop: serve requests until SIGTERM"""
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+
+    server.slot = slot
+    server.timeout = POLL_INTERVAL
+    health = server.health
+    health.set(slot, "pid", os.getpid())
+    health.set(slot, "started", time.time())
+    threading.Thread(target=heartbeat, args=(health, slot), daemon=True).start()
+    while not stopping:
+        # Returns after one request or POLL_INTERVAL, so a stop never interrupts a request
+        server.handle_request()
+    server.server_close()
+    os._exit(0)
+
+
+class PreforkServer:
+    """Parent process: forks, supervises and restarts the workers"""
+
+    def __init__(self, server, worker_count, snapshot_path=None):
+        self.server = server
+        self.worker_count = worker_count
+        self.snapshot_path = snapshot_path
+        self.workers = {}  # pid -> slot
+        self.shutting_down = False
+        self.restart_requested = False
+
+    def spawn(self, slot):
+        health = self.server.health
+        # Mark the slot alive from the parent so a slow starting worker is not reaped
+        health.set(slot, "heartbeat", time.time())
+        pid = os.fork()
+        if pid == 0:
+            run_worker(self.server, slot)
+        self.workers[pid] = slot
+        return pid
+
+    def stop_worker(self, pid, timeout=POLL_INTERVAL * 10):
+        """Ask a worker to finish its current request and exit, killing it if it does not"""
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            done, _ = os.waitpid(pid, os.WNOHANG)
+            if done:
+                break
+            time.sleep(0.05)
+        else:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+        self.workers.pop(pid, None)
+
+    def rolling_restart(self):
+        """Replace the workers one at a time so the socket is never left unserved"""
+        if self.snapshot_path:
+            import api.index
+            from name_uniqueness_scorer import NameUniquenessScorer
+            api.index.scorer = NameUniquenessScorer.from_snapshot(self.snapshot_path, cache_size=api.index.SCORER_CACHE_SIZE)
+            print(f"Reloaded snapshot {self.snapshot_path}")
+        gc.freeze()
+        for pid, slot in list(self.workers.items()):
+            self.spawn(slot)
+            self.stop_worker(pid)
+            self.server.health.increment(slot, "restarts")
+        print(f"Restarted {self.worker_count} workers")
+
+    def reap(self):
+        """Respawn workers that exited or stopped heartbeating"""
+        health = self.server.health
+        while self.workers:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                break
+            slot = self.workers.pop(pid, None)
+            if slot is not None and not self.shutting_down:
+                print(f"Worker {pid} (slot {slot}) exited with status {status}, restarting")
+                health.increment(slot, "restarts")
+                self.spawn(slot)
+
+        now = time.time()
+        for pid, slot in list(self.workers.items()):
+            if now - health.get(slot, "heartbeat") > HEARTBEAT_TIMEOUT:
+                print(f"Worker {pid} (slot {slot}) missed its heartbeat, restarting")
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+                self.workers.pop(pid, None)
+                health.increment(slot, "restarts")
+                self.spawn(slot)
+
+    def run(self):
+        def request_shutdown(signum, frame):
+            self.shutting_down = True
+
+        def request_restart(signum, frame):
+            self.restart_requested = True
+
+        signal.signal(signal.SIGTERM, request_shutdown)
+        signal.signal(signal.SIGINT, request_shutdown)
+        signal.signal(signal.SIGHUP, request_restart)
+
+        # Keep the parent's objects out of the workers' garbage collections, so collecting
+        # does not write to (and un-share) the pages holding the corpus
+        gc.freeze()
+        for slot in range(self.worker_count):
+            self.spawn(slot)
+        print(f"Serving on port {self.server.server_address[1]} with {self.worker_count} workers (parent pid {os.getpid()})")
+
+        while not self.shutting_down:
+            if self.restart_requested:
+                self.restart_requested = False
+                self.rolling_restart()
+            self.reap()
+            time.sleep(POLL_INTERVAL)
+
+        print("Shutting down workers...")
+        for pid in list(self.workers):
+            self.stop_worker(pid)
+        self.server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the Name Uniqueness API from pre-forked worker processes")
+    parser.add_argument("--port", type=int, default=5001, help="Port to listen on")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Number of worker processes")
+    parser.add_argument("--snapshot", default=None,
+                        help="Corpus snapshot to load (shared between workers through the page cache)")
+    args = parser.parse_args()
+
+    if args.snapshot:
+        os.environ["NAME_API_SNAPSHOT"] = os.path.abspath(args.snapshot)
+
+    # Importing the API module loads the scorer once, in the parent
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from api.index import handler
+
+    health = WorkerHealth(args.workers)
+    server = WorkerServer(("", args.port), make_handler(handler, health), health)
+    PreforkServer(server, args.workers, args.snapshot).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -29,6 +29,7 @@ def run_test_server():
         print(f"  - GET http://localhost:{PORT}/api")
         print(f"  - POST http://localhost:{PORT}/api/score-name")
         print(f"  - POST http://localhost:{PORT}/api/compare-names")
+        print(f"  - POST http://localhost:{PORT}/api/score-stream")
         print("Press Ctrl+C to stop the server")
         try:
             httpd.serve_forever()
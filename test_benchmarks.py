@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for the synthetic corpus and baseline comparison in benchmarks.py
+Run with: python -m pytest test_benchmarks.py
+"""
+
+import contextlib
+import io
+import os
+
+import benchmarks
+from name_uniqueness_scorer import NameUniquenessScorer
+
+
+def read_corpus(data_dir):
+    contents = {}
+    for filename in sorted(os.listdir(data_dir)):
+        with open(os.path.join(data_dir, filename)) as file:
+            contents[filename] = file.read()
+    return contents
+
+
+def test_generated_corpus_is_deterministic_and_loads(tmp_path):
+    first = benchmarks.generate_corpus(str(tmp_path / "a"), years=3, first_names=500, last_names=800)
+    second = benchmarks.generate_corpus(str(tmp_path / "b"), years=3, first_names=500, last_names=800)
+    assert read_corpus(first) == read_corpus(second)
+
+    with benchmarks.working_directory(str(tmp_path / "a")), contextlib.redirect_stdout(io.StringIO()):
+        scorer = NameUniquenessScorer(first)
+    assert len(scorer.first_name_counts) == 500
+    assert len(scorer.last_name_counts) == 800
+    assert scorer.name_exists("john", "first") and scorer.name_exists("smith", "last")
+
+
+def report(**values):
+    return {"results": {name: {"value": value, "unit": "s"} for name, value in values.items()}}
+
+
+def test_compare_flags_only_slowdowns_beyond_tolerance():
+    baseline = report(load=1.0, score=2.0, simplify=4.0, removed=1.0)
+    current = report(load=1.05, score=2.5, simplify=2.0, added=1.0)
+    rows = benchmarks.compare_results(baseline, current, tolerance=0.10)
+
+    assert [(name, regressed) for name, _, _, _, regressed in rows] == [
+        ("load", False), ("score", True), ("simplify", False), ("removed", True)]
+    assert rows[1][3] == 0.25
+    # A benchmark that disappeared from the current results is reported, and fails the comparison
+    assert rows[3] == ("removed", 1.0, None, None, True)
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        benchmarks.print_comparison(rows, baseline, 0.10)
+    assert "removed" in output.getvalue() and "MISSING" in output.getvalue()
+    assert "1 regression beyond 10%" in output.getvalue()
+    assert "1 baseline benchmark missing" in output.getvalue()
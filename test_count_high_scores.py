@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests for the columnar score summary in count_high_scores.py
+Run with: python -m pytest test_count_high_scores.py
+"""
+
+import array
+import contextlib
+import csv
+import io
+import os
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import count_high_scores
+
+
+def ladder_summary(scores, threshold):
+    """The counts of the original row-by-row if/elif ladder"""
+    valid = [score for score in scores if score != -1]
+    bins = [0] * 10
+    for score in valid:
+        for i in range(10):
+            if 10 * i <= score < 10 * (i + 1) or (i == 9 and score == 100):
+                bins[i] += 1
+                break
+    return len(valid), sum(score > threshold for score in valid), bins
+
+
+@pytest.fixture
+def scores():
+    rng = random.Random(5)
+    values = [round(rng.uniform(0, 100), 1) for _ in range(3000)] + [-1] * 500
+    values += [0, 10, 9.9, 90, 100, 100.1, -0.5, float("nan"), float("inf"), 50, 50.1]
+    rng.shuffle(values)
+    return values
+
+
+@pytest.mark.parametrize("threshold", [0, 50, 50.05, 99.9, 100])
+def test_summary_matches_ladder(scores, threshold):
+    summary = count_high_scores.summarize_scores(np.array(scores), thresholds=[threshold, 10])
+    valid, above, bins = ladder_summary(scores, threshold)
+    assert summary["valid"] == valid
+    assert summary["above"][threshold] == above
+    assert [count for _, _, count in summary["bins"]] == bins
+
+
+def test_percentiles_and_top_k(scores):
+    summary = count_high_scores.summarize_scores(np.array(scores), percentiles=[50, 99], top_k=5)
+    comparable = [score for score in scores if score != -1 and score == score]
+    assert summary["percentiles"] == dict(zip([50, 99], np.percentile(comparable, [50, 99]).tolist()))
+    assert [score for _, score in summary["top"]] == sorted(comparable, reverse=True)[:5]
+    assert all(scores[row] == score for row, score in summary["top"])
+
+
+def test_binary_and_csv_scores_agree(scores, tmp_path):
+    csv_path = str(tmp_path / "scores.csv")
+    scores_path = str(tmp_path / "scores.f64")
+    with open(csv_path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["Original Name", "First Name", "Last Name", "Uniqueness Score"])
+        writer.writerows([f"Name {i}", "name", "", score] for i, score in enumerate(scores))
+
+    def count(threshold):
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            result = count_high_scores.count_high_scores(threshold, csv_path=csv_path, scores_path=scores_path)
+        return result, output.getvalue()
+
+    from_csv, csv_output = count(50)
+    with open(scores_path, "wb") as file:
+        array.array("d", scores).tofile(file)
+    from_binary, binary_output = count(50)
+
+    assert f"Reading scores from {scores_path}" in binary_output
+    assert from_binary == from_csv == ladder_summary(scores, 50)[1]
+    assert binary_output.split("Total rows")[1] == csv_output.split("Total rows")[1]
+
+    # A CSV newer than the score file is read instead of the stale scores
+    os.utime(scores_path, (0, 0))
+    assert f"Reading scores from {csv_path}" in count(50)[1]
+
+
+def test_read_score_column_skips_short_and_bad_rows(tmp_path):
+    csv_path = str(tmp_path / "scores.csv")
+    with open(csv_path, "w", newline="", encoding="utf-8") as file:
+        csv.writer(file).writerows([
+            ["Original Name", "First Name", "Last Name", "Uniqueness Score"],
+            ["Ann Lee", "ann", "lee", "12.5"], ["Bob"], ["Cy Ng", "cy", "ng", "n/a"], ["??", "", "", "-1"],
+        ])
+
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        scores, row_count = count_high_scores.read_score_column(csv_path)
+
+    assert scores.tolist() == [12.5, -1.0]
+    assert row_count == 4
+    assert "Row 2 has insufficient columns" in output.getvalue()
+    assert "Error parsing score in row 3" in output.getvalue()
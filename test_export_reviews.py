@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Tests for export_reviews.py
+Run with: python -m pytest test_export_reviews.py
+"""
+
+import argparse
+import contextlib
+import csv
+import datetime
+import gzip
+import io
+import sqlite3
+
+import pytest
+
+import export_reviews
+
+
+def strptime_format_date(date_str):
+    """format_date as originally written, always going through strptime"""
+    if not date_str:
+        return ""
+    try:
+        dt = datetime.datetime.strptime(date_str, "%Y-%m-%dT%H:%M:%SZ")
+        return dt.strftime("%Y-%m-%d %H:%M:%S")
+    except Exception:
+        return date_str
+
+
+@pytest.mark.parametrize("date_str", [
+    "", None, "2025-01-14T00:14:30Z", "2024-02-29T23:59:59Z", "2023-02-29T00:00:00Z",
+    "2025-13-01T00:00:00Z", "2025-01-00T00:00:00Z", "2025-01-14T24:00:00Z", "2025-01-14T23:59:60Z",
+    "0999-01-01T00:00:00Z", "2025-1-4T0:1:3Z", "2025-01-14 00:14:30", "2025-01-14T00:14:30Z\n", 12345,
+])
+def test_format_date_matches_strptime(date_str):
+    assert export_reviews.format_date(date_str) == strptime_format_date(date_str)
+
+
+@pytest.fixture
+def reviews_db(tmp_path, monkeypatch):
+    path = str(tmp_path / "reviews.db")
+    monkeypatch.setattr(export_reviews, "DB_PATH", path)
+    monkeypatch.setattr(export_reviews, "EXPORT_DIR", str(tmp_path / "exports"))
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE reviews (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, app_id TEXT, review_id TEXT UNIQUE, rating INTEGER,
+            date TEXT, language TEXT, author_name TEXT, author_photo TEXT, author_profile TEXT, title TEXT,
+            body TEXT, body_length INTEGER, version TEXT, developer_reply TEXT, developer_reply_date TEXT
+        )
+    """)
+    for i in range(250):
+        date = (datetime.datetime(2024, 1, 1) - datetime.timedelta(hours=i)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        conn.execute("INSERT INTO reviews (app_id, review_id, date, author_name, body) VALUES (?, ?, ?, ?, ?)",
+                     (f"app{i % 3}", f"r{i}", date, f"Author {i}", "line one\nline, two"))
+    conn.commit()
+    conn.close()
+    return path
+
+
+def export(**options):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return export_reviews.export_to_csv(**options)
+
+
+def read_rows(filename):
+    opener = gzip.open if filename.endswith(".gz") else open
+    with opener(filename, "rt", newline="", encoding="utf-8") as file:
+        return list(csv.reader(file))
+
+
+def test_gzip_export_matches_plain_export(reviews_db):
+    [plain] = export(batch_size=7)
+    [compressed] = export(compress=True)
+    assert compressed.endswith(".csv.gz")
+    rows = read_rows(plain)
+    assert read_rows(compressed) == rows
+    assert len(rows) == 251
+    assert rows[1][4] == "2024-01-01 00:00:00"
+
+
+def test_sharded_export_splits_rows_by_app(reviews_db):
+    # Reviews without an app_id get a shard of their own
+    conn = sqlite3.connect(reviews_db)
+    conn.execute("UPDATE reviews SET app_id = NULL WHERE id % 50 = 0")
+    conn.commit()
+    conn.close()
+
+    [plain] = export()
+    shards = export(shard_by="app_id", workers=2)
+    assert len(shards) == 4
+    assert shards[0].endswith(f"_{export_reviews.UNASSIGNED_SHARD}.csv")
+
+    header, *rows = read_rows(plain)
+    shard_rows = []
+    for filename in shards:
+        shard_header, *app_rows = read_rows(filename)
+        assert shard_header == header
+        assert app_rows == [row for row in rows if row[1] == app_rows[0][1]]
+        shard_rows += app_rows
+    assert sorted(shard_rows) == sorted(rows)
+
+    # Each shard reads its rows from the (app_id, date) index instead of scanning and sorting
+    conn = sqlite3.connect(reviews_db)
+    plan = " ".join(row[3] for row in conn.execute(
+        "EXPLAIN QUERY PLAN " + export_reviews.EXPORT_QUERY.format(where="WHERE app_id IS ?"), ("app1",)))
+    conn.close()
+    assert "idx_reviews_app_id_date" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def add_reviews(path, start, count):
+    conn = sqlite3.connect(path)
+    conn.executemany("INSERT INTO reviews (app_id, review_id, date) VALUES (?, ?, ?)",
+                     [("app", f"new{i}", "2025-01-14T00:14:30Z") for i in range(start, start + count)])
+    conn.commit()
+    conn.close()
+
+
+def test_incremental_export_writes_only_new_rows(reviews_db, tmp_path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        first = export_reviews.export_incremental("daily")
+        assert export_reviews.export_incremental("daily") is None
+        add_reviews(reviews_db, 0, 20)
+        second = export_reviews.export_incremental("daily", compress=True)
+        other = export_reviews.export_incremental("weekly")
+
+    assert len(read_rows(first)) == 251
+    delta = read_rows(second)[1:]
+    assert [int(row[0]) for row in delta] == list(range(251, 271))
+    assert len(read_rows(other)) == 271
+
+    manifest = export_reviews.load_manifest("daily")
+    assert manifest["last_id"] == 270
+    assert [(d["from_id"], d["to_id"], d["rows"]) for d in manifest["deltas"]] == [(1, 250, 250), (251, 270, 20)]
+    assert manifest["deltas"][1]["file"] == second.rsplit("/", 1)[1]
+
+
+@pytest.mark.parametrize("target", ["", "../daily", "daily/x", "/tmp/daily", "daily.json", "dai ly", "..", "daily\n"])
+def test_incremental_target_cannot_escape_export_dir(reviews_db, target):
+    with pytest.raises(argparse.ArgumentTypeError):
+        export_reviews.export_target(target)
+    with pytest.raises(ValueError):
+        export_reviews.export_incremental(target)
+    assert export_reviews.export_target("daily_2025-01") == "daily_2025-01"
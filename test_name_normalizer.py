@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Parity tests for NameNormalizer against the original simplify_name
+Run with: python -m pytest test_name_normalizer.py
+"""
+
+import os
+
+import pytest
+
+import benchmarks
+from name_normalizer import SUFFIXES, NameNormalizer, load_words
+
+EDGE_CASE_NAMES = [
+    "", " ", "\t", "Dr.", "Mr John Smith", "john smith jr", "John Smith Jr.", "JR John", "JOHN smith", "John SMITH",
+    "Mary-Ann O'Neil", "Mary-Ann Smith-Jones", "a b", "John A.", "J. Smith", "John D", "John 3", "John Smith2",
+    "Anne Marie Smith", "Smith Jr", "jr", "The Real Gaming Channel", "john the", "the john smith", "Zoë Smith",
+    "John\tSmith", "John  Smith", " John Smith ", "john.smith", "john@smith", "John [Smith]", "John/Smith",
+    "Mrs. Mary Smith", "mrs mary smith tv", "Gaming Gaming", "Xqzv Wprt", "Love Smith", "John Love",
+]
+
+
+@pytest.fixture(scope="module")
+def scorer(build_scorer):
+    return build_scorer()
+
+
+@pytest.fixture(scope="module")
+def words():
+    return load_words(os.path.join(benchmarks.REPO_DIR, "words.txt"))
+
+
+def outcome(simplify, author_name):
+    """The result of simplify, or the type of the exception it raised"""
+    try:
+        return simplify(author_name)
+    except Exception as e:
+        return type(e)
+
+
+def author_names(scorer, words):
+    names = benchmarks.random_author_names(scorer, words, 3000)
+    names += [f"{suffix} {name}" for suffix, name in zip(SUFFIXES, names)]
+    names += [f"{name} {suffix.upper()}" for suffix, name in zip(SUFFIXES, reversed(names))]
+    return names + EDGE_CASE_NAMES
+
+
+def test_normalizer_matches_legacy_simplify_name(scorer, words):
+    normalizer = NameNormalizer(scorer, words)
+    word_list = sorted(words)
+    for author_name in author_names(scorer, words):
+        expected = outcome(lambda name: benchmarks.legacy_simplify_name(name, scorer, word_list), author_name)
+        assert outcome(normalizer.simplify, author_name) == expected, author_name
+
+
+def test_valid_names_are_known_lowercase_names(scorer, words):
+    normalizer = NameNormalizer(scorer, words)
+    results = [outcome(normalizer.simplify, author_name) for author_name in author_names(scorer, words)]
+    valid = [result for result in results if isinstance(result, tuple) and result[2]]
+    assert valid
+    for first_name, last_name, _ in valid:
+        assert first_name == first_name.lower() and last_name == last_name.lower()
+        assert scorer.name_exists(first_name, "first") or scorer.name_exists(last_name, "last")
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Tests for pull_reviews.py against the local mock AppTweak server
+Run with: python -m pytest test_pull_reviews.py
+"""
+
+import asyncio
+import contextlib
+import io
+import sqlite3
+import time
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+import pull_reviews
+from mock_apptweak_server import start_mock_server
+
+APPS = ["com.example.one", "com.example.two", "com.example.three", "com.example.four"]
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "reviews.db")
+    monkeypatch.setattr(pull_reviews, "DB_PATH", path)
+    return path
+
+
+def run_main(*args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return asyncio.run(pull_reviews.main(*args, **kwargs))
+
+
+def test_concurrent_apps_fetch_every_page(db_path):
+    server, endpoint = start_mock_server(reviews_per_app=250, latency=0.02)
+    try:
+        failed = run_main(APPS, concurrency=3, endpoint=endpoint)
+    finally:
+        server.shutdown()
+
+    assert failed == 0
+    # 3 pages with reviews plus the empty page that ends each app
+    assert server.requests == len(APPS) * 4
+    assert 1 < server.max_in_flight <= 3
+
+    conn = sqlite3.connect(db_path)
+    counts = dict(conn.execute("SELECT app_id, COUNT(*) FROM reviews GROUP BY app_id"))
+    offsets = dict(conn.execute("SELECT app_id, last_offset FROM scrape_state"))
+    assert counts == {app_id: 250 for app_id in APPS}
+    assert offsets == {app_id: 300 for app_id in APPS}
+
+
+def test_resumes_from_saved_offsets(db_path):
+    pull_reviews.init_db()
+    pull_reviews.set_scrape_offset(APPS[0], 200)
+    server, endpoint = start_mock_server(reviews_per_app=250)
+    try:
+        run_main(APPS[:2], concurrency=2, endpoint=endpoint)
+    finally:
+        server.shutdown()
+
+    first_offsets = [offset for app_id, offset in server.requested_offsets if app_id == APPS[0]]
+    assert first_offsets == [200, 300]
+    conn = sqlite3.connect(db_path)
+    counts = dict(conn.execute("SELECT app_id, COUNT(*) FROM reviews GROUP BY app_id"))
+    assert counts == {APPS[0]: 50, APPS[1]: 250}
+
+
+def test_requests_per_second_limit(db_path):
+    server, endpoint = start_mock_server(reviews_per_app=300)
+    start = time.perf_counter()
+    try:
+        run_main(APPS, concurrency=4, rps=40, endpoint=endpoint)
+    finally:
+        server.shutdown()
+    elapsed = time.perf_counter() - start
+
+    # 16 requests spaced 1/40 s apart cannot finish sooner than 15/40 s
+    assert server.requests == 16
+    assert elapsed >= 15 / 40
+
+
+def test_writer_commits_pages_with_offsets(db_path):
+    pull_reviews.init_db()
+
+    async def write_pages():
+        writer = pull_reviews.ReviewWriter().start()
+        for page in range(3):
+            rows = [pull_reviews.review_row("app", {"id": f"{page}-{i}"}) for i in range(100)]
+            await writer.put(rows, pull_reviews.SET_OFFSET_SQL, ("app", (page + 1) * 100))
+        await writer.close()
+        return writer
+
+    writer = asyncio.run(write_pages())
+    assert (writer.rows, writer.pages) == (300, 3)
+    assert writer.transactions <= 3
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("SELECT COUNT(*) FROM reviews").fetchone()[0] == 300
+    assert pull_reviews.get_scrape_offset("app") == 300
+
+
+def test_writer_failure_does_not_hang_fetchers(tmp_path):
+    async def write_pages():
+        # A directory cannot be opened as a database
+        writer = pull_reviews.ReviewWriter(str(tmp_path), max_pending_pages=1).start()
+        for page in range(10):
+            await writer.put([], pull_reviews.SET_OFFSET_SQL, ("app", page * 100))
+        await writer.close()
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(asyncio.wait_for(write_pages(), timeout=5))
+
+
+def test_prefetch_keeps_pages_in_flight(db_path):
+    server, endpoint = start_mock_server(reviews_per_app=950, latency=0.02)
+    try:
+        run_main(APPS[:1], endpoint=endpoint, prefetch=4)
+    finally:
+        server.shutdown()
+
+    assert server.max_in_flight > 1
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT COUNT(*) FROM reviews").fetchone()[0] == 950
+    assert pull_reviews.get_scrape_offset(APPS[0]) == 1000
+
+
+def test_prefetch_only_checkpoints_contiguous_pages(db_path):
+    # Pages after the failing one may already be fetched, but must not be committed
+    server, endpoint = start_mock_server(reviews_per_app=1000, fail_offsets={300})
+    try:
+        failed = run_main(APPS[:1], endpoint=endpoint, prefetch=4)
+    finally:
+        server.shutdown()
+
+    assert failed == 1
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT COUNT(*) FROM reviews").fetchone()[0] == 300
+    assert pull_reviews.get_scrape_offset(APPS[0]) == 300
+
+
+def test_prefetch_respects_max_reviews(db_path):
+    server, endpoint = start_mock_server(reviews_per_app=1000)
+    try:
+        run_main(APPS[:1], endpoint=endpoint, max_reviews=250, prefetch=8)
+    finally:
+        server.shutdown()
+
+    assert sorted(offset for _, offset in server.requested_offsets) == [0, 100, 200]
+    assert pull_reviews.get_scrape_offset(APPS[0]) == 300
+
+
+def test_writer_failure_on_final_batch_does_not_hang(db_path):
+    async def write_pages():
+        writer = pull_reviews.ReviewWriter().start()
+        await writer.put([], "NOT VALID SQL", ())
+        await writer.close()
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(asyncio.wait_for(write_pages(), timeout=5))
+
+
+def window_rows(db_path):
+    conn = sqlite3.connect(db_path)
+    return conn.execute("SELECT start_date, end_date, last_offset, done FROM scrape_windows").fetchall()
+
+
+def test_partitioned_crawl_covers_every_review(db_path):
+    server, endpoint = start_mock_server(reviews_per_app=2000, offset_latency=0.01)
+    try:
+        failed = run_main(APPS[:2], concurrency=4, prefetch=2, endpoint=endpoint, window_size=300)
+    finally:
+        server.shutdown()
+
+    assert failed == 0
+    conn = sqlite3.connect(db_path)
+    counts = dict(conn.execute("SELECT app_id, COUNT(*) FROM reviews GROUP BY app_id"))
+    assert counts == {APPS[0]: 2000, APPS[1]: 2000}
+
+    windows = window_rows(db_path)
+    assert len(windows) > 2 * (2000 // 300)
+    assert all(done for _, _, _, done in windows)
+    # No request goes deeper than a window holds, plus one speculative prefetched page
+    assert max(offset for _, offset in server.requested_offsets) <= 300 + 100
+
+
+def test_window_planning_respects_concurrency(db_path):
+    server, endpoint = start_mock_server(reviews_per_app=2000, latency=0.02)
+    try:
+        failed = run_main(APPS, concurrency=2, endpoint=endpoint, window_size=300)
+    finally:
+        server.shutdown()
+
+    assert failed == 0
+    # Planning probes every app's date range, and splits it, at most 2 requests at a time
+    assert 1 < server.max_in_flight <= 2
+
+
+def test_partitioned_crawl_resumes_unfinished_windows(db_path):
+    server, endpoint = start_mock_server(reviews_per_app=2000, fail_offsets={100})
+    try:
+        failed = run_main(APPS[:1], concurrency=4, endpoint=endpoint, window_size=300)
+    finally:
+        server.shutdown()
+    windows = window_rows(db_path)
+    assert failed > 0
+    assert not all(done for _, _, _, done in windows)
+
+    server, endpoint = start_mock_server(reviews_per_app=2000)
+    try:
+        failed = run_main(APPS[:1], concurrency=4, endpoint=endpoint, window_size=300)
+    finally:
+        server.shutdown()
+
+    assert failed == 0
+    # The windows are not planned again, and finished ones are not fetched again
+    assert len(window_rows(db_path)) == len(windows)
+    assert all(offset >= 100 for _, offset in server.requested_offsets)
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT COUNT(*) FROM reviews").fetchone()[0] == 2000
+
+
+def test_replay_rebuilds_reviews_from_archive(db_path, tmp_path, monkeypatch):
+    archive_dir = str(tmp_path / "archive")
+    server, endpoint = start_mock_server(reviews_per_app=450)
+    try:
+        run_main(APPS[:2], concurrency=2, prefetch=2, endpoint=endpoint, archive_dir=archive_dir)
+    finally:
+        server.shutdown()
+
+    # 5 pages with reviews and the empty last page per app, plus any speculative page
+    # that completed before it was cancelled
+    assert len(pull_reviews.PageArchive(archive_dir).paths()) >= 2 * 6
+
+    rebuilt_path = str(tmp_path / "rebuilt.db")
+    monkeypatch.setattr(pull_reviews, "DB_PATH", rebuilt_path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert pull_reviews.replay(archive_dir, workers=2) == 900
+
+    columns = "app_id, review_id, rating, date, author_name, body"
+    query = f"SELECT {columns} FROM reviews ORDER BY review_id"
+    original = sqlite3.connect(db_path).execute(query).fetchall()
+    assert sqlite3.connect(rebuilt_path).execute(query).fetchall() == original
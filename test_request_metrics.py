@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests for the request metrics of the API and GET /api/metrics
+Run with: python -m pytest test_request_metrics.py
+"""
+
+import http.client
+import json
+
+from request_metrics import DEFAULT_BUCKETS, Histogram, RequestMetrics
+
+
+def test_values_on_a_bucket_edge_count_in_that_bucket():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.0, 0.1, 0.10001, 1.0, 1.5):
+        histogram.observe(value)
+    # Prometheus buckets are "less than or equal to" their upper bound
+    assert histogram.bucket_counts == [2, 2, 1]
+    assert list(histogram.cumulative_counts()) == [("0.1", 2), ("1.0", 4), ("+Inf", 5)]
+    assert histogram.count == 5
+    assert histogram.sum == 0.0 + 0.1 + 0.10001 + 1.0 + 1.5
+
+
+def test_errors_count_statuses_from_400():
+    metrics = RequestMetrics()
+    for status in (200, 200, 204, 399, 400, 404, 500):
+        metrics.count_request("/api/score-name", status)
+    metrics.count_request("/api", 200)
+    assert metrics.errors == {"/api/score-name": 3}
+    assert metrics.requests[("/api/score-name", 200)] == 2
+    assert sum(metrics.requests.values()) == 8
+
+
+def test_render_exposition_text():
+    metrics = RequestMetrics(prefix="test")
+    metrics.count_request("/api/score-name", 200)
+    metrics.count_request("/api/score-name", 200)
+    metrics.count_request("/api/compare-names", 400)
+    metrics.observe("/api/score-name", "score", 0.25)
+    metrics.observe("/api/score-name", "score", 0.5)
+    cache_stats = {"entries": 3, "max_entries": 10, "hits": 5, "misses": 3, "evictions": 1, "hit_rate": 5 / 8}
+
+    labels = 'endpoint="/api/score-name",phase="score"'
+    buckets = [f'test_phase_seconds_bucket{{{labels},le="{bound!r}"}} {(bound >= 0.25) + (bound >= 0.5)}'
+               for bound in DEFAULT_BUCKETS]
+    expected = "\n".join([
+        "# HELP test_requests_total Requests handled, by endpoint and status code",
+        "# TYPE test_requests_total counter",
+        'test_requests_total{endpoint="/api/compare-names",status="400"} 1',
+        'test_requests_total{endpoint="/api/score-name",status="200"} 2',
+        "# HELP test_errors_total Requests answered with a 4xx or 5xx status, by endpoint",
+        "# TYPE test_errors_total counter",
+        'test_errors_total{endpoint="/api/compare-names"} 1',
+        "# HELP test_phase_seconds Time spent per request phase (parse, score, serialize)",
+        "# TYPE test_phase_seconds histogram",
+        *buckets,
+        f'test_phase_seconds_bucket{{{labels},le="+Inf"}} 2',
+        f"test_phase_seconds_sum{{{labels}}} 0.75",
+        f"test_phase_seconds_count{{{labels}}} 2",
+        "# TYPE test_scorer_cache_hits_total counter",
+        "test_scorer_cache_hits_total 5",
+        "# TYPE test_scorer_cache_misses_total counter",
+        "test_scorer_cache_misses_total 3",
+        "# TYPE test_scorer_cache_evictions_total counter",
+        "test_scorer_cache_evictions_total 1",
+        "# TYPE test_scorer_cache_entries gauge",
+        "test_scorer_cache_entries 3",
+    ]) + "\n"
+    assert metrics.render(cache_stats) == expected
+    # Without a scorer cache there are no cache lines
+    assert metrics.render(None) == expected.split("# TYPE test_scorer_cache")[0]
+
+
+def request(port, method, path, body=None):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    conn.request(method, path, body=body)
+    response = conn.getresponse()
+    data = response.read()
+    conn.close()
+    return response, data
+
+
+def test_post_records_phase_timings(api_port, api_index, monkeypatch):
+    monkeypatch.setattr(api_index, "metrics", RequestMetrics())
+    request(api_port, "POST", "/api/score-name", json.dumps({"firstName": "John", "lastName": "Smith"}).encode())
+    request(api_port, "POST", "/api/compare-names", b"{not json")
+    request(api_port, "POST", "/api/nowhere", b"{}")
+
+    # The server handles one request at a time, so the POSTs are fully recorded by now
+    response, data = request(api_port, "GET", "/api/metrics")
+    assert response.getheader("Content-Type") == "text/plain; version=0.0.4"
+    text = data.decode()
+    assert 'name_api_requests_total{endpoint="/api/score-name",status="200"} 1' in text
+    assert 'name_api_requests_total{endpoint="/api/compare-names",status="400"} 1' in text
+    assert 'name_api_requests_total{endpoint="other",status="404"} 1' in text
+    assert 'name_api_errors_total{endpoint="/api/compare-names"} 1' in text
+    assert "name_api_scorer_cache_hits_total" in text
+
+    phases = {key: histogram.count for key, histogram in api_index.metrics.phases.items()}
+    assert phases == {
+        ("/api/score-name", "parse"): 1,
+        ("/api/score-name", "score"): 1,
+        ("/api/score-name", "serialize"): 1,
+        # Invalid JSON never reaches scoring
+        ("/api/compare-names", "parse"): 1,
+        ("/api/compare-names", "serialize"): 1,
+        ("other", "parse"): 1,
+        ("other", "score"): 1,
+        ("other", "serialize"): 1,
+    }
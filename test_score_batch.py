@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Parity tests for NameUniquenessScorer.score_batch against the scalar scoring path
+Run with: python -m pytest test_score_batch.py
+"""
+
+import contextlib
+import io
+import os
+import random
+import string
+import tempfile
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from name_uniqueness_scorer import NameUniquenessScorer
+
+EDGE_CASE_NAMES = [
+    "", " ", "  x ", "a", "JOHN", " Mary ", "o'neil", "x-y", "zz", "qx",
+    "jean luc", "zoë", "İstanbul", "a1b2", "smith!", "wolfeschlegelsteinhausenbergerdorff",
+]
+
+
+def build_scorer(custom_weights=None):
+    """Create a scorer over a small generated corpus"""
+    rng = random.Random(3)
+    names = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(2, 10))) for _ in range(800)]
+    names += ["john", "mary", "smith", "johnson", "luna"]
+
+    data_dir = tempfile.mkdtemp()
+    for year in (1949, 1980, 2000):
+        with open(os.path.join(data_dir, f"yob{year}.txt"), "w") as file:
+            for name in names:
+                file.write(f"{name.capitalize()},F,{rng.choice([5, 50, 500, 5000, 50000])}\n")
+            file.write("John,M,3000000\nMary,F,900000\n")
+
+    last_name_source = os.path.join(data_dir, "last_names.csv")
+    with open(last_name_source, "w") as file:
+        file.write("name,rank,count\n")
+        for rank, name in enumerate(names[:500] + ["smith", "johnson"]):
+            file.write(f"{name.upper()},{rank},{rng.choice([10, 1000, 100000, 2000000])}\n")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        return NameUniquenessScorer(data_dir, last_name_source, custom_weights=custom_weights)
+
+
+def sample_pairs(scorer, count=2000):
+    """Mix of known, unknown, duplicated and edge-case first/last name pairs"""
+    rng = random.Random(11)
+    known_first = list(scorer.first_name_counts)
+    known_last = list(scorer.last_name_counts)
+    unknown = ["".join(rng.choice(string.ascii_letters + " -'é") for _ in range(rng.randint(1, 14))) for _ in range(300)]
+    firsts = [rng.choice(known_first + unknown + EDGE_CASE_NAMES) for _ in range(count)]
+    lasts = [rng.choice(known_last + unknown + EDGE_CASE_NAMES + [None]) for _ in range(count)]
+    return firsts, lasts
+
+
+def assert_parity(scorer, firsts, lasts):
+    results = scorer.score_batch(firsts, lasts)
+
+    for i, (first, last) in enumerate(zip(firsts, lasts)):
+        assert results["total_score"][i] == scorer.calculate_full_name_uniqueness(first, last), (first, last)
+
+        for prefix, name, name_counts, total in (
+            ("first", first, scorer.first_name_counts, scorer.total_first_names),
+            ("last", last, scorer.last_name_counts, scorer.total_last_names),
+        ):
+            scores = scorer._calculate_name_uniqueness(name, name_counts, total)
+            if not isinstance(scores, dict):
+                scores = dict.fromkeys(("frequency_score", "structural_score", "letter_uniqueness", "total_score"), scores)
+            for key, value in scores.items():
+                assert results[f"{prefix}_{key}"][i] == value, (prefix, name, key)
+
+
+def test_score_batch_matches_scalar_scores():
+    scorer = build_scorer()
+    assert_parity(scorer, *sample_pairs(scorer))
+
+
+def test_score_batch_matches_scalar_scores_with_custom_weights():
+    scorer = build_scorer({
+        "frequency_weight": 70,
+        "structural_weight": 20,
+        "first_name_weight": 0.7,
+        "last_name_weight": 0.3,
+        "rare_combo_threshold": 60,
+    })
+    assert_parity(scorer, *sample_pairs(scorer))
+
+
+def test_score_batch_first_names_only():
+    scorer = build_scorer()
+    firsts, _ = sample_pairs(scorer, 300)
+    results = scorer.score_batch(firsts)
+    expected = [scorer.calculate_full_name_uniqueness(first) for first in firsts]
+    assert results["total_score"].tolist() == expected
+
+
+def test_score_batch_matches_snapshot_scorer():
+    scorer = build_scorer()
+    snapshot_path = os.path.join(tempfile.mkdtemp(), "corpus.snap")
+    from name_snapshot import write_snapshot
+    write_snapshot(scorer, snapshot_path)
+    snapshot_scorer = NameUniquenessScorer.from_snapshot(snapshot_path)
+
+    firsts, lasts = sample_pairs(scorer, 500)
+    expected = scorer.score_batch(firsts, lasts)
+    results = snapshot_scorer.score_batch(firsts, lasts)
+    for key, values in expected.items():
+        assert results[key].tolist() == values.tolist(), key
+
+
+def test_score_batch_rejects_mismatched_lengths():
+    scorer = build_scorer()
+    with pytest.raises(ValueError):
+        scorer.score_batch(["john", "mary"], ["smith"])
+
+
+def test_score_batch_bounds_padding_of_long_names(monkeypatch):
+    import name_uniqueness_scorer
+    scorer = build_scorer()
+    chunk_shapes = []
+    score_name_chunk = scorer._score_name_chunk
+
+    def recording_chunk(names, *args):
+        chunk_shapes.append((len(names), max(map(len, names))))
+        return score_name_chunk(names, *args)
+
+    monkeypatch.setattr(name_uniqueness_scorer, "BATCH_CHUNK_CELLS", 1000)
+    monkeypatch.setattr(scorer, "_score_name_chunk", recording_chunk)
+    firsts, lasts = sample_pairs(scorer, 500)
+    firsts[7] = "ab" * 5000
+    lasts[9] = "Zq-" * 700
+    assert_parity(scorer, firsts, lasts)
+    assert (1, 10000) in chunk_shapes
+    assert all(rows == 1 or rows * longest <= 1000 for rows, longest in chunk_shapes)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for the LRU score cache of NameUniquenessScorer
+Run with: python -m pytest test_score_cache.py
+"""
+
+import contextlib
+import io
+
+import benchmarks
+from name_uniqueness_scorer import LRUCache, DEFAULT_WEIGHTS
+
+
+def sample_pairs(scorer):
+    firsts = list(scorer.first_name_counts)[:50] + benchmarks.random_unknown_names(scorer.first_name_counts, 20)
+    lasts = list(scorer.last_name_counts)[:30] + ["", None, " x "]
+    return [(first, lasts[i % len(lasts)]) for i, first in enumerate(firsts)] + [(" Zoë ", None), ("", "smith")]
+
+
+def test_cached_scores_match_uncached(build_scorer):
+    scorer = build_scorer()
+    cached = build_scorer(cache_size=1000)
+    for _ in range(2):
+        for first, last in sample_pairs(scorer):
+            assert cached.calculate_full_name_uniqueness(first, last) == scorer.calculate_full_name_uniqueness(first, last)
+            assert cached.calculate_first_name_uniqueness(first) == scorer.calculate_first_name_uniqueness(first)
+    assert cached.cache_stats()["hits"] > 0
+
+
+def test_cache_follows_in_place_weight_changes(build_scorer):
+    scorer = build_scorer(cache_size=1000)
+    pairs = sample_pairs(scorer)
+    before = [scorer.calculate_full_name_uniqueness(first, last) for first, last in pairs]
+
+    # Mutating the weights dict must not serve the scores cached under the old weights
+    scorer.weights["very_common_max_score"] = 40
+    scorer.weights["letter_dist_weight"] = 30
+    reference = build_scorer(custom_weights={"very_common_max_score": 40, "letter_dist_weight": 30})
+    after = [scorer.calculate_full_name_uniqueness(first, last) for first, last in pairs]
+    assert after == [reference.calculate_full_name_uniqueness(first, last) for first, last in pairs]
+    assert after != before
+
+    # Neither must replacing the dict, and going back to the old weights finds the old entries again
+    scorer.weights = dict(DEFAULT_WEIGHTS)
+    hits = scorer.cache_stats()["hits"]
+    assert [scorer.calculate_full_name_uniqueness(first, last) for first, last in pairs] == before
+    assert scorer.cache_stats()["hits"] == hits + len(pairs)
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "a" is now the most recently used
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+    cache.put("a", 10)  # Updating an entry also refreshes it
+    cache.put("d", 4)
+    assert cache.get("c") is None
+    assert cache.get("a") == 10
+    assert cache.stats() == {"entries": 2, "max_entries": 2, "hits": 4, "misses": 2, "evictions": 2,
+                             "hit_rate": 4 / 6, "kinds": {}}
+
+
+def test_scorer_cache_counters(build_scorer):
+    scorer = build_scorer(cache_size=2)
+    assert build_scorer().cache_stats() is None
+
+    for name in ("john", "mary", "john", "luna", "mary"):
+        scorer.calculate_first_name_uniqueness(name)
+    # john, mary: misses; john: hit; luna: miss evicting mary; mary: miss evicting john
+    stats = scorer.cache_stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["entries"]) == (1, 4, 2, 2)
+    assert stats["kinds"] == {"name": {"hits": 1, "misses": 4}}
+
+
+def test_scorer_cache_counts_full_names_and_parts_separately(build_scorer):
+    scorer = build_scorer(cache_size=1000)
+    for first, last in (("john", "smith"), ("mary", "smith"), ("john", "smith")):
+        scorer.calculate_full_name_uniqueness(first, last)
+    # Each full-name miss looks up both parts; "smith" is found the second time
+    stats = scorer.cache_stats()
+    assert stats["kinds"] == {"full": {"hits": 1, "misses": 2}, "name": {"hits": 1, "misses": 3}}
+    assert (stats["hits"], stats["misses"]) == (2, 5)
+
+
+def test_loading_data_clears_cache(build_scorer, tmp_path):
+    scorer = build_scorer(cache_size=1000)
+    unknown = benchmarks.random_unknown_names(scorer.first_name_counts, 1)[0]
+    unknown_score = scorer.calculate_first_name_uniqueness(unknown)
+    assert len(scorer.cache) == 1
+
+    (tmp_path / "yob2020.txt").write_text(f"{unknown.capitalize()},F,{scorer.total_first_names}\n")
+    with contextlib.redirect_stdout(io.StringIO()):
+        scorer.load_ssa_data(str(tmp_path))
+    assert len(scorer.cache) == 0
+    assert scorer.calculate_first_name_uniqueness(unknown) < unknown_score
+
+    last_name_file = tmp_path / "extra_last_names.csv"
+    last_name_file.write_text(f"name,rank,count\n{unknown.upper()},1,{scorer.total_last_names}\n")
+    scorer.calculate_last_name_uniqueness(unknown)
+    scorer.load_last_name_data(str(last_name_file))
+    assert len(scorer.cache) == 0
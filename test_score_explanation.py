@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Tests for the structured score explanations of NameUniquenessScorer
+Run with: python -m pytest test_score_explanation.py
+"""
+
+import contextlib
+import io
+import random
+
+import pytest
+
+import benchmarks
+
+
+@pytest.fixture(scope="module")
+def scorer(build_scorer):
+    return build_scorer(cache_size=1000)
+
+
+def name_pairs(scorer, count=300):
+    rng = random.Random(11)
+    firsts = list(scorer.first_name_counts)[:200] + benchmarks.random_unknown_names(scorer.first_name_counts, 50)
+    lasts = list(scorer.last_name_counts)[:200] + benchmarks.random_unknown_names(scorer.last_name_counts, 50)
+    pairs = [(rng.choice(firsts), rng.choice(lasts + ["", None])) for _ in range(count)]
+    return pairs + [("", "smith"), (" John ", " Smith "), ("zoë", "o'neil"), ("", None)]
+
+
+def test_explanation_scores_match(scorer):
+    for first, last in name_pairs(scorer):
+        explanation = scorer.explain_full_name(first, last)
+        assert explanation["score"] == scorer.calculate_full_name_uniqueness(first, last)
+        if explanation["first"]:
+            assert explanation["first"]["total_score"] == explanation["first_score"]
+            assert explanation["first"]["total_score"] == scorer.calculate_first_name_uniqueness(first)
+
+
+def test_print_components_renders_the_explanation(scorer):
+    for first, last in name_pairs(scorer, 50):
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            score = scorer.calculate_full_name_uniqueness(first, last, print_components=True)
+        assert output.getvalue() == scorer.format_explanation(scorer.explain_full_name(first, last)) + "\n"
+        assert score == scorer.calculate_full_name_uniqueness(first, last)
+
+
+def test_explanation_fields(scorer):
+    john_smith = scorer.explain_full_name("John", "Smith")
+    assert john_smith["first"]["tier"] == "very_common"
+    assert john_smith["first"]["bigram_rarity"] is None
+    assert john_smith["combo"] == "very_common"
+    assert john_smith["multipliers"] == {"first": None, "last": None}
+
+    unknown = scorer.explain_name("qxzvvy", "last")
+    assert unknown["tier"] == "unknown"
+    assert 0 <= unknown["bigram_rarity"] <= 1
+
+    rare = scorer.explain_full_name("qxzvvy", "zzqxv")
+    assert rare["combo"] == "weighted"
+    assert rare["rare_combo_bonus"] == scorer.weights["rare_combo_bonus"]
+    assert rare["multipliers"]["first"] > 1 and rare["rare_name_bonus"] > 1
+
+    assert scorer.explain_name("", "first") is None
+    assert scorer.explain_full_name("John")["combo"] is None
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental, resumable scoring run of score_review_authors_simplified.py
+Run with: python -m pytest test_score_review_authors.py
+"""
+
+import contextlib
+import csv
+import io
+import os
+import shutil
+import sqlite3
+
+import pytest
+
+import benchmarks
+from name_uniqueness_scorer import NameUniquenessScorer
+
+with benchmarks.working_directory(benchmarks.REPO_DIR):
+    import score_review_authors_simplified as scoring_job
+
+
+@pytest.fixture(scope="module")
+def reviews_template(build_scorer, tmp_path_factory):
+    """A reviews.db of 600 generated authors, some with several reviews"""
+    path = str(tmp_path_factory.mktemp("reviews") / "reviews.db")
+    benchmarks.generate_reviews_db(path, build_scorer(), scoring_job.words, authors=600)
+    return path
+
+
+def make_job_dir(path, corpus_root, reviews_template):
+    """Set up path as the working directory of a scoring job, with its own copy of reviews.db"""
+    os.symlink(os.path.join(corpus_root, "name_data"), os.path.join(path, "name_data"))
+    shutil.copyfile(reviews_template, os.path.join(path, "reviews.db"))
+    return str(path)
+
+
+@pytest.fixture
+def job_dir(corpus_root, reviews_template, tmp_path):
+    return make_job_dir(tmp_path, corpus_root, reviews_template)
+
+
+def run_job(job_dir, **options):
+    """Run score_review_authors in job_dir; returns its output"""
+    with benchmarks.working_directory(job_dir), contextlib.redirect_stdout(io.StringIO()) as output:
+        scoring_job.score_review_authors(batch_size=50, **options)
+    return output.getvalue()
+
+
+def read_results(job_dir):
+    with open(os.path.join(job_dir, scoring_job.RESULTS_CSV), newline="", encoding="utf-8") as file:
+        return file.read()
+
+
+def review_authors(job_dir):
+    conn = sqlite3.connect(os.path.join(job_dir, "reviews.db"))
+    authors = [row[0] for row in conn.execute(
+        "SELECT DISTINCT author_name FROM reviews WHERE author_name IS NOT NULL AND author_name != ''")]
+    conn.close()
+    return authors
+
+
+def direct_results(job_dir):
+    """
+    The results CSV as the original one-pass job wrote it, scoring every author directly.
+
+    The original job kept tied scores in the order it read the authors; the job now
+    breaks ties by author name on purpose, so that incremental and parallel runs write
+    the same CSV, and the authors are sorted by name here before the stable sort by score.
+    """
+    with benchmarks.working_directory(job_dir), contextlib.redirect_stdout(io.StringIO()):
+        scorer = NameUniquenessScorer("./name_data")
+    words = sorted(scoring_job.words)
+
+    rows = []
+    for author_name in sorted(review_authors(job_dir)):
+        first_name, last_name, is_valid = benchmarks.legacy_simplify_name(author_name, scorer, words)
+        if not is_valid:
+            score = -1
+        elif last_name:
+            score = scorer.calculate_full_name_uniqueness(first_name, last_name)
+        else:
+            score = scorer.calculate_first_name_uniqueness(first_name) / 2
+        rows.append((author_name, first_name, last_name, score))
+    rows.sort(key=lambda row: row[3], reverse=True)
+
+    output = io.StringIO(newline="")
+    writer = csv.writer(output)
+    writer.writerow(["Original Name", "First Name", "Last Name", "Uniqueness Score"])
+    writer.writerows(rows)
+    return output.getvalue()
+
+
+def add_reviews(job_dir, author_names):
+    conn = sqlite3.connect(os.path.join(job_dir, "reviews.db"))
+    conn.executemany("INSERT INTO reviews (review_id, author_name) VALUES (?, ?)",
+                     [(f"extra-{name}", name) for name in author_names])
+    conn.commit()
+    conn.close()
+
+
+def test_results_match_direct_scoring(job_dir):
+    run_job(job_dir)
+    results = read_results(job_dir)
+    assert results == direct_results(job_dir)
+    # Scores capped at 100 keep the original job's formatting
+    assert ",100\r\n" in results
+
+
+def test_only_new_or_changed_authors_are_rescored(job_dir):
+    authors = review_authors(job_dir)
+    assert f"Found {len(authors)} new or changed author names" in run_job(job_dir)
+    first_results = read_results(job_dir)
+    assert "Found 0 new or changed author names" in run_job(job_dir)
+    assert read_results(job_dir) == first_results
+
+    # A new author, a new review by a known author, and scores from other weights
+    add_reviews(job_dir, ["Zephyrine Quillfeather", "Mary Smith"])
+    conn = sqlite3.connect(os.path.join(job_dir, "reviews.db"))
+    with conn:
+        conn.execute("""
+            UPDATE author_scores SET weights_hash = 'stale'
+            WHERE author_name IN (SELECT author_name FROM author_scores ORDER BY author_name LIMIT 5)
+        """)
+    conn.close()
+    output = run_job(job_dir)
+    assert f"Found {6 + ('Mary Smith' not in authors)} new or changed author names" in output
+    assert read_results(job_dir) == direct_results(job_dir)
+
+    assert f"Found {len(review_authors(job_dir))} new or changed author names" in run_job(job_dir, full=True)
+
+
+def test_resume_after_crash_with_workers_matches_serial_run(job_dir, corpus_root, reviews_template,
+                                                           tmp_path_factory, monkeypatch):
+    serial_dir = make_job_dir(tmp_path_factory.mktemp("serial"), corpus_root, reviews_template)
+    run_job(serial_dir)
+
+    # Crash while checkpointing the fourth batch
+    save_author_scores = scoring_job.save_author_scores
+    saved = []
+
+    def crashing_save(conn, rows, weights_hash):
+        if len(saved) == 3:
+            raise RuntimeError("crash")
+        save_author_scores(conn, rows, weights_hash)
+        saved.append(rows)
+
+    monkeypatch.setattr(scoring_job, "save_author_scores", crashing_save)
+    with pytest.raises(RuntimeError):
+        run_job(job_dir)
+    monkeypatch.undo()
+
+    left = len(review_authors(job_dir)) - 150
+    conn = sqlite3.connect(os.path.join(job_dir, "reviews.db"))
+    assert conn.execute("SELECT COUNT(*) FROM author_scores").fetchone()[0] == 150
+    assert conn.execute("SELECT COUNT(*) FROM author_score_queue").fetchone()[0] == left
+    conn.close()
+
+    assert f"Resuming with {left} author names" in run_job(job_dir, resume=True, workers=2)
+    assert read_results(job_dir) == read_results(serial_dir)
+    with open(os.path.join(job_dir, scoring_job.RESULTS_SCORES), "rb") as file:
+        scores_file = file.read()
+    with open(os.path.join(serial_dir, scoring_job.RESULTS_SCORES), "rb") as file:
+        assert scores_file == file.read()
+
+
+def test_score_memo_does_not_change_results(job_dir):
+    output = run_job(job_dir)
+    assert "Score memo (full names):" in output and "Score memo (name parts):" in output
+    memoized = read_results(job_dir)
+    assert "Score memo:" not in run_job(job_dir, full=True, memo_size=0)
+    assert read_results(job_dir) == memoized
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tests for the /api/score-stream NDJSON endpoint of api/index.py
+Run with: python -m pytest test_score_stream.py
+"""
+
+import http.client
+import json
+import random
+import socket
+
+import pytest
+
+import benchmarks
+
+
+@pytest.fixture
+def name_pairs(api_index):
+    scorer = api_index.scorer
+    rng = random.Random(7)
+    firsts = list(scorer.first_name_counts)[:100] + benchmarks.random_unknown_names(scorer.first_name_counts, 20)
+    lasts = list(scorer.last_name_counts)[:100] + benchmarks.random_unknown_names(scorer.last_name_counts, 20)
+    pairs = [[rng.choice(firsts).capitalize(), rng.choice(lasts).capitalize()] for _ in range(40)]
+    return pairs + [["Luna", ""], ["", "Zhang"], ["Zoë", "O'Neil"]]
+
+
+def ndjson_lines(pairs):
+    """One record per pair, in each of the accepted record forms"""
+    lines = []
+    for i, (first_name, last_name) in enumerate(pairs):
+        if not last_name:
+            record = first_name
+        elif i % 2:
+            record = {"firstName": first_name, "lastName": last_name}
+        else:
+            record = [first_name, last_name]
+        lines.append(json.dumps(record).encode() + b"\n")
+    return lines
+
+
+def post(port, path, body, headers=None):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    conn.request("POST", path, body=body, headers=headers or {}, encode_chunked=not isinstance(body, bytes))
+    response = conn.getresponse()
+    data = response.read()
+    conn.close()
+    return response, data
+
+
+def stream_results(data):
+    return [json.loads(line) for line in data.decode().splitlines()]
+
+
+def compared_results(port, pairs):
+    _, data = post(port, "/api/compare-names", json.dumps({"names": pairs}).encode())
+    return json.loads(data)["results"]
+
+
+def test_content_length_upload_matches_compare_names(api_port, api_index, name_pairs, monkeypatch):
+    # Several small chunks, so results are written back in more than one piece
+    monkeypatch.setattr(api_index, "STREAM_CHUNK_SIZE", 7)
+    response, data = post(api_port, "/api/score-stream", b"".join(ndjson_lines(name_pairs)))
+    assert response.status == 200
+    assert response.getheader("Content-Type") == "application/x-ndjson"
+    assert response.getheader("Transfer-Encoding") == "chunked"
+    assert stream_results(data) == compared_results(api_port, name_pairs)
+
+
+def test_chunked_upload_matches_content_length_upload(api_port, name_pairs):
+    body = b"".join(ndjson_lines(name_pairs))
+    _, expected = post(api_port, "/api/score-stream", body)
+
+    # Chunk boundaries that fall in the middle of records, and a trailing line without a newline
+    rng = random.Random(5)
+    cuts = sorted(rng.sample(range(1, len(body)), 25))
+    chunks = [body[start:end] for start, end in zip([0] + cuts, cuts + [len(body)])]
+    chunks[-1] = chunks[-1].rstrip(b"\n")
+    response, data = post(api_port, "/api/score-stream", iter(chunks))
+    assert response.status == 200
+    assert data == expected
+
+
+def test_lines_that_cannot_be_scored_get_error_records(api_port):
+    lines = [
+        b'{"firstName": "John", "lastName": "Smith"}',
+        b'{"firstName": "John"',
+        b'',
+        b'{"firstName": 5}',
+        b'["John", ["Smith"]]',
+        b'null',
+        b'{}',
+        b'[]',
+        b'"   "',
+        b'\xff\xfe',
+        b'"Luna"',
+    ]
+    _, data = post(api_port, "/api/score-stream", b"\n".join(lines))
+    results = stream_results(data)
+    # Blank lines are skipped but still counted in the line numbers
+    assert results[0]["name"] == "John Smith"
+    assert results[1:-1] == [
+        {"line": 2, "error": "Invalid JSON"},
+        {"line": 4, "error": "Names must be strings"},
+        {"line": 5, "error": "Names must be strings"},
+        {"line": 6, "error": "Names must be strings"},
+        {"line": 7, "error": "Please provide at least one name"},
+        {"line": 8, "error": "Please provide at least one name"},
+        {"line": 9, "error": "Please provide at least one name"},
+        {"line": 10, "error": "Invalid JSON"},
+    ]
+    assert results[-1]["name"] == "Luna"
+
+
+def test_http10_client_gets_a_plain_response(api_port, name_pairs):
+    body = b"".join(ndjson_lines(name_pairs))
+    with socket.create_connection(("127.0.0.1", api_port), timeout=10) as sock:
+        sock.sendall(b"POST /api/score-stream HTTP/1.0\r\n"
+                     b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body)
+        # Without chunked encoding the end of the body is marked by closing the connection
+        response = b""
+        while block := sock.recv(65536):
+            response += block
+
+    head, _, data = response.partition(b"\r\n\r\n")
+    assert head.split(b"\r\n")[0].endswith(b" 200 OK")
+    assert b"transfer-encoding" not in head.lower()
+    assert stream_results(data) == compared_results(api_port, name_pairs)
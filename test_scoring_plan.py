@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Tests for the compiled ScoringPlan of NameUniquenessScorer
+Run with: python -m pytest test_scoring_plan.py
+"""
+
+import random
+
+import pytest
+
+import benchmarks
+from name_uniqueness_scorer import compile_scoring_plan, DEFAULT_WEIGHTS
+
+SHUFFLED_TIERS = {
+    "very_rare_threshold": 0.002, "uncommon_threshold": 0.0004,
+    "moderate_threshold": 0.05, "common_threshold": 0.001,
+}
+
+
+def sample_names(scorer):
+    rng = random.Random(3)
+    names = list(scorer.first_name_counts)[:400] + benchmarks.random_unknown_names(scorer.first_name_counts, 100)
+    return names + ["a", " x ", "zoë", "o'neil", "jean-luc", "a1b2", "İstanbul"] + [rng.choice(names) for _ in range(100)]
+
+
+@pytest.mark.parametrize("custom_weights", [None, SHUFFLED_TIERS, {"max_name_length": 7, "letter_dist_weight": 13.5}])
+def test_plan_scores_match_per_call_weights(build_scorer, custom_weights):
+    scorer = build_scorer(custom_weights=custom_weights)
+    for name in sample_names(scorer):
+        for name_counts, total in ((scorer.first_name_counts, scorer.total_first_names),
+                                   (scorer.last_name_counts, scorer.total_last_names)):
+            assert (scorer._score_name_components(name, name_counts, total)
+                    == benchmarks.legacy_score_name_components(scorer, name, name_counts, total))
+
+
+def test_plan_follows_weight_changes(build_scorer):
+    scorer = build_scorer()
+    plan = scorer.scoring_plan()
+    assert scorer.scoring_plan() is plan
+    with pytest.raises(TypeError):
+        plan.weights["frequency_weight"] = 1
+
+    before = scorer.calculate_first_name_uniqueness("john")
+    scorer.weights["very_common_max_score"] = 40
+    assert scorer.scoring_plan() is not plan
+    assert scorer.calculate_first_name_uniqueness("john") > before
+
+    scorer.weights = dict(DEFAULT_WEIGHTS)
+    assert scorer.calculate_first_name_uniqueness("john") == before
+
+
+def test_tier_limits_follow_the_threshold_ladder():
+    weights = dict(DEFAULT_WEIGHTS, **SHUFFLED_TIERS)
+    plan = compile_scoring_plan(weights)
+    assert plan.tier_limits == (0.002, 0.002, 0.05, 0.05)
+    assert [tier[2] for tier in plan.tiers] == [0.002, 0.0004, 0.05, 0.001]
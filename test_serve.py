@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for the pre-fork server in serve.py
+Run with: python -m pytest test_serve.py
+"""
+
+import http.client
+import json
+import os
+import signal
+import time
+
+import pytest
+
+import serve
+
+
+def test_health_report(monkeypatch):
+    health = serve.WorkerHealth(2)
+    now = 1_000_000.0
+    monkeypatch.setattr(serve.time, "time", lambda: now)
+    for slot, pid in enumerate((101, 102)):
+        health.set(slot, "pid", pid)
+        health.set(slot, "started", now - 120.04)
+    health.set(0, "heartbeat", now - 0.26)
+    health.set(1, "heartbeat", now - serve.HEARTBEAT_TIMEOUT)
+    for _ in range(3):
+        health.increment(0, "requests")
+    health.increment(1, "restarts")
+
+    assert health.report() == [
+        {"slot": 0, "pid": 101, "uptime_seconds": 120.0, "requests": 3, "restarts": 0,
+         "heartbeat_age_seconds": 0.3, "healthy": True},
+        # A worker is unhealthy once its heartbeat is HEARTBEAT_TIMEOUT old
+        {"slot": 1, "pid": 102, "uptime_seconds": 120.0, "requests": 0, "restarts": 1,
+         "heartbeat_age_seconds": serve.HEARTBEAT_TIMEOUT, "healthy": False},
+    ]
+
+
+def get(port, path):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    conn.request("GET", path)
+    response = conn.getresponse()
+    data = response.read()
+    conn.close()
+    return response, data
+
+
+def workers(port):
+    return json.loads(get(port, "/api/workers")[1])["workers"]
+
+
+def wait_for(condition, timeout=15):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        result = condition()
+        if result:
+            return result
+        time.sleep(0.1)
+    pytest.fail("timed out")
+
+
+def test_prefork_restart_and_shutdown(api_index):
+    health = serve.WorkerHealth(2)
+    server = serve.WorkerServer(("127.0.0.1", 0), serve.make_handler(api_index.handler, health), health)
+    port = server.server_address[1]
+    parent = os.fork()
+    if parent == 0:
+        try:
+            serve.PreforkServer(server, 2).run()
+        finally:
+            os._exit(0)
+    server.server_close()
+
+    try:
+        started = wait_for(lambda: (report := workers(port)) and all(w["pid"] for w in report) and report)
+        response, data = get(port, "/api")
+        assert response.status == 200
+        assert json.loads(data)["status"] == "ok"
+        assert all(worker["healthy"] and worker["restarts"] == 0 for worker in started)
+        first_pids = {worker["pid"] for worker in started}
+        assert len(first_pids) == 2
+
+        os.kill(parent, signal.SIGHUP)
+        restarted = wait_for(lambda: (report := workers(port)) and all(w["restarts"] == 1 for w in report) and report)
+        assert {worker["slot"] for worker in restarted} == {0, 1}
+        assert not {worker["pid"] for worker in restarted} & first_pids
+        assert all(worker["healthy"] for worker in restarted)
+    finally:
+        os.kill(parent, signal.SIGTERM)
+        _, status = os.waitpid(parent, 0)
+
+    assert os.waitstatus_to_exitcode(status) == 0
+    # The parent reaped every worker before exiting
+    for pid in first_pids | {worker["pid"] for worker in restarted}:
+        with pytest.raises(ProcessLookupError):
+            os.kill(pid, 0)